@@ -0,0 +1,26 @@
+"""
+Script for moving the content of all assets saved before asset content was stored by hash
+into the shared, reference counted blobs, so that identical assets share their storage.
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+from xmodule.contentstore.django import contentstore
+
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Store the content of all assets in the contentstore by hash
+    """
+    help = 'Store the content of all assets in the contentstore by hash, so that identical assets share their storage'
+
+    def handle(self, *args, **options):
+        """
+        Execute the command
+        """
+        log.info(u"Deduplicating the content of all assets")
+        assets_converted = contentstore().deduplicate_assets()
+        log.info(u"Total number of assets converted: {0}".format(assets_converted))
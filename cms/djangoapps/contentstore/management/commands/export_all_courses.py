@@ -1,6 +1,8 @@
 """
 Script for exporting all courseware from Mongo to a directory and listing the courses which failed to export
 """
+from optparse import make_option
+
 from django.core.management.base import BaseCommand, CommandError
 from xmodule.modulestore.xml_exporter import export_course_to_xml
 from xmodule.modulestore.django import modulestore
@@ -13,6 +15,16 @@ class Command(BaseCommand):
     """
     help = 'Export all courses from mongo to the specified data directory and list the courses which failed to export'
 
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--incremental',
+            action='store_true',
+            dest='incremental',
+            default=False,
+            help='Update the exports already in the output path, only rewriting courses which changed since',
+        ),
+    )
+
     def handle(self, *args, **options):
         """
         Execute the command
@@ -21,7 +33,9 @@ class Command(BaseCommand):
             raise CommandError("export requires one argument: <output path>")
 
         output_path = args[0]
-        courses, failed_export_courses = export_courses_to_output_path(output_path)
+        courses, failed_export_courses = export_courses_to_output_path(
+            output_path, incremental=options.get('incremental', False)
+        )
 
         print "=" * 80
         print u"=" * 30 + u"> Export summary"
@@ -32,9 +46,11 @@ class Command(BaseCommand):
         print "=" * 80
 
 
-def export_courses_to_output_path(output_path):
+def export_courses_to_output_path(output_path, incremental=False):
     """
     Export all courses to target directory and return the list of courses which failed to export
+
+    If `incremental` is True, the exports already in the target directory are updated, see `ExportManager`.
     """
     content_store = contentstore()
     module_store = modulestore()
@@ -49,7 +65,9 @@ def export_courses_to_output_path(output_path):
         print u"Exporting course id = {0} to {1}".format(course_id, output_path)
         try:
             course_dir = course_id.to_deprecated_string().replace('/', '...')
-            export_course_to_xml(module_store, content_store, course_id, root_dir, course_dir)
+            export_course_to_xml(
+                module_store, content_store, course_id, root_dir, course_dir, incremental=incremental
+            )
         except Exception as err:  # pylint: disable=broad-except
             failed_export_courses.append(unicode(course_id))
             print u"=" * 30 + u"> Oops, failed to export {0}".format(course_id)
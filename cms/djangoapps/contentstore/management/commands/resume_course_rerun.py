@@ -0,0 +1,47 @@
+"""
+Script for resuming a course rerun which failed, from the last step it completed
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from contentstore.tasks import rerun_course
+from course_action_state.managers import CourseActionStateItemNotFoundError, CourseRerunUIStateManager
+from course_action_state.models import CourseRerunState
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+
+#
+# To run from command line: ./manage.py cms resume_course_rerun --settings=dev course-v1:edX+DemoX+2015
+#
+class Command(BaseCommand):
+    """Resume a failed course rerun from its last checkpoint"""
+    help = 'Resume a failed course rerun from its last checkpoint'
+    args = "<dest-course_id>"
+
+    def handle(self, *args, **options):
+        "Execute the command"
+        if len(args) != 1:
+            raise CommandError("resume_course_rerun requires 1 argument: <dest-course_id>")
+
+        try:
+            course_key = CourseKey.from_string(args[0])
+        except InvalidKeyError:
+            raise CommandError(u"Invalid course_key: '{}'.".format(args[0]))
+
+        try:
+            rerun_state = CourseRerunState.objects.find_first(
+                course_key=course_key, state=CourseRerunUIStateManager.State.FAILED
+            )
+        except CourseActionStateItemNotFoundError:
+            raise CommandError(u"No failed rerun of {}.".format(course_key))
+
+        if not rerun_state.checkpoint or rerun_state.created_user is None:
+            raise CommandError(
+                u"The rerun of {} failed before the course was created, and must be started again.".format(course_key)
+            )
+
+        print u"Resuming the rerun of {} to {} after the '{}' step".format(
+            rerun_state.source_course_key, course_key, rerun_state.checkpoint
+        )
+        CourseRerunState.objects.resumed(course_key=course_key)
+        rerun_course.delay(unicode(rerun_state.source_course_key), unicode(course_key), rerun_state.created_user.id)
@@ -1,6 +1,7 @@
 """
 Test for export all courses.
 """
+import os
 import shutil
 from tempfile import mkdtemp
 
@@ -9,7 +10,8 @@ from contentstore.management.commands.export_all_courses import export_courses_t
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore.xml_exporter import EXPORTED_STRUCTURES_FILE_SUFFIX
 
 
 class ExportAllCourses(ModuleStoreTestCase):
@@ -48,3 +50,37 @@ class ExportAllCourses(ModuleStoreTestCase):
         self.assertEqual(len(courses), 2)
         self.assertEqual(len(failed_export_courses), 1)
         self.assertEqual(failed_export_courses[0], unicode(second_course_id))
+
+
+class IncrementalExportAllCourses(ModuleStoreTestCase):
+    """
+    Tests exporting all courses incrementally.
+    """
+    def setUp(self):
+        """ Common setup. """
+        super(IncrementalExportAllCourses, self).setUp()
+        self.temp_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        self.course_dir = os.path.join(self.temp_dir, self.course.id.to_deprecated_string().replace('/', '...'))
+
+    def test_incremental_export(self):
+        """
+        Test that unchanged courses aren't exported again, and changed ones are exported from scratch
+        """
+        __, failed_export_courses = export_courses_to_output_path(self.temp_dir, incremental=True)
+        self.assertEqual(len(failed_export_courses), 0)
+        self.assertTrue(os.path.isfile(os.path.join(self.course_dir, 'course.xml')))
+        self.assertTrue(os.path.isfile(self.course_dir + EXPORTED_STRUCTURES_FILE_SUFFIX))
+
+        # A file which is only removed if the course gets exported again.
+        marker = os.path.join(self.course_dir, 'marker')
+        open(marker, 'w').close()
+
+        export_courses_to_output_path(self.temp_dir, incremental=True)
+        self.assertTrue(os.path.exists(marker))
+
+        chapter = ItemFactory.create(parent_location=self.course.location, category='chapter', publish_item=True)
+        export_courses_to_output_path(self.temp_dir, incremental=True)
+        self.assertFalse(os.path.exists(marker))
+        self.assertTrue(os.path.isfile(os.path.join(self.course_dir, 'chapter', chapter.location.name + '.xml')))
@@ -10,11 +10,15 @@ from pytz import UTC
 
 from django.contrib.auth.models import User
 
+from cache_toolbox.core import del_cached_content
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer, SearchIndexingError
 from contentstore.utils import initialize_permissions
 from course_action_state.models import CourseRerunState
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import AssetKey, CourseKey
+from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore
 from xmodule.course_module import CourseFields
+from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
 
@@ -26,31 +30,57 @@ FULL_COURSE_REINDEX_THRESHOLD = 1
 def rerun_course(source_course_key_string, destination_course_key_string, user_id, fields=None):
     """
     Reruns a course in a new celery task.
+
+    The progress of the rerun is checkpointed in its `CourseRerunState`, so if a rerun fails after
+    the course was created, it can be resumed (see the resume_course_rerun management command)
+    without copying the course again.
     """
     # import here, at top level this import prevents the celery workers from starting up correctly
     from edxval.api import copy_course_videos
 
+    checkpoint = CourseRerunState.objects.Checkpoint
+    # the last step completed, by this or an earlier, failed run of this rerun
+    last_checkpoint = ""
+
     try:
         # deserialize the payload
         source_course_key = CourseKey.from_string(source_course_key_string)
         destination_course_key = CourseKey.from_string(destination_course_key_string)
         fields = deserialize_fields(fields) if fields else None
 
-        # use the split modulestore as the store for the rerun course,
-        # as the Mongo modulestore doesn't support multiple runs of the same course.
-        store = modulestore()
-        with store.default_store('split'):
-            store.clone_course(source_course_key, destination_course_key, user_id, fields=fields)
-
-        # set initial permissions for the user to access the course.
-        initialize_permissions(destination_course_key, User.objects.get(id=user_id))
-
-        # update state: Succeeded
-        CourseRerunState.objects.succeeded(course_key=destination_course_key)
+        rerun_state = CourseRerunState.objects.find_all(course_key=destination_course_key).first()
+        if rerun_state is not None:
+            last_checkpoint = rerun_state.checkpoint
+
+        if not checkpoint.is_completed(last_checkpoint, checkpoint.COURSEWARE):
+            # use the split modulestore as the store for the rerun course,
+            # as the Mongo modulestore doesn't support multiple runs of the same course.
+            store = modulestore()
+            with store.default_store('split'):
+                # the assets are copied in the next step, so that a rerun which fails copying them can
+                # be resumed without cloning the course again
+                store.clone_course(source_course_key, destination_course_key, user_id, fields=fields, copy_assets=False)
+            last_checkpoint = checkpoint.COURSEWARE
+            CourseRerunState.objects.checkpointed(destination_course_key, last_checkpoint)
+
+        if not checkpoint.is_completed(last_checkpoint, checkpoint.ASSETS):
+            # assets which a failed run already copied are skipped
+            contentstore().copy_all_course_assets(source_course_key, destination_course_key)
+            last_checkpoint = checkpoint.ASSETS
+            CourseRerunState.objects.checkpointed(destination_course_key, last_checkpoint)
+
+        if not checkpoint.is_completed(last_checkpoint, checkpoint.PERMISSIONS):
+            # set initial permissions for the user to access the course.
+            initialize_permissions(destination_course_key, User.objects.get(id=user_id))
+            last_checkpoint = checkpoint.PERMISSIONS
+            CourseRerunState.objects.checkpointed(destination_course_key, last_checkpoint)
 
         # call edxval to attach videos to the rerun
         copy_course_videos(source_course_key, destination_course_key)
 
+        # update state: Succeeded, which clears the checkpoint, so only once every step is done
+        CourseRerunState.objects.succeeded(course_key=destination_course_key)
+
         return "succeeded"
 
     except DuplicateCourseError as exc:
@@ -65,12 +95,14 @@ def rerun_course(source_course_key_string, destination_course_key_string, user_i
         CourseRerunState.objects.failed(course_key=destination_course_key)
         logging.exception(u'Course Rerun Error')
 
-        try:
-            # cleanup any remnants of the course
-            modulestore().delete_course(destination_course_key, user_id)
-        except ItemNotFoundError:
-            # it's possible there was an error even before the course module was created
-            pass
+        # keep a course which was completely created, so that the rerun can be resumed from its checkpoint
+        if not checkpoint.is_completed(last_checkpoint, checkpoint.COURSEWARE):
+            try:
+                # cleanup any remnants of the course
+                modulestore().delete_course(destination_course_key, user_id)
+            except ItemNotFoundError:
+                # it's possible there was an error even before the course module was created
+                pass
 
         return "exception: " + unicode(exc)
 
@@ -125,3 +157,63 @@ def push_course_update_task(course_key_string, course_subscription_id, course_di
     # TODO Use edx-notifications library instead (MA-638).
     from .push_notification import send_push_course_update
     send_push_course_update(course_key_string, course_subscription_id, course_display_name)
+
+
+@task()
+def generate_asset_thumbnails(asset_key_strings):
+    """
+    Generates the thumbnails and resized copies of the given image assets, and links the assets to their
+    thumbnails.
+    """
+    store = contentstore()
+    for asset_key_string in asset_key_strings:
+        _generate_asset_thumbnails(store, AssetKey.from_string(asset_key_string))
+
+
+@task()
+def generate_course_thumbnails(course_key_string):
+    """
+    Generates the thumbnails and resized copies of all of the course's image assets which have no thumbnail,
+    e.g. those just imported.
+    """
+    store = contentstore()
+    course_key = CourseKey.from_string(course_key_string)
+    assets, __ = store.get_all_content_for_course(
+        course_key, fields=['contentType', 'thumbnail_location'], with_count=False
+    )
+    for asset in assets:
+        content_type = asset.get('contentType') or ''
+        if content_type.split('/')[0] == 'image' and not asset.get('thumbnail_location'):
+            _generate_asset_thumbnails(store, asset['asset_key'])
+
+
+def _generate_asset_thumbnails(store, asset_key):
+    """
+    Generates the thumbnail and resized copies of the image asset `asset_key`, and links it to its thumbnail.
+    """
+    try:
+        content = store.find(asset_key, as_stream=True)
+    except NotFoundError:
+        # The asset was deleted since the task was queued.
+        LOGGER.info('Not generating thumbnails of deleted asset %s', asset_key)
+        return
+
+    try:
+        thumbnail_content, thumbnail_location = store.generate_thumbnail(content)
+        store.generate_image_derivatives(content)
+    finally:
+        content.close()
+
+    # the copies of a replaced image are deleted even if they aren't made again
+    for location in StaticContent.compute_derivative_locations(asset_key):
+        del_cached_content(location)
+
+    # delete the cached thumbnail even if one couldn't be created this time (else
+    # the old thumbnail will continue to show)
+    del_cached_content(thumbnail_location)
+    if thumbnail_content is not None:
+        try:
+            store.set_attr(asset_key, 'thumbnail_location', thumbnail_location.to_deprecated_list_repr())
+        except NotFoundError:
+            LOGGER.info('Asset %s was deleted while its thumbnails were generated', asset_key)
+        del_cached_content(asset_key)
@@ -3,6 +3,7 @@ Unit tests for cloning a course between the same and different module stores.
 """
 import json
 from django.conf import settings
+from django.core.management import call_command
 
 from opaque_keys.edx.locator import CourseLocator
 from xmodule.modulestore import ModuleStoreEnum, EdxJSONEncoder
@@ -144,3 +145,68 @@ class CloneCourseTest(CourseTestCase):
                 course_key=split_course4_id,
                 state=CourseRerunUIStateManager.State.FAILED
             )
+
+    def test_resume_rerun_course(self):
+        """
+        Tests that a rerun which failed after the course was created keeps the course, and can be resumed
+        """
+        source_course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        rerun_course_id = CourseLocator(org="edx3", course="split3", run="rerun_resume")
+        fields = {'display_name': 'resumed'}
+        CourseRerunState.objects.initiated(source_course.id, rerun_course_id, self.user, fields['display_name'])
+
+        with patch('contentstore.tasks.initialize_permissions', Mock(side_effect=Exception)):
+            result = rerun_course.delay(unicode(source_course.id), unicode(rerun_course_id), self.user.id,
+                                        json.dumps(fields, cls=EdxJSONEncoder))
+            self.assertIn("exception: ", result.get())
+        self.assertIsNotNone(self.store.get_course(rerun_course_id), "Deleted the course after the checkpoint")
+        rerun_state = CourseRerunState.objects.find_first(course_key=rerun_course_id)
+        self.assertEqual(rerun_state.state, CourseRerunUIStateManager.State.FAILED)
+        self.assertEqual(rerun_state.checkpoint, CourseRerunUIStateManager.Checkpoint.ASSETS)
+
+        # resuming doesn't clone the course again, which would fail as it already exists
+        with patch.object(self.store, 'clone_course') as clone_course:
+            call_command('resume_course_rerun', unicode(rerun_course_id))
+            self.assertFalse(clone_course.called)
+        self.assertTrue(has_course_author_access(self.user, rerun_course_id), "Didn't grant access")
+        rerun_state = CourseRerunState.objects.find_first(course_key=rerun_course_id)
+        self.assertEqual(rerun_state.state, CourseRerunUIStateManager.State.SUCCEEDED)
+        self.assertEqual(rerun_state.checkpoint, "")
+
+    def test_resume_rerun_course_assets(self):
+        """
+        Tests that a rerun which failed copying the assets keeps the course, and copies them when resumed
+        """
+        source_course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        asset_key = source_course.id.make_asset_key('asset', 'resumed.txt')
+        contentstore().save(StaticContent(asset_key, 'resumed.txt', 'text/plain', 'resumed'))
+        rerun_course_id = CourseLocator(org="edx3", course="split3", run="rerun_assets")
+        CourseRerunState.objects.initiated(source_course.id, rerun_course_id, self.user, 'resumed')
+
+        copy_all_course_assets = 'xmodule.contentstore.mongo.MongoContentStore.copy_all_course_assets'
+        with patch(copy_all_course_assets, Mock(side_effect=Exception)):
+            result = rerun_course.delay(unicode(source_course.id), unicode(rerun_course_id), self.user.id)
+            self.assertIn("exception: ", result.get())
+        self.assertIsNotNone(self.store.get_course(rerun_course_id), "Deleted the course after the checkpoint")
+        rerun_state = CourseRerunState.objects.find_first(course_key=rerun_course_id)
+        self.assertEqual(rerun_state.checkpoint, CourseRerunUIStateManager.Checkpoint.COURSEWARE)
+
+        call_command('resume_course_rerun', unicode(rerun_course_id))
+        self.assertIsNotNone(contentstore().find(rerun_course_id.make_asset_key('asset', 'resumed.txt')))
+        rerun_state = CourseRerunState.objects.find_first(course_key=rerun_course_id)
+        self.assertEqual(rerun_state.state, CourseRerunUIStateManager.State.SUCCEEDED)
+
+    def test_rerun_course_videos_failed(self):
+        """
+        Tests that a rerun which failed copying the videos keeps its checkpoint, so that it can be resumed
+        """
+        source_course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        rerun_course_id = CourseLocator(org="edx3", course="split3", run="rerun_videos")
+        CourseRerunState.objects.initiated(source_course.id, rerun_course_id, self.user, 'resumed')
+
+        with patch('edxval.api.copy_course_videos', Mock(side_effect=Exception)):
+            result = rerun_course.delay(unicode(source_course.id), unicode(rerun_course_id), self.user.id)
+            self.assertIn("exception: ", result.get())
+        rerun_state = CourseRerunState.objects.find_first(course_key=rerun_course_id)
+        self.assertEqual(rerun_state.state, CourseRerunUIStateManager.State.FAILED)
+        self.assertEqual(rerun_state.checkpoint, CourseRerunUIStateManager.Checkpoint.PERMISSIONS)
@@ -9,8 +9,15 @@ from mock import patch, Mock
 import ddt
 
 from django.test import RequestFactory
-
-from contentstore.views.course import _accessible_courses_list, _accessible_courses_list_from_groups, AccessListFallback
+from django.test.utils import override_settings
+
+from contentstore.views.course import (
+    _accessible_courses_list,
+    _accessible_courses_list_from_groups,
+    _accessible_course_overviews,
+    _course_overviews_page,
+    AccessListFallback,
+)
 from contentstore.utils import delete_course_and_groups
 from contentstore.tests.utils import AjaxEnabledTestClient
 from student.tests.factories import UserFactory
@@ -22,6 +29,7 @@ from opaque_keys.edx.locations import CourseLocator
 from xmodule.modulestore.django import modulestore
 from xmodule.error_module import ErrorDescriptor
 from course_action_state.models import CourseRerunState
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 TOTAL_COURSES_COUNT = 500
 USER_COURSES_COUNT = 50
@@ -286,3 +294,79 @@ class TestCourseListing(ModuleStoreTestCase):
             self.assertSetEqual(
                 set_of_course_keys(courses_in_progress), set_of_course_keys(unsucceeded_course_actions, 'course_key')
             )
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_LISTING_FROM_OVERVIEWS': True})
+class TestCourseListingFromOverviews(ModuleStoreTestCase):
+    """
+    Unit tests for listing the courses of a user from their course overviews
+    """
+    def setUp(self):
+        super(TestCourseListingFromOverviews, self).setUp()
+        self.user = UserFactory()
+        self.factory = RequestFactory()
+        self.client = AjaxEnabledTestClient()
+        self.client.login(username=self.user.username, password='test')
+
+    def _create_course(self, org, number, display_name):
+        """
+        Create a course, and its overview
+        """
+        course = CourseFactory.create(org=org, number=number, run='Run', display_name=display_name)
+        CourseOverview.get_from_id(course.id)
+        return course
+
+    def _get_page(self, **params):
+        """
+        Return the page of course overviews listed for the user with the given GET parameters
+        """
+        request = self.factory.get('/home/', params)
+        request.user = self.user
+        return _course_overviews_page(request, [])
+
+    def test_role_filtering(self):
+        own_course = self._create_course('Org1', 'Own', 'Own course')
+        org_course = self._create_course('Org2', 'OrgCourse', 'Org course')
+        other_course = self._create_course('Org3', 'Other', 'Other course')
+        CourseStaffRole(own_course.id).add_users(self.user)
+        OrgStaffRole(org_course.id.org).add_users(self.user)
+
+        self.assertEqual(
+            set(overview.id for overview in _accessible_course_overviews(self.user)),
+            {own_course.id, org_course.id}
+        )
+
+        GlobalStaff().add_users(self.user)
+        self.assertEqual(
+            set(overview.id for overview in _accessible_course_overviews(self.user)),
+            {own_course.id, org_course.id, other_course.id}
+        )
+
+    def test_missing_overviews_created(self):
+        course = CourseFactory.create(org='Org1', number='NoOverview', run='Run')
+        CourseOverview.objects.filter(id=course.id).delete()
+        CourseInstructorRole(course.id).add_users(self.user)
+
+        self.assertEqual([overview.id for overview in _accessible_course_overviews(self.user)], [course.id])
+
+    def test_pagination_search_and_order(self):
+        GlobalStaff().add_users(self.user)
+        for number, display_name in enumerate(['Charlie', 'alpha', 'Bravo', 'Delta']):
+            self._create_course('Org', 'Course{}'.format(number), display_name)
+
+        with override_settings(COURSE_LISTING_PAGE_SIZE=3):
+            page = self._get_page(order='-display_name')
+            self.assertEqual(page.paginator.count, 4)
+            self.assertEqual(page.paginator.num_pages, 2)
+            self.assertEqual(len(page), 3)
+            self.assertTrue(page.has_next())
+
+            # Out of range pages show the last page.
+            self.assertEqual(self._get_page(page=5).number, 2)
+
+            page = self._get_page(search='ALPHA')
+            self.assertEqual([overview.display_name for overview in page], ['alpha'])
+
+            response = self.client.get('/home/', {'page': 2})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('Page 2 of 2', response.content)
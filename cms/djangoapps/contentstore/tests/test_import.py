@@ -16,7 +16,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.tests.factories import check_exact_number_of_calls, check_number_of_calls
-from xmodule.modulestore.xml_importer import import_course_from_xml
+from xmodule.modulestore.xml_importer import import_course_from_xml, CourseImportManager
 from xmodule.exceptions import NotFoundError
 from uuid import uuid4
 
@@ -127,6 +127,30 @@ class ContentStoreImportTest(SignalDisconnectTestMixin, ModuleStoreTestCase):
         print "static_asset_path = {0}".format(course.static_asset_path)
         self.assertEqual(course.static_asset_path, 'test_import_course')
 
+    def test_import_phase_timings(self):
+        """
+        The import manager should record how long each phase of the import took.
+        """
+        manager = CourseImportManager(
+            modulestore(),
+            self.user.id,
+            TEST_DATA_DIR,
+            ['toy'],
+            static_content_store=contentstore(),
+            create_if_not_present=True,
+            static_import_workers=2,
+        )
+        courses = list(manager.run_imports())
+        self.assertEqual(len(courses), 1)
+
+        course_key = manager.phase_timings.keys()[0]
+        self.assertEqual(
+            manager.phase_timings[course_key].keys(),
+            [CourseImportManager.PARSE_PHASE, 'courselike', 'static', 'asset_metadata', 'children', 'drafts']
+        )
+        for seconds in manager.phase_timings[course_key].values():
+            self.assertGreaterEqual(seconds, 0)
+
     def test_asset_import_nostatic(self):
         '''
         This test validates that an image asset is NOT imported when do_import_static=False
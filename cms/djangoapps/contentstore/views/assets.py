@@ -1,8 +1,11 @@
+import hashlib
 import logging
 from functools import partial
 import math
 import json
+import re
 
+from django.core.cache import cache
 from django.http import HttpResponseBadRequest
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import ensure_csrf_cookie
@@ -12,6 +15,7 @@ from django.conf import settings
 from edxmako.shortcuts import render_to_response
 from cache_toolbox.core import del_cached_content
 
+from contentstore.tasks import generate_asset_thumbnails
 from contentstore.utils import reverse_course_url
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
@@ -31,6 +35,14 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 
 __all__ = ['assets_handler']
 
+# The asset fields needed to list assets with `_get_asset_json`.
+ASSET_LIST_FIELDS = ('displayname', 'contentType', 'uploadDate', 'thumbnail_location', 'locked')
+
+# How long, in seconds, the total count of a course's assets is cached for by the asset listing. Uploads and
+# deletions through Studio invalidate it straight away, but assets added otherwise (e.g. by a course import)
+# are only counted once it has expired.
+ASSET_COUNT_CACHE_TIMEOUT = 5 * 60
+
 # pylint: disable=unused-argument
 
 
@@ -50,6 +62,10 @@ def assets_handler(request, course_key_string=None, asset_key_string=None):
             page_size: the number of items per page (defaults to 50)
             sort: the asset field to sort by (defaults to "date_added")
             direction: the sort direction (defaults to "descending")
+            asset_type: the type of assets to list, one of settings.FILES_AND_UPLOAD_TYPE_FILTERS or "OTHER"
+            text_search: only list assets whose names contain this text
+            after: the nextCursor of the previous page, to get the page which follows it without skipping
+                through all the assets before it
     POST
         json: create (or update?) an asset. The only updating that can be done is changing the lock state.
     PUT
@@ -101,27 +117,9 @@ def _assets_json(request, course_key):
     requested_page_size = int(request.REQUEST.get('page_size', 50))
     requested_sort = request.REQUEST.get('sort', 'date_added')
     requested_filter = request.REQUEST.get('asset_type', '')
-    requested_file_types = settings.FILES_AND_UPLOAD_TYPE_FILTERS.get(
-        requested_filter, None)
-    filter_params = None
-    if requested_filter:
-        if requested_filter == 'OTHER':
-            all_filters = settings.FILES_AND_UPLOAD_TYPE_FILTERS
-            where = []
-            for all_filter in all_filters:
-                extension_filters = all_filters[all_filter]
-                where.extend(
-                    ["JSON.stringify(this.contentType).toUpperCase() != JSON.stringify('{}').toUpperCase()".format(
-                        extension_filter) for extension_filter in extension_filters])
-            filter_params = {
-                "$where": ' && '.join(where),
-            }
-        else:
-            where = ["JSON.stringify(this.contentType).toUpperCase() == JSON.stringify('{}').toUpperCase()".format(
-                req_filter) for req_filter in requested_file_types]
-            filter_params = {
-                "$where": ' || '.join(where),
-            }
+    requested_text_search = request.REQUEST.get('text_search', '')
+    requested_cursor = request.REQUEST.get('after') or None
+    filter_params = _get_filter_params(requested_filter, requested_text_search)
 
     sort_direction = DESCENDING
     if request.REQUEST.get('direction', '').lower() == 'asc':
@@ -140,14 +138,18 @@ def _assets_json(request, course_key):
         'current_page': current_page,
         'page_size': requested_page_size,
         'sort': sort,
-        'filter_params': filter_params
+        'filter_params': filter_params,
+        'after': requested_cursor,
     }
-    assets, total_count = _get_assets_for_page(request, course_key, options)
+    try:
+        assets, total_count = _get_assets_for_page(request, course_key, options)
+    except ValueError:
+        return HttpResponseBadRequest()
     end = start + len(assets)
 
     # If the query is beyond the final page, then re-query the final page so
     # that at least one asset is returned
-    if requested_page > 0 and start >= total_count:
+    if requested_page > 0 and start >= total_count and not requested_cursor:
         options['current_page'] = current_page = int(math.floor((total_count - 1) / requested_page_size))
         start = current_page * requested_page_size
         assets, total_count = _get_assets_for_page(request, course_key, options)
@@ -181,12 +183,82 @@ def _assets_json(request, course_key):
         'totalCount': total_count,
         'assets': asset_json,
         'sort': requested_sort,
+        'nextCursor': contentstore().asset_cursor(assets[-1], sort) if len(assets) == requested_page_size else None,
     })
 
 
+def _get_filter_params(requested_filter, requested_text_search):
+    """
+    Returns the query for the assets of the requested type (one of settings.FILES_AND_UPLOAD_TYPE_FILTERS,
+    or "OTHER" for the assets of none of those types) whose names contain the requested text, or None.
+    """
+    filter_params = {}
+    if requested_filter:
+        all_filters = settings.FILES_AND_UPLOAD_TYPE_FILTERS
+        if requested_filter == 'OTHER':
+            content_types = [content_type for content_types in all_filters.values() for content_type in content_types]
+            operator = '$nin'
+        else:
+            content_types = all_filters.get(requested_filter, [])
+            operator = '$in'
+        filter_params['contentType'] = {
+            operator: [re.compile(u'^{}$'.format(re.escape(content_type)), re.IGNORECASE)
+                       for content_type in content_types]
+        }
+    if requested_text_search:
+        filter_params['displayname'] = re.compile(re.escape(requested_text_search), re.IGNORECASE)
+    return filter_params or None
+
+
+def _asset_count_cache_key(course_key, filter_params):
+    """
+    Returns the cache key of the count of the course's assets matching filter_params.
+    """
+    generation = cache.get(_asset_count_generation_key(course_key), 0)
+    query = _stable_query(filter_params or {})
+    return 'asset_count.{}'.format(hashlib.md5(repr((unicode(course_key), generation, query))).hexdigest())
+
+
+def _stable_query(value):
+    """
+    Returns the Mongo query `value` with its dicts as sorted items, and its regexes as their pattern and
+    flags, whose repr is the same in every process, unlike the repr of compiled regexes.
+    """
+    if isinstance(value, dict):
+        return sorted((key, _stable_query(item)) for key, item in value.iteritems())
+    if isinstance(value, (list, tuple)):
+        return [_stable_query(item) for item in value]
+    if hasattr(value, 'pattern'):
+        return ('regex', value.pattern, value.flags)
+    return value
+
+
+def _asset_count_generation_key(course_key):
+    """
+    Returns the cache key of the number of times the course's cached asset counts have been invalidated.
+    """
+    return 'asset_count_generation.{}'.format(hashlib.md5(unicode(course_key).encode('utf-8')).hexdigest())
+
+
+def invalidate_asset_counts(course_key):
+    """
+    Forget the cached counts of the course's assets, which have been added or deleted.
+    """
+    generation_key = _asset_count_generation_key(course_key)
+    try:
+        cache.incr(generation_key)
+    except ValueError:
+        # incr fails if the key isn't cached yet.
+        cache.set(generation_key, 1, None)
+
+
 def _get_assets_for_page(request, course_key, options):
     """
-    Returns the list of assets for the specified page and page size.
+    Returns the list of assets for the specified page and page size, and the total count of the assets.
+
+    The total count is cached, as counting all of a course's assets takes as long as listing them.
+
+    Raises ValueError if `options['after']` is not a valid cursor.
     """
     current_page = options['current_page']
     page_size = options['page_size']
@@ -194,9 +266,16 @@ def _get_assets_for_page(request, course_key, options):
     filter_params = options['filter_params'] if options['filter_params'] else None
     start = current_page * page_size
 
-    return contentstore().get_all_content_for_course(
-        course_key, start=start, maxresults=page_size, sort=sort, filter_params=filter_params
+    count_cache_key = _asset_count_cache_key(course_key, filter_params)
+    total_count = cache.get(count_cache_key)
+    assets, count = contentstore().get_all_content_for_course(
+        course_key, start=start, maxresults=page_size, sort=sort, filter_params=filter_params,
+        fields=ASSET_LIST_FIELDS, after=options.get('after'), with_count=total_count is None
     )
+    if total_count is None:
+        total_count = count
+        cache.set(count_cache_key, total_count, ASSET_COUNT_CACHE_TIMEOUT)
+    return assets, total_count
 
 
 def get_file_size(upload_file):
@@ -264,22 +343,37 @@ def _upload_asset(request, course_key):
         content = sc_partial(upload_file.read())
         tempfile_path = None
 
-    # first let's see if a thumbnail can be created
-    (thumbnail_content, thumbnail_location) = contentstore().generate_thumbnail(
-        content,
-        tempfile_path=tempfile_path,
-    )
-
-    # delete cached thumbnail even if one couldn't be created this time (else
-    # the old thumbnail will continue to show)
-    del_cached_content(thumbnail_location)
-    # now store thumbnail location only if we could create it
-    if thumbnail_content is not None:
-        content.thumbnail_location = thumbnail_location
+    generate_thumbnails_async = settings.FEATURES.get('ENABLE_ASYNC_ASSET_THUMBNAILS') and content.is_image
+    if not generate_thumbnails_async:
+        # first let's see if a thumbnail can be created
+        (thumbnail_content, thumbnail_location) = contentstore().generate_thumbnail(
+            content,
+            tempfile_path=tempfile_path,
+        )
+
+        # delete cached thumbnail even if one couldn't be created this time (else
+        # the old thumbnail will continue to show)
+        del_cached_content(thumbnail_location)
+        # now store thumbnail location only if we could create it
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
 
     # then commit the content
     contentstore().save(content)
     del_cached_content(content.location)
+    invalidate_asset_counts(course_key)
+
+    # the resized copies of any image this replaces must not be served in its place
+    if generate_thumbnails_async:
+        contentstore().delete_image_derivatives(content.location)
+    else:
+        contentstore().generate_image_derivatives(content, tempfile_path=tempfile_path)
+    for derivative_location in StaticContent.compute_derivative_locations(content.location):
+        del_cached_content(derivative_location)
+
+    if generate_thumbnails_async:
+        # The asset is listed without a thumbnail until the task has generated it, and its resized copies.
+        generate_asset_thumbnails.delay([unicode(content.location)])
 
     # readback the saved content - we need the database timestamp
     readback = contentstore().find(content.location)
@@ -328,6 +422,14 @@ def _update_asset(request, course_key, asset_key):
             contentstore().set_attr(asset_key, 'locked', modified_asset['locked'])
             # Delete the asset from the cache so we check the lock status the next time it is requested.
             del_cached_content(asset_key)
+            # Resized copies of images are locked with them
+            for derivative_location in StaticContent.compute_derivative_locations(asset_key):
+                try:
+                    contentstore().set_attr(derivative_location, 'locked', modified_asset['locked'])
+                except NotFoundError:
+                    # The image is narrower than this copy, or it isn't an image
+                    continue
+                del_cached_content(derivative_location)
             return JsonResponse(modified_asset, status=201)
 
 
@@ -359,10 +461,16 @@ def delete_asset(course_key, asset_key):
         except Exception:  # pylint: disable=broad-except
             logging.warning('Could not delete thumbnail: %s', thumbnail_location)
 
+    # resized copies of images aren't kept in the trashcan
+    if content.is_image:
+        for derivative_location in contentstore().delete_image_derivatives(asset_key):
+            del_cached_content(derivative_location)
+
     # delete the original
     contentstore().delete(content.get_id())
     # remove from cache
     del_cached_content(content.location)
+    invalidate_asset_counts(course_key)
 
 
 def _get_asset_json(display_name, content_type, date, location, thumbnail_location, locked):
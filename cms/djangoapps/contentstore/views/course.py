@@ -13,6 +13,8 @@ from django.contrib.auth.decorators import login_required
 from django.conf import settings
 from django.views.decorators.http import require_http_methods, require_GET
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Q
 from django.core.urlresolvers import reverse
 from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponse, Http404
 from util.json_request import JsonResponse, JsonResponseBadRequest
@@ -27,6 +29,7 @@ from xmodule.tabs import CourseTab, CourseTabList, InvalidTabsException
 from openedx.core.lib.course_tabs import CourseTabPluginManager
 from openedx.core.djangoapps.credit.api import is_credit_course, get_credit_requirements
 from openedx.core.djangoapps.credit.tasks import update_credit_course_requirements
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.content.course_structures.api.v0 import api, errors
 from openedx.core.djangoapps.self_paced.models import SelfPacedConfiguration
 from xmodule.modulestore import EdxJSONEncoder
@@ -34,6 +37,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError, DuplicateCourseErr
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locations import Location
 from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.locator import LibraryLocator
 
 from django.views.decorators.csrf import ensure_csrf_cookie
 from openedx.core.lib.js_utils import escape_json_dumps
@@ -77,6 +81,7 @@ from .item import create_xblock_info
 from contentstore.push_notification import push_notification_enabled
 from course_creators.views import get_course_creator_status, add_user_with_status_unrequested
 from contentstore import utils
+from student.models import CourseAccessRole
 from student.roles import (
     CourseInstructorRole, CourseStaffRole, CourseCreatorRole, GlobalStaff, UserBasedRole
 )
@@ -357,14 +362,88 @@ def _accessible_courses_list(request):
         return has_studio_read_access(request.user, course.id)
 
     courses = filter(course_filter, modulestore().get_courses())
-    in_process_course_actions = [
+    return courses, _accessible_in_process_course_actions(request.user)
+
+
+def _accessible_in_process_course_actions(user):
+    """
+    List the unsucceeded course reruns which the user can read
+    """
+    return [
         course for course in
         CourseRerunState.objects.find_all(
             exclude_args={'state': CourseRerunUIStateManager.State.SUCCEEDED}, should_display=True
         )
-        if has_studio_read_access(request.user, course.course_key)
+        if has_studio_read_access(user, course.course_key)
     ]
-    return courses, in_process_course_actions
+
+
+# The fields by which the course listing can be sorted, by the name of the order.
+COURSE_LISTING_ORDERS = {
+    'display_name': 'display_name',
+    'org': 'display_org_with_default',
+    'number': 'display_number_with_default',
+    'start': 'start',
+    'created': 'created',
+}
+
+
+def _accessible_course_overviews(user):
+    """
+    Return a QuerySet of the overviews of the courses available to the user, filtered in the database
+    by the user's course and org staff and instructor roles rather than by checking each course
+    """
+    if GlobalStaff().has_user(user):
+        return CourseOverview.objects.all()
+
+    course_ids = set()
+    orgs = set()
+    for course_access in CourseAccessRole.objects.filter(
+            user=user, role__in=[CourseInstructorRole.ROLE, CourseStaffRole.ROLE]
+    ):
+        if course_access.course_id is None:
+            # org-based role
+            orgs.add(course_access.org)
+        elif not isinstance(course_access.course_id, LibraryLocator):
+            course_ids.add(course_access.course_id)
+
+    # Create the overviews of the user's courses which don't have one yet
+    CourseOverview.get_from_ids(course_ids)
+    return CourseOverview.objects.filter(Q(id__in=course_ids) | Q(org__in=orgs))
+
+
+def _course_overviews_page(request, in_process_course_actions):
+    """
+    Return the page of the overviews of the courses available to the user that is requested by the
+    `page`, `search` and `order` GET parameters, leaving out the courses being rerun
+    """
+    overviews = _accessible_course_overviews(request.user).exclude(
+        id__in=[uca.course_key for uca in in_process_course_actions]
+    )
+
+    search = request.GET.get('search', '').strip()
+    if search:
+        overviews = overviews.filter(
+            Q(display_name__icontains=search) |
+            Q(display_org_with_default__icontains=search) |
+            Q(display_number_with_default__icontains=search)
+        )
+
+    order = request.GET.get('order', 'display_name')
+    order_field = COURSE_LISTING_ORDERS.get(order.lstrip('-'), 'display_name')
+    if order.startswith('-'):
+        order_field = '-' + order_field
+    overviews = overviews.order_by(order_field, 'id').only(
+        'id', '_location', 'display_name', 'display_org_with_default', 'display_number_with_default',
+    )
+
+    paginator = Paginator(overviews, settings.COURSE_LISTING_PAGE_SIZE)
+    try:
+        return paginator.page(request.GET.get('page', 1))
+    except PageNotAnInteger:
+        return paginator.page(1)
+    except EmptyPage:
+        return paginator.page(paginator.num_pages)
 
 
 def _accessible_courses_list_from_groups(request):
@@ -419,7 +498,23 @@ def course_listing(request):
     """
     List all courses available to the logged in user
     """
-    courses, in_process_course_actions = get_courses_accessible_to_user(request)
+    course_pagination = None
+    if settings.FEATURES.get('ENABLE_COURSE_LISTING_FROM_OVERVIEWS', False):
+        in_process_course_actions = _accessible_in_process_course_actions(request.user)
+        course_page = _course_overviews_page(request, in_process_course_actions)
+        courses = [_format_course_overview_for_view(overview) for overview in course_page]
+        course_pagination = {
+            'page': course_page.number,
+            'num_pages': course_page.paginator.num_pages,
+            'count': course_page.paginator.count,
+            'previous_page': course_page.previous_page_number() if course_page.has_previous() else None,
+            'next_page': course_page.next_page_number() if course_page.has_next() else None,
+            'search': request.GET.get('search', '').strip(),
+            'order': request.GET.get('order', 'display_name'),
+        }
+    else:
+        courses, in_process_course_actions = get_courses_accessible_to_user(request)
+        courses = _remove_in_process_courses(courses, in_process_course_actions)
     libraries = _accessible_libraries_list(request.user) if LIBRARIES_ENABLED else []
 
     def format_in_process_course_view(uca):
@@ -456,11 +551,11 @@ def course_listing(request):
             'can_edit': has_studio_write_access(request.user, library.location.library_key),
         }
 
-    courses = _remove_in_process_courses(courses, in_process_course_actions)
     in_process_course_actions = [format_in_process_course_view(uca) for uca in in_process_course_actions]
 
     return render_to_response('index.html', {
         'courses': courses,
+        'course_pagination': course_pagination,
         'in_process_course_actions': in_process_course_actions,
         'libraries_enabled': LIBRARIES_ENABLED,
         'libraries': [format_library_for_view(lib) for lib in libraries],
@@ -616,6 +711,22 @@ def _remove_in_process_courses(courses, in_process_course_actions):
     return courses
 
 
+def _format_course_overview_for_view(course_overview):
+    """
+    Return a dict of the data which the view requires for a course, from its overview
+    """
+    return {
+        'display_name': course_overview.display_name,
+        'course_key': unicode(course_overview.id),
+        'url': reverse_course_url('course_handler', course_overview.id),
+        'lms_link': get_lms_link_for_item(course_overview.location),
+        'rerun_link': _get_rerun_link_for_item(course_overview.id),
+        'org': course_overview.display_org_with_default,
+        'number': course_overview.display_number_with_default,
+        'run': course_overview.id.run
+    }
+
+
 def course_outline_initial_state(locator_to_show, course_structure):
     """
     Returns the desired initial state for the course outline view. If the 'show' request parameter
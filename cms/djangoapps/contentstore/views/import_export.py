@@ -43,6 +43,7 @@ from contentstore.views.entrance_exam import (
     remove_entrance_exam_milestone_reference
 )
 
+from contentstore.tasks import generate_course_thumbnails
 from contentstore.utils import reverse_course_url, reverse_usage_url, reverse_library_url
 
 
@@ -280,13 +281,17 @@ def _import_handler(request, courselike_key, root_name, successful_url, context_
                     'courselike_import.time',
                     tags=[u"courselike:{}".format(courselike_key)]
                 ):
+                    generate_thumbnails_async = settings.FEATURES.get('ENABLE_ASYNC_ASSET_THUMBNAILS', False)
                     courselike_items = import_func(
                         modulestore(), request.user.id,
                         settings.GITHUB_REPO_ROOT, [dirpath],
                         load_error_modules=False,
                         static_content_store=contentstore(),
-                        target_id=courselike_key
+                        target_id=courselike_key,
+                        generate_thumbnails=not generate_thumbnails_async
                     )
+                    if generate_thumbnails_async:
+                        generate_course_thumbnails.delay(unicode(courselike_key))
 
                 new_location = courselike_items[0].location
                 logging.debug('new course at %s', new_location)
@@ -752,7 +752,7 @@ def _get_module_info(xblock, rewrite_static_links=True, include_ancestor_info=Fa
 
 def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=False, include_child_info=False,
                        course_outline=False, include_children_predicate=NEVER, parent_xblock=None, graders=None,
-                       user=None, course=None):
+                       user=None, course=None, subtree_changes=None):
     """
     Creates the information needed for client-side XBlockInfo.
 
@@ -767,13 +767,23 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
 
     In addition, an optional include_children_predicate argument can be provided to define whether or
     not a particular xblock should have its children included.
+
+    The course outline needs has_changes for every block it includes, so it is computed for the whole
+    subtree in one pass and passed down to the children as subtree_changes, as returned by
+    `get_subtree_changes`.
     """
     is_library_block = isinstance(xblock.location, LibraryUsageLocator)
     is_xblock_unit = is_unit(xblock, parent_xblock)
     # this should not be calculated for Sections and Subsections on Unit page or for library blocks
     has_changes = None
     if (is_xblock_unit or course_outline) and not is_library_block:
-        has_changes = modulestore().has_changes(xblock)
+        if course_outline and subtree_changes is None:
+            subtree_changes = modulestore().get_subtree_changes(xblock)
+        block_key = (xblock.location.block_type, xblock.location.block_id)
+        if subtree_changes is not None and block_key in subtree_changes:
+            has_changes = subtree_changes[block_key]
+        else:
+            has_changes = modulestore().has_changes(xblock)
 
     if graders is None:
         if not is_library_block:
@@ -798,7 +808,8 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
             graders,
             include_children_predicate=include_children_predicate,
             user=user,
-            course=course
+            course=course,
+            subtree_changes=subtree_changes,
         )
     else:
         child_info = None
@@ -1028,7 +1039,8 @@ def _create_xblock_ancestor_info(xblock, course_outline):
     }
 
 
-def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER, user=None, course=None):  # pylint: disable=line-too-long
+def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER, user=None, course=None,  # pylint: disable=line-too-long
+                              subtree_changes=None):
     """
     Returns information about the children of an xblock, as well as about the primary category
     of xblock expected as children.
@@ -1049,6 +1061,7 @@ def _create_xblock_child_info(xblock, course_outline, graders, include_children_
                 graders=graders,
                 user=user,
                 course=course,
+                subtree_changes=subtree_changes,
             ) for child in xblock.get_children()
         ]
     return child_info
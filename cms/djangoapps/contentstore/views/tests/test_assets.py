@@ -6,8 +6,10 @@ from io import BytesIO
 from pytz import UTC
 from PIL import Image
 import json
+import re
 from mock import patch
 from django.conf import settings
+from django.core.cache import cache
 
 from contentstore.tests.utils import CourseTestCase
 from contentstore.views import assets
@@ -41,6 +43,8 @@ class AssetsTestCase(CourseTestCase):
     def setUp(self):
         super(AssetsTestCase, self).setUp()
         self.url = reverse_course_url('assets_handler', self.course.id)
+        # Don't use asset counts cached by other tests.
+        cache.clear()
 
     def upload_asset(self, name="asset-1", asset_type='text'):
         """
@@ -182,6 +186,67 @@ class PaginationTestCase(AssetsTestCase):
         self.assert_correct_asset_response(
             self.url + "?page_size=3&page=1", 3, 1, 4)
 
+    def test_cursor_pagination(self):
+        """
+        Test paging through the assets with the cursor of each page
+        """
+        for name in ("asset-1", "asset-2", "asset-3"):
+            self.upload_asset(name)
+
+        url = self.url + "?page_size=2&sort=display_name&direction=asc"
+        json_response = json.loads(self.client.get(url, HTTP_ACCEPT='application/json').content)
+        self.assertEqual([asset['display_name'] for asset in json_response['assets']], ["asset-1.txt", "asset-2.txt"])
+        self.assertIsNotNone(json_response['nextCursor'])
+
+        json_response = json.loads(self.client.get(
+            url + "&page=1&after=" + json_response['nextCursor'], HTTP_ACCEPT='application/json'
+        ).content)
+        self.assertEqual([asset['display_name'] for asset in json_response['assets']], ["asset-3.txt"])
+        self.assertEqual(json_response['start'], 2)
+        self.assertEqual(json_response['totalCount'], 3)
+        self.assertIsNone(json_response['nextCursor'])
+
+        resp = self.client.get(url + "&after=not-a-cursor", HTTP_ACCEPT='application/json')
+        self.assertEqual(resp.status_code, 400)
+
+    def test_text_search(self):
+        """
+        Test listing the assets whose names contain some text
+        """
+        self.upload_asset("asset-1")
+        self.upload_asset("other-asset")
+        self.upload_asset("Picture", "image")
+        resp = self.client.get(self.url + "?text_search=ASSET", HTTP_ACCEPT='application/json')
+        json_response = json.loads(resp.content)
+        self.assertEqual(json_response['totalCount'], 2)
+        self.assertEqual(
+            sorted(asset['display_name'] for asset in json_response['assets']),
+            ["asset-1.txt", "other-asset.txt"]
+        )
+
+        resp = self.client.get(self.url + "?text_search=asset&asset_type=Images", HTTP_ACCEPT='application/json')
+        self.assertEqual(json.loads(resp.content)['totalCount'], 0)
+
+    def test_cached_count(self):
+        """
+        Test that the total count of assets is cached until assets are uploaded or deleted
+        """
+        self.upload_asset("asset-1")
+        self.assert_correct_asset_response(self.url, 0, 1, 1)
+
+        # Assets saved straight to the contentstore aren't counted until the cached count expires...
+        content = StaticContent(
+            self.course.id.make_asset_key('asset', 'unseen.txt'), 'unseen.txt', 'text/plain', 'unseen'
+        )
+        contentstore().save(content)
+        self.assert_correct_asset_response(self.url, 0, 2, 1)
+
+        # ...or assets are uploaded or deleted through Studio.
+        self.upload_asset("asset-2")
+        self.assert_correct_asset_response(self.url, 0, 3, 3)
+        assets.delete_asset(self.course.id, content.location)
+        self.assert_correct_asset_response(self.url, 0, 2, 2)
+
     @mock.patch('xmodule.contentstore.mongo.MongoContentStore.get_all_content_for_course')
     def test_mocked_filtered_response(self, mock_get_all_content_for_course):
         """
@@ -283,6 +348,19 @@ class UploadTestCase(AssetsTestCase):
         resp = self.upload_asset("test_image", asset_type="image")
         self.assertEquals(resp.status_code, 200)
 
+    @data(True, False)
+    def test_upload_image_thumbnail(self, async_thumbnails):
+        features = dict(settings.FEATURES, ENABLE_ASYNC_ASSET_THUMBNAILS=async_thumbnails)
+        with override_settings(FEATURES=features):
+            resp = self.upload_asset("test_image", asset_type="image")
+        self.assertEquals(resp.status_code, 200)
+        # The thumbnail is only listed once the (eager, in tests) task has generated it.
+        self.assertEqual(json.loads(resp.content)['asset']['thumbnail'] is None, async_thumbnails)
+        asset_key = self.course.id.make_asset_key('asset', 'test_image.jpg')
+        thumbnail_location = contentstore().find(asset_key).thumbnail_location
+        self.assertIsNotNone(thumbnail_location)
+        self.assertIsNotNone(contentstore().find(thumbnail_location))
+
     def test_no_file(self):
         resp = self.client.post(self.url, {"name": "file.txt"}, "application/json")
         self.assertEquals(resp.status_code, 400)
@@ -368,6 +446,25 @@ class AssetToJsonTestCase(AssetsTestCase):
         self.assertIsNone(output["thumbnail"])
 
 
+class AssetCountCacheKeyTestCase(AssetsTestCase):
+    """
+    Unit test for the cache keys of the counts of assets.
+    """
+    def test_filter_cache_key(self):
+        # pylint: disable=protected-access
+        filter_params = assets._get_filter_params('Images', 'photo')
+        # The regexes are compiled again, as they are by other processes
+        re.purge()
+        self.assertEqual(
+            assets._asset_count_cache_key(self.course.id, filter_params),
+            assets._asset_count_cache_key(self.course.id, assets._get_filter_params('Images', 'photo')),
+        )
+        self.assertNotEqual(
+            assets._asset_count_cache_key(self.course.id, filter_params),
+            assets._asset_count_cache_key(self.course.id, assets._get_filter_params('Images', 'other')),
+        )
+
+
 class LockAssetTestCase(AssetsTestCase):
     """
     Unit test for locking and unlocking an asset.
@@ -1484,6 +1484,37 @@ class TestXBlockInfo(ItemTest):
             with check_mongo_calls(chapter_queries_1):
                 self.client.get(outline_url, HTTP_ACCEPT='application/json')
 
+    @ddt.data(ModuleStoreEnum.Type.split, ModuleStoreEnum.Type.mongo)
+    def test_course_outline_computes_changes_once(self, store_type):
+        """
+        The course outline gets has_changes for all of its blocks from a single get_subtree_changes call.
+        """
+        with self.store.default_store(store_type):
+            course = CourseFactory.create()
+            chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+            sequential = ItemFactory.create(parent_location=chapter.location, category='sequential')
+            ItemFactory.create(parent_location=sequential.location, category='vertical', publish_item=False)
+            course = modulestore().get_course(course.id, depth=None)
+
+            store = modulestore()
+            with patch.object(store, 'get_subtree_changes', wraps=store.get_subtree_changes) as mock_changes:
+                with patch.object(store, 'has_changes', wraps=store.has_changes) as mock_has_changes:
+                    xblock_info = create_xblock_info(
+                        course,
+                        include_child_info=True,
+                        course_outline=True,
+                        include_children_predicate=lambda xblock: not xblock.category == 'vertical'
+                    )
+                    mock_changes.assert_called_once_with(course)
+                    self.assertFalse(mock_has_changes.called)
+
+        self.assertTrue(xblock_info['has_changes'])
+        chapter_info = xblock_info['child_info']['children'][0]
+        self.assertTrue(chapter_info['has_changes'])
+        unit_info = chapter_info['child_info']['children'][0]['child_info']['children'][0]
+        self.assertTrue(unit_info['has_changes'])
+        self.assertEqual(unit_info['visibility_state'], VisibilityState.needs_attention)
+
     def test_entrance_exam_chapter_xblock_info(self):
         chapter = ItemFactory.create(
             parent_location=self.course.location, category='chapter', display_name="Entrance Exam",
@@ -179,8 +179,23 @@ FEATURES = {
 
     # Special Exams, aka Timed and Proctored Exams
     'ENABLE_SPECIAL_EXAMS': False,
+
+    # List the courses on the Studio home page from their course overviews, a page at a time,
+    # rather than loading every course from the modulestore. Run the generate_course_overview
+    # management command with --all before enabling this, so that every course has an overview.
+    'ENABLE_COURSE_LISTING_FROM_OVERVIEWS': False,
+
+    # Generate the thumbnails of uploaded and imported images in a celery task, rather than in the request.
+    'ENABLE_ASYNC_ASSET_THUMBNAILS': True,
+
+    # Profile the SQL queries, Mongo operations, cache gets and sets, modulestore calls and XBlock
+    # renders of each request, and report them by view. See REQUEST_PROFILE_BUDGETS.
+    'ENABLE_REQUEST_PROFILING': False,
 }
 
+# The number of courses on each page of the Studio home page, when listed from course overviews.
+COURSE_LISTING_PAGE_SIZE = 50
+
 ENABLE_JASMINE = False
 
 ############################# SOCIAL MEDIA SHARING #############################
@@ -211,6 +226,9 @@ GEOIPV6_PATH = REPO_ROOT / "common/static/data/geoip/GeoIPv6.dat"
 # TODO: Move the Mako templating into a different engine in TEMPLATES below.
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_cms')
+# Whether to load all the Mako templates at startup, compiling those which aren't compiled in the
+# MAKO_MODULE_DIR yet, rather than on their first render.
+MAKO_WARM_LOOKUPS_ON_STARTUP = False
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [
     PROJECT_ROOT / 'templates',
@@ -293,10 +311,22 @@ XQUEUE_INTERFACE = {
 # Ignore deprecation warnings (so we don't clutter Jenkins builds/production)
 simplefilter('ignore')
 
+############################# Request profiles ################################
+
+# The settings of the request profiles, when FEATURES['ENABLE_REQUEST_PROFILING'] is on.
+# The fraction of the requests whose every operation is logged, with its name and time.
+REQUEST_PROFILE_TRACE_SAMPLE_RATE = 0
+# The budgets of the requests, by view name, with '*' for every view, e.g.
+#     {'*': {'sql.count': 100}, 'contentstore.views.course.course_handler': {'mongo.count': 50}}
+# The requests which exceed the count or time (in seconds) of any kind of operation are logged.
+REQUEST_PROFILE_BUDGETS = {}
+
 ################################# Middleware ###################################
 
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    # Comes early, so that the work of the other middleware is profiled too
+    'openedx.core.djangoapps.request_profile.middleware.RequestProfileMiddleware',
     'django.middleware.cache.UpdateCacheMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
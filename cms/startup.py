@@ -9,6 +9,7 @@ settings.INSTALLED_APPS  # pylint: disable=pointless-statement
 
 from openedx.core.lib.django_startup import autostartup
 import django
+import edxmako
 from monkey_patch import third_party_auth
 
 import xmodule.x_module
@@ -37,6 +38,10 @@ def run():
     xmodule.x_module.descriptor_global_handler_url = cms.lib.xblock.runtime.handler_url
     xmodule.x_module.descriptor_global_local_resource_url = cms.lib.xblock.runtime.local_resource_url
 
+    # Load the templates once all the lookup directories, including the theme's, are added.
+    if settings.MAKO_WARM_LOOKUPS_ON_STARTUP:
+        edxmako.paths.warm_lookups()
+
 
 def add_mimetypes():
     """
@@ -2,6 +2,10 @@
 from safe_lxml import defuse_xml_libs
 defuse_xml_libs()
 
+# Profile the startup, if the EDX_PROFILE_STARTUP environment variable is set.
+from openedx.core.lib import startup_profiler
+startup_profiler.install()
+
 # Disable PyContract contract checking when running as a webserver
 import contracts
 contracts.disable_all()
@@ -12,8 +16,11 @@ openedx.core.operations.install_memory_dumper()
 import os
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cms.envs.aws")
 
-import cms.startup as startup
-startup.run()
+with startup_profiler.step('cms.startup'):
+    import cms.startup as startup
+    startup.run()
+
+startup_profiler.report()
 
 # This application object is used by the development server
 # as well as any WSGI server configured to use this file.
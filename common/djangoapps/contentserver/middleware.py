@@ -10,7 +10,7 @@ from django.http import (
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG, IMAGE_DERIVATIVE_CATEGORY
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
@@ -41,6 +41,12 @@ class StaticContentServer(object):
                 response.status_code = 400
                 return response
 
+            # resized copies of images are only served in place of their image, by `find_derivative`
+            if loc.category == IMAGE_DERIVATIVE_CATEGORY:
+                response = HttpResponse()
+                response.status_code = 404
+                return response
+
             # first look in our cache so we don't have to round-trip to the DB
             content = get_cached_content(loc)
             if content is None:
@@ -77,6 +83,12 @@ class StaticContentServer(object):
                     ):
                         return HttpResponseForbidden('Unauthorized')
 
+            # Serve a smaller copy of an image if one was asked for, and made. Access is checked against
+            # the original image, which the copies are locked with.
+            derivative = self.find_derivative(request, loc, content)
+            if derivative is not None:
+                loc, content = derivative.location, derivative
+
             # convert over the DB persistent last modified timestamp to a HTTP compatible
             # timestamp, so we can simply compare the strings
             last_modified_at_str = content.last_modified_at.strftime("%a, %d-%b-%Y %H:%M:%S GMT")
@@ -148,6 +160,34 @@ class StaticContentServer(object):
 
             return response
 
+    def find_derivative(self, request, loc, content):
+        """
+        Returns the resized copy of the image `content` at `loc` matching the `width` query parameter of
+        the request, or None if no width was asked for, or there's no such copy.
+        """
+        try:
+            requested_width = int(request.GET.get('width', ''))
+        except ValueError:
+            return None
+        if loc.category != 'asset' or not content.is_image:
+            return None
+        width = StaticContent.derivative_width(requested_width)
+        if width is None:
+            return None
+
+        derivative_loc = StaticContent.compute_derivative_location(loc.course_key, loc.name, width)
+        derivative = get_cached_content(derivative_loc)
+        if derivative is None:
+            try:
+                derivative = AssetManager.find(derivative_loc, as_stream=True)
+            except (ItemNotFoundError, NotFoundError):
+                # The copy isn't made yet, or the image is narrower than the width.
+                return None
+            if derivative.length is not None and derivative.length < 1048576:
+                derivative = derivative.copy_to_in_mem()
+                set_cached_content(derivative)
+        return derivative
+
 
 def parse_range_header(header_value, content_length):
     """
@@ -5,12 +5,16 @@ import copy
 import ddt
 import logging
 import unittest
+from StringIO import StringIO
 from uuid import uuid4
 
+from PIL import Image
+
 from django.conf import settings
 from django.test.client import Client
 from django.test.utils import override_settings
 
+from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -192,6 +196,74 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         )
         self.assertEqual(resp.status_code, 416)
 
+    @ddt.data(
+        ('?width=300', 320),
+        ('?width=320', 320),
+        ('?width=500', 640),
+        ('?width=1000', None),
+        ('?width=wide', None),
+        ('', None),
+    )
+    @ddt.unpack
+    def test_image_derivatives(self, query, expected_width):
+        """
+        Test that resized copies of images are served for the requested widths they were made for.
+        """
+        image_file = StringIO()
+        Image.new('RGB', (800, 400)).save(image_file, 'PNG')
+        asset_key = self.course_key.make_asset_key('asset', 'wide.png')
+        content = StaticContent(asset_key, 'wide.png', 'image/png', image_file.getvalue())
+        self.contentstore.save(content)
+        self.assertEqual(len(self.contentstore.generate_image_derivatives(content)), 2)
+
+        resp = self.client.get(unicode(asset_key) + query)
+        self.assertEqual(resp.status_code, 200)
+        image = Image.open(StringIO(resp.content))
+        if expected_width is None:
+            self.assertEqual(resp['Content-Type'], 'image/png')
+            self.assertEqual(image.size, (800, 400))
+        else:
+            self.assertEqual(resp['Content-Type'], 'image/jpeg')
+            self.assertEqual(image.size, (expected_width, expected_width / 2))
+
+    def save_image(self, name, width, locked=False):
+        """
+        Save an image asset `width` pixels wide, and its resized copies. Returns the content saved.
+        """
+        image_file = StringIO()
+        Image.new('RGB', (width, width / 2)).save(image_file, 'PNG')
+        asset_key = self.course_key.make_asset_key('asset', name)
+        content = StaticContent(asset_key, name, 'image/png', image_file.getvalue(), locked=locked)
+        self.contentstore.save(content)
+        self.contentstore.generate_image_derivatives(content)
+        return content
+
+    def test_image_derivatives_locked(self):
+        """
+        Test that resized copies of locked images are locked, and can't be requested at their own location.
+        """
+        content = self.save_image('locked.png', 800, locked=True)
+        derivative_key = StaticContent.compute_derivative_location(self.course_key, 'locked.png', 640)
+        self.assertTrue(self.contentstore.find(derivative_key).locked)
+
+        self.client.login(username=self.non_staff_usr, password=self.non_staff_pwd)
+        resp = self.client.get(unicode(content.location) + '?width=640')
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.get(unicode(derivative_key))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_image_derivatives_replaced(self):
+        """
+        Test that the resized copies of an image are deleted when it is replaced by a narrower one.
+        """
+        content = self.save_image('replaced.png', 800)
+        self.save_image('replaced.png', 400)
+
+        resp = self.client.get(unicode(content.location) + '?width=500')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'image/png')
+        self.assertEqual(Image.open(StringIO(resp.content)).size, (400, 200))
+
 
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
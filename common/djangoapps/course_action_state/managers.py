@@ -114,6 +114,27 @@ class CourseRerunUIStateManager(CourseActionUIStateManager):
         FAILED = "failed"
         SUCCEEDED = "succeeded"
 
+    class Checkpoint(object):
+        """
+        An Enum class for the steps of a rerun, after each of which its progress is recorded.
+        """
+        # The destination course was created with the source's content.
+        COURSEWARE = "courseware"
+        # The source's assets were copied to the destination course.
+        ASSETS = "assets"
+        # The user who initiated the rerun was given access to the destination course.
+        PERMISSIONS = "permissions"
+
+        # The steps, in the order they are run in.
+        STEPS = (COURSEWARE, ASSETS, PERMISSIONS)
+
+        @classmethod
+        def is_completed(cls, checkpoint, step):
+            """
+            Returns whether `step` was completed by a rerun whose last completed step is `checkpoint`.
+            """
+            return bool(checkpoint) and cls.STEPS.index(step) <= cls.STEPS.index(checkpoint)
+
     def initiated(self, source_course_key, destination_course_key, user, display_name):
         """
         To be called when a new rerun is initiated for the given course by the given user.
@@ -125,6 +146,22 @@ class CourseRerunUIStateManager(CourseActionUIStateManager):
             allow_not_found=True,
             source_course_key=source_course_key,
             display_name=display_name,
+            checkpoint="",
+        )
+
+    def checkpointed(self, course_key, checkpoint):
+        """
+        To be called when an existing rerun for the given course has completed the step `checkpoint`.
+        """
+        self.filter(course_key=course_key, action=self.ACTION).update(checkpoint=checkpoint)
+
+    def resumed(self, course_key):
+        """
+        To be called when an existing rerun for the given course which failed is resumed from its last checkpoint.
+        """
+        self.update_state(
+            course_key=course_key,
+            new_state=self.State.IN_PROGRESS,
         )
 
     def succeeded(self, course_key):
@@ -134,6 +171,7 @@ class CourseRerunUIStateManager(CourseActionUIStateManager):
         self.update_state(
             course_key=course_key,
             new_state=self.State.SUCCEEDED,
+            checkpoint="",
         )
 
     def failed(self, course_key):
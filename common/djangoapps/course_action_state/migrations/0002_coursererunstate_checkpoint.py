@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_action_state', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursererunstate',
+            name='checkpoint',
+            field=models.CharField(default=b'', max_length=50, blank=True),
+        ),
+    ]
@@ -116,6 +116,10 @@ class CourseRerunState(CourseActionUIState):
     # Display name for destination course
     display_name = models.CharField(max_length=255, default="", blank=True)
 
+    # The last step of the rerun which completed (see CourseRerunUIStateManager.Checkpoint), so that a
+    # rerun which failed can be resumed after it
+    checkpoint = models.CharField(max_length=50, default="", blank=True)
+
     # MANAGERS
     # Override the abstract class' manager with a Rerun-specific manager that inherits from the base class' manager.
     objects = CourseRerunUIStateManager()
@@ -49,6 +49,14 @@ def assign_default_role(course_id, user):
     user.roles.add(role)
 
 
+def assign_default_role_to_users(course_id, users):
+    """
+    Assign forum default role 'Student' to each of `users`, at once
+    """
+    role, __ = Role.objects.get_or_create(course_id=course_id, name=FORUM_ROLE_STUDENT)
+    role.users.add(*users)
+
+
 class Role(models.Model):
 
     objects = NoneToEmptyManager()
@@ -1,4 +1,6 @@
 import logging
+import os
+import tempfile
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
@@ -9,8 +11,6 @@ from django.template import Engine
 
 from edxmako.template import Template
 
-from openedx.core.lib.tempdir import mkdtemp_clean
-
 log = logging.getLogger(__name__)
 
 
@@ -31,7 +31,10 @@ class MakoLoader(object):
 
         if module_directory is None:
             log.warning("For more caching of mako templates, set the MAKO_MODULE_DIR in settings!")
-            module_directory = mkdtemp_clean()
+            # Share the compiled templates between the processes, rather than each compiling them again.
+            # The lms and cms have templates of the same names, so each has its own directory.
+            service = getattr(settings, 'ROOT_URLCONF', 'django').split('.')[0]
+            module_directory = os.path.join(tempfile.gettempdir(), 'mako_{}'.format(service))
 
         self.module_directory = module_directory
 
@@ -0,0 +1,43 @@
+"""
+Compile the Mako templates of every lookup into the MAKO_MODULE_DIR ahead of time.
+
+Meant to be run when building a release, after setting MAKO_MODULE_DIR (or MAKO_MODULE_DIR_BASE)
+to the directory which its processes will share, so that none of them compiles a template itself:
+
+    ./manage.py lms compile_mako_templates --settings=aws
+    ./manage.py cms compile_mako_templates --settings=aws
+
+Each service compiles its templates into its own directory, as they have templates of the same names.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+
+from edxmako import LOOKUP
+from edxmako.paths import warm_lookups
+
+
+class Command(BaseCommand):
+    """
+    Management command to compile the Mako templates.
+    """
+
+    help = "Compile the Mako templates of the given template lookup namespaces, or of all of them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('namespaces', type=unicode, nargs='*', help='template lookup namespaces to compile')
+
+    def handle(self, *args, **options):
+        namespaces = options['namespaces']
+        unknown = [namespace for namespace in namespaces if namespace not in LOOKUP]
+        if unknown:
+            raise CommandError(u"Unknown template lookup namespaces: {}".format(u", ".join(unknown)))
+
+        failures = warm_lookups(namespaces)
+
+        # Not every file in the lookup directories is a Mako template, so these are only reported.
+        if options['verbosity'] > 1:
+            for namespace, uri, exception in failures:
+                self.stdout.write(u"Could not compile the {} template {}: {}".format(namespace, uri, exception))
+        self.stdout.write(u"Compiled the Mako templates into {}; {} could not be compiled.".format(
+            settings.MAKO_MODULE_DIR, len(failures)
+        ))
@@ -4,14 +4,21 @@ Set up lookup paths for mako templates.
 
 import hashlib
 import contextlib
+import logging
 import os
 import pkg_resources
 
+import dogstats_wrapper as dog_stats_api
 from django.conf import settings
 from mako.lookup import TemplateLookup
 
 from . import LOOKUP
 
+log = logging.getLogger(__name__)
+
+# The extensions of the files in the lookup directories which are loaded by `warm_lookups`.
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.underscore', '.xml', '.js')
+
 
 class DynamicTemplateLookup(TemplateLookup):
     """
@@ -46,6 +53,43 @@ class DynamicTemplateLookup(TemplateLookup):
         self._collection.clear()
         self._uri_cache.clear()
 
+    def _load(self, filename, uri):
+        """
+        Load the template at `filename`, compiling it into the module directory unless it already is.
+        """
+        with dog_stats_api.timer('edxmako.template.load', tags=[u'template:{}'.format(uri)]):
+            return super(DynamicTemplateLookup, self)._load(filename, uri)
+
+    def template_uris(self):
+        """
+        Returns the URIs of the templates in the lookup directories, as `get_template` expects them.
+        """
+        uris = set()
+        for directory in self.directories:
+            for dirpath, __, filenames in os.walk(directory):
+                for filename in filenames:
+                    if os.path.splitext(filename)[1] in TEMPLATE_EXTENSIONS:
+                        uris.add(os.path.relpath(os.path.join(dirpath, filename), directory).replace(os.path.sep, '/'))
+        return sorted(uris)
+
+    def warm(self):
+        """
+        Load all the templates of the lookup into its cache, compiling those which aren't compiled yet.
+
+        Returns a list of (uri, exception) for the templates which fail to compile, as not every
+        file in the lookup directories is necessarily a Mako template.
+        """
+        failures = []
+        for uri in self.template_uris():
+            try:
+                # Templates are cached by the URI they are asked for, which has a leading slash when
+                # it is inherited, included or imported by another template, and none when rendered.
+                self.get_template(uri)
+                self.get_template('/' + uri)
+            except Exception as exception:  # pylint: disable=broad-except
+                failures.append((uri, exception))
+        return failures
+
 
 def clear_lookups(namespace):
     """
@@ -77,6 +121,25 @@ def add_lookup(namespace, directory, package=None, prepend=False):
     templates.add_directory(directory, prepend=prepend)
 
 
+def warm_lookups(namespaces=None):
+    """
+    Load all the templates of the given namespaces, or of every namespace, into their lookups.
+
+    Compiling the templates is what makes the first render of each of them slow. Their modules are
+    written to the MAKO_MODULE_DIR, so other processes sharing it load them without compiling them.
+
+    Returns a list of (namespace, uri, exception) for the templates which fail to compile.
+    """
+    namespaces = namespaces or sorted(LOOKUP)
+    failures = []
+    for namespace in namespaces:
+        for uri, exception in LOOKUP[namespace].warm():
+            log.debug(u"Could not compile the %s template %s: %s", namespace, uri, exception)
+            failures.append((namespace, uri, exception))
+    log.info(u"Loaded the Mako templates of %s; %d could not be compiled", u", ".join(namespaces), len(failures))
+    return failures
+
+
 def lookup_template(namespace, name):
     """
     Look up a Mako template by namespace and name.
@@ -16,6 +16,8 @@ from django.template import Context
 from django.http import HttpResponse
 import logging
 
+import dogstats_wrapper as dog_stats_api
+
 from microsite_configuration import microsite
 
 from edxmako import lookup_template
@@ -131,7 +133,8 @@ def render_to_string(template_name, dictionary, context=None, namespace='main'):
 
     # fetch and render template
     template = lookup_template(namespace, template_name)
-    return template.render_unicode(**context_dictionary)
+    with dog_stats_api.timer('edxmako.template.render', tags=[u'template:{}'.format(template_name)]):
+        return template.render_unicode(**context_dictionary)
 
 
 def render_to_response(template_name, dictionary=None, context_instance=None, namespace='main', **kwargs):
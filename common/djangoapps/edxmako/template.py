@@ -12,6 +12,7 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import dogstats_wrapper as dog_stats_api
 import edxmako
 
 from django.conf import settings
@@ -59,4 +60,5 @@ class Template(MakoTemplate):
         context_dictionary['django_context'] = context_instance
         context_dictionary['marketing_link'] = marketing_link
 
-        return super(Template, self).render_unicode(**context_dictionary)
+        with dog_stats_api.timer('edxmako.template.render', tags=[u'template:{}'.format(self.uri)]):
+            return super(Template, self).render_unicode(**context_dictionary)
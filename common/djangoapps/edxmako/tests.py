@@ -1,5 +1,8 @@
 
 from mock import patch, Mock
+import os
+import shutil
+import tempfile
 import unittest
 import ddt
 
@@ -12,6 +15,7 @@ from django.core.urlresolvers import reverse
 import edxmako.middleware
 from edxmako.middleware import get_template_request_context
 from edxmako import add_lookup, LOOKUP
+from edxmako.paths import warm_lookups
 from edxmako.shortcuts import (
     marketing_link,
     render_to_string,
@@ -63,6 +67,40 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+class WarmLookupsTests(TestCase):
+    """
+    Test the `warm_lookups` function.
+    """
+    def setUp(self):
+        super(WarmLookupsTests, self).setUp()
+        self.template_dir = tempfile.mkdtemp()
+        self.module_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.template_dir)
+        self.addCleanup(shutil.rmtree, self.module_dir)
+        os.mkdir(os.path.join(self.template_dir, 'sub'))
+        for name, source in (('main.html', u'${body}'), ('sub/page.html', u'<%inherit file="/main.html"/>'),
+                             ('broken.html', u'<%inherit'), ('image.png', u'')):
+            with open(os.path.join(self.template_dir, name), 'w') as template_file:
+                template_file.write(source)
+
+    @patch.dict(LOOKUP, clear=True)
+    def test_warm_lookups(self):
+        with self.settings(MAKO_MODULE_DIR=self.module_dir):
+            add_lookup('test', self.template_dir)
+        lookup = LOOKUP['test']
+
+        failures = warm_lookups()
+
+        self.assertEqual([(namespace, uri) for namespace, uri, __ in failures], [('test', 'broken.html')])
+        self.assertEqual(
+            set(lookup._collection),  # pylint: disable=protected-access
+            {'main.html', '/main.html', 'sub/page.html', '/sub/page.html'}
+        )
+        # The templates are compiled into the module directory, for other processes to load
+        module_directory = lookup.template_args['module_directory']
+        self.assertTrue(os.path.exists(os.path.join(module_directory, 'sub', 'page.html.py')))
+
+
 class MakoMiddlewareTest(TestCase):
     """
     Test MakoMiddleware.
@@ -0,0 +1,145 @@
+"""
+Bulk loading of the per-course data displayed on the student dashboard.
+
+The dashboard shows a row for every course a user is enrolled in, and each
+row needs certificate, verification, course mode, refund and email settings
+information.  Loading those facts course by course costs several queries per
+enrollment, so `DashboardData` gathers each of them for the full set of
+enrolled courses with set-based queries up front, and the dashboard view then
+renders from the precomputed bundle.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+
+from bulk_email.models import CourseAuthorization
+from certificates.models import GeneratedCertificate, certificate_statuses_for_student
+from course_modes.models import CourseMode
+from shoppingcart.models import CourseRegistrationCode
+from student.helpers import check_verify_status_by_course
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+
+class DashboardData(object):
+    """
+    Precomputed, per-course data needed to render the student dashboard.
+
+    Every attribute is keyed by course id and covers all of the given
+    enrollments, so the number of queries used to build it does not depend
+    on how many courses the user is enrolled in.
+    """
+
+    def __init__(self, user, course_enrollments):
+        """
+        Arguments:
+            user (User): The user whose dashboard is being rendered.
+            course_enrollments (list[CourseEnrollment]): The enrollments displayed
+                on the dashboard.  Their course overviews must already be loaded.
+        """
+        self.user = user
+        self.course_enrollments = course_enrollments
+        self.course_ids = [enrollment.course_id for enrollment in course_enrollments]
+
+        # Course modes, keyed by course id and then by mode slug.
+        __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(self.course_ids)
+        self.course_modes_by_course = {
+            course_id: {
+                mode.slug: mode
+                for mode in modes
+            }
+            for course_id, modes in unexpired_course_modes.iteritems()
+        }
+
+        # Raw certificate statuses, as returned by `certificate_status_for_student`.
+        self.certificate_statuses = certificate_statuses_for_student(user, self.course_ids)
+
+        # Per-course verification messaging.
+        self.verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
+
+        self._email_enabled_courses = CourseAuthorization.instructor_email_enabled_for_courses(self.course_ids)
+        self._redeemed_registration_codes = self._load_redeemed_registration_codes()
+
+    def _load_redeemed_registration_codes(self):
+        """
+        Returns the registration codes redeemed by the user, grouped by course id.
+        """
+        codes_by_course = defaultdict(list)
+        if self.course_ids:
+            codes = CourseRegistrationCode.objects.filter(
+                course_id__in=self.course_ids,
+                registrationcoderedemption__redeemed_by=self.user
+            ).select_related('invoice_item__invoice')
+            for code in codes:
+                codes_by_course[code.course_id].append(code)
+        return codes_by_course
+
+    def certificate_status(self, course_id):
+        """
+        Returns the certificate status dictionary for the given course.
+        """
+        return self.certificate_statuses[course_id]
+
+    def course_modes(self, course_id):
+        """
+        Returns the unexpired course modes for the given course, keyed by slug.
+        """
+        return self.course_modes_by_course.get(course_id, {})
+
+    def redeemed_registration_codes(self, course_id):
+        """
+        Returns the registration codes the user redeemed for the given course.
+        """
+        return self._redeemed_registration_codes.get(course_id, [])
+
+    @property
+    def show_email_settings_for(self):
+        """
+        The courses for which the bulk email settings should be shown: only
+        courses not backed by XML and with instructor email enabled.
+        """
+        if not settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL']:
+            return frozenset()
+
+        store = modulestore()
+        return frozenset(
+            course_id for course_id in self.course_ids
+            if course_id in self._email_enabled_courses and
+            store.get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml
+        )
+
+    @property
+    def show_refund_option_for(self):
+        """
+        The courses for which the user is eligible for a refund.
+        """
+        courses_with_certificates = frozenset(
+            GeneratedCertificate.objects.filter(
+                user=self.user, course_id__in=self.course_ids
+            ).values_list('course_id', flat=True)
+        ) if self.course_ids else frozenset()
+        return frozenset(
+            enrollment.course_id for enrollment in self.course_enrollments
+            if enrollment.refundable(
+                user_already_has_certs_for=courses_with_certificates,
+                modes=self.course_modes(enrollment.course_id).values()
+            )
+        )
+
+    @property
+    def enrolled_courses_either_paid(self):
+        """
+        The courses the user is enrolled in that are white label or for
+        which the user is enrolled in a professional mode.
+        """
+        def selectable_modes(course_id):
+            """ Course modes as returned by `CourseMode.modes_for_course_dict`, which excludes credit modes. """
+            return {
+                slug: mode for slug, mode in self.course_modes(course_id).iteritems()
+                if slug not in CourseMode.CREDIT_MODES
+            }
+
+        return frozenset(
+            enrollment.course_id for enrollment in self.course_enrollments
+            if enrollment.is_paid_course(modes_dict=selectable_modes(enrollment.course_id))
+        )
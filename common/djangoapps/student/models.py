@@ -1202,6 +1202,82 @@ class CourseEnrollment(models.Model):
                 return None
             raise
 
+    @classmethod
+    def bulk_enroll(cls, users, course_key, mode="honor"):
+        """
+        Enroll many users in a course at once. This saves immediately.
+
+        Has the effects of `enroll` (without `check_access`) for each of the `users` who isn't
+        enrolled in the course yet, with a few queries in all rather than several per user:
+        their enrollments, and the history of them, are created or activated in bulk. Users
+        who are already enrolled keep their enrollment as it is.
+
+        Post-save signals are not sent for the enrollments, so the caller is responsible for
+        anything their receivers do besides invalidating the enrollment mode cache, such as
+        assigning the default forum role.
+
+        Returns a dict mapping the id of each user to their enrollment.
+        """
+        users = {user.id: user for user in users}
+        enrollments = {}
+        for enrollment in cls.objects.filter(course_id=course_key, user_id__in=users.keys()):
+            enrollment.user = users[enrollment.user_id]
+            enrollments[enrollment.user_id] = enrollment
+        activated = [enrollment for enrollment in enrollments.itervalues() if not enrollment.is_active]
+        new_user_ids = [user_id for user_id in users if user_id not in enrollments]
+
+        with transaction.atomic():
+            if activated:
+                cls.objects.filter(id__in=[enrollment.id for enrollment in activated]).update(is_active=True, mode=mode)
+            created = []
+            if new_user_ids:
+                cls.objects.bulk_create([
+                    cls(user_id=user_id, course_id=course_key, mode=mode, is_active=True) for user_id in new_user_ids
+                ])
+                # bulk_create doesn't set the ids of the enrollments it creates, so read them back
+                created = list(cls.objects.filter(course_id=course_key, user_id__in=new_user_ids))
+
+            mode_changed = []
+            for enrollment in activated:
+                if enrollment.mode != mode:
+                    enrollment.mode = mode
+                    mode_changed.append(enrollment)
+                enrollment.is_active = True
+
+            history_date = timezone.now()
+            cls.history.model.objects.bulk_create([
+                cls.history.model(
+                    history_date=history_date,
+                    history_type=history_type,
+                    history_user=None,
+                    **{field.attname: getattr(enrollment, field.attname) for field in cls._meta.fields}
+                )
+                for history_type, changed in (('+', created), ('~', activated))
+                for enrollment in changed
+            ])
+
+        for enrollment in created:
+            enrollment.user = users[enrollment.user_id]
+            enrollments[enrollment.user_id] = enrollment
+        cache.delete_many([
+            cls.cache_key_name(enrollment.user_id, unicode(course_key)) for enrollment in created + activated
+        ])
+
+        for enrollment in created + activated:
+            enrollment.emit_event(EVENT_NAME_ENROLLMENT_ACTIVATED)
+        for enrollment in mode_changed:
+            enrollment.emit_event(EVENT_NAME_ENROLLMENT_MODE_CHANGED)
+        if created or activated:
+            dog_stats_api.increment(
+                "common.student.enrollment",
+                len(created) + len(activated),
+                tags=[u"org:{}".format(course_key.org),
+                      u"offering:{}".format(course_key.offering),
+                      u"mode:{}".format(mode)]
+            )
+
+        return enrollments
+
     @classmethod
     def unenroll(cls, user, course_id, skip_refund=False):
         """
@@ -1318,11 +1394,39 @@ class CourseEnrollment(models.Model):
     def enrollments_for_user(cls, user):
         return CourseEnrollment.objects.filter(user=user, is_active=1)
 
-    def is_paid_course(self):
+    @classmethod
+    def enrollments_for_user_with_overviews_preload(cls, user):  # pylint: disable=invalid-name
+        """
+        List of user's CourseEnrollments, CourseOverviews preloaded if possible.
+
+        We try to preload all CourseOverviews, which are usually lazily loaded
+        as the .course_overview property. This is to avoid making an extra
+        query for every enrollment when displaying something like the student
+        dashboard. Missing overviews are generated in a single batch; if some
+        courses can't be loaded at all, we fall back to the existing lazy-load
+        behavior for them.
+
+        The enrollment attributes, which are used to determine refund
+        eligibility, are prefetched for the same reason.
+        """
+        enrollments = list(cls.enrollments_for_user(user).prefetch_related('attributes'))
+        overviews = CourseOverview.get_from_ids(
+            [enrollment.course_id for enrollment in enrollments]
+        )
+        for enrollment in enrollments:
+            enrollment._course_overview = overviews.get(enrollment.course_id)
+
+        return enrollments
+
+    def is_paid_course(self, modes_dict=None):
         """
         Returns True, if course is paid
+
+        Keyword Args:
+            modes_dict (dict): If provided, the course modes for this course,
+                keyed by slug.  Useful for avoiding unnecessary database queries.
         """
-        paid_course = CourseMode.is_white_label(self.course_id)
+        paid_course = CourseMode.is_white_label(self.course_id, modes_dict=modes_dict)
         if paid_course or CourseMode.is_professional_slug(self.mode):
             return True
 
@@ -1342,10 +1446,17 @@ class CourseEnrollment(models.Model):
         """Changes this `CourseEnrollment` record's mode to `mode`.  Saves immediately."""
         self.update_enrollment(mode=mode)
 
-    def refundable(self):
+    def refundable(self, user_already_has_certs_for=None, modes=None):
         """
         For paid/verified certificates, students may receive a refund if they have
         a verified certificate and the deadline for refunds has not yet passed.
+
+        Keyword Args:
+            user_already_has_certs_for (set of CourseKey): If provided, the set of
+                courses for which the user has a certificate.  Used by callers that
+                check many enrollments at once to avoid a query per enrollment.
+            modes (list of Mode): If provided, the unexpired course modes for this
+                course, used to avoid an additional database query.
         """
         # In order to support manual refunds past the deadline, set can_refund on this object.
         # On unenrolling, the "UNENROLL_DONE" signal calls CertificateItem.refund_cert_callback(),
@@ -1356,7 +1467,10 @@ class CourseEnrollment(models.Model):
             return True
 
         # If the student has already been given a certificate they should not be refunded
-        if GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None:
+        if user_already_has_certs_for is not None:
+            if self.course_id in user_already_has_certs_for:
+                return False
+        elif GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None:
             return False
 
         # If it is after the refundable cutoff date they should not be refunded.
@@ -1364,7 +1478,7 @@ class CourseEnrollment(models.Model):
         if refund_cutoff_date and datetime.now(UTC) > refund_cutoff_date:
             return False
 
-        course_mode = CourseMode.mode_for_course(self.course_id, 'verified')
+        course_mode = CourseMode.mode_for_course(self.course_id, 'verified', modes=modes)
         if course_mode is None:
             return False
         else:
@@ -1372,12 +1486,18 @@ class CourseEnrollment(models.Model):
 
     def refund_cutoff_date(self):
         """ Calculate and return the refund window end date. """
-        try:
-            attribute = self.attributes.get(namespace='order', name='order_number')
-        except ObjectDoesNotExist:
+        # Filter in Python rather than with .get() so that prefetched
+        # attributes can be used without another query.
+        order_number = next(
+            (
+                attribute.value for attribute in self.attributes.all()
+                if attribute.namespace == 'order' and attribute.name == 'order_number'
+            ),
+            None
+        )
+        if order_number is None:
             return None
 
-        order_number = attribute.value
         order = ecommerce_api_client(self.user).orders(order_number).get()
         refund_window_start_date = max(
             datetime.strptime(order['date_placed'], ECOMMERCE_DATE_FORMAT),
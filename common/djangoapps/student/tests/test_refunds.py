@@ -108,6 +108,13 @@ class RefundableTest(SharedModuleStoreTestCase):
         self.enrollment.can_refund = True
         self.assertTrue(self.enrollment.refundable())
 
+    def test_refundable_with_preloaded_data(self):
+        """ Assert that preloaded certificates and modes are used instead of querying."""
+        modes = [self.verified_mode.to_tuple()]
+        self.assertTrue(self.enrollment.refundable(user_already_has_certs_for=set(), modes=modes))
+        self.assertFalse(self.enrollment.refundable(user_already_has_certs_for={self.course.id}, modes=modes))
+        self.assertFalse(self.enrollment.refundable(user_already_has_certs_for=set(), modes=[]))
+
     def test_refundable_with_cutoff_date(self):
         """ Assert enrollment is refundable before cutoff and not refundable after."""
         self.assertTrue(self.enrollment.refundable())
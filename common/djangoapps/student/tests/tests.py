@@ -15,8 +15,10 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from django.conf import settings
 from django.contrib.auth.models import User, AnonymousUser
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import TestCase
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 
 from student.models import (
     anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment,
@@ -479,6 +481,37 @@ class DashboardTest(ModuleStoreTestCase):
             response_2 = self.client.get(reverse('dashboard'))
             self.assertEquals(response_2.status_code, 200)
 
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_dashboard_query_count_independent_of_enrollments(self):
+        """
+        Check that the number of queries made by the student dashboard does
+        not grow with the number of courses the user is enrolled in.
+        """
+        self.client.login(username="jack", password="test")
+        CourseEnrollment.enroll(self.user, self.course.id)
+
+        # The first request creates the course overview and fills
+        # configuration caches, so only count queries from the second one.
+        self.client.get(reverse('dashboard'))
+        with CaptureQueriesContext(connection) as single_enrollment_queries:
+            response = self.client.get(reverse('dashboard'))
+            self.assertEquals(response.status_code, 200)
+
+        for __ in range(5):
+            course = CourseFactory.create()
+            CourseModeFactory(mode_slug='verified', course_id=course.id)
+            CourseEnrollment.enroll(self.user, course.id, mode='honor')
+
+        self.client.get(reverse('dashboard'))
+        with CaptureQueriesContext(connection) as many_enrollment_queries:
+            response = self.client.get(reverse('dashboard'))
+            self.assertEquals(response.status_code, 200)
+
+        self.assertEqual(
+            len(single_enrollment_queries.captured_queries),
+            len(many_enrollment_queries.captured_queries)
+        )
+
     @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
     @patch.dict(settings.FEATURES, {"IS_EDX_DOMAIN": True})
     def test_dashboard_header_nav_has_find_courses(self):
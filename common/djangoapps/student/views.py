@@ -68,7 +68,6 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from opaque_keys.edx.locator import CourseLocator
-from xmodule.modulestore import ModuleStoreEnum
 
 from collections import namedtuple
 
@@ -84,7 +83,7 @@ from external_auth.login_and_register import (
     register as external_auth_register
 )
 
-from bulk_email.models import Optout, CourseAuthorization
+from bulk_email.models import Optout
 from lang_pref import LANGUAGE_KEY
 
 import track.views
@@ -107,13 +106,13 @@ from util.password_policy_validators import (
 import third_party_auth
 from third_party_auth import pipeline, provider
 from student.helpers import (
-    check_verify_status_by_course,
     auth_pipeline_urls, get_next_url_for_login_page,
     DISABLE_UNENROLL_CERT_STATES,
 )
 from student.cookies import set_logged_in_cookies, delete_logged_in_cookies
+from student.dashboard_data import DashboardData
 from student.models import anonymous_id_for_user
-from shoppingcart.models import DonationConfiguration, CourseRegistrationCode
+from shoppingcart.models import DonationConfiguration
 
 from embargo import api as embargo_api
 
@@ -184,7 +183,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -193,6 +192,9 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): The student's certificate status for the course, as
+            returned by `certificate_status_for_student`.  If not provided, it
+            is loaded from the database.
 
     Returns:
         dict: Empty dict if certificates are disabled or hidden, or a dictionary with keys:
@@ -207,10 +209,12 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
     return _cert_info(
         user,
         course_overview,
-        certificate_status_for_student(user, course_overview.id),
+        cert_status,
         course_mode
     )
 
@@ -253,7 +257,7 @@ def get_course_enrollments(user, org_to_include, orgs_to_exclude):
         generator[CourseEnrollment]: a sequence of enrollments to be displayed
         on the user's dashboard.
     """
-    for enrollment in CourseEnrollment.enrollments_for_user(user):
+    for enrollment in CourseEnrollment.enrollments_for_user_with_overviews_preload(user):
 
         # If the course is missing or broken, log an error and skip it.
         course_overview = enrollment.course_overview
@@ -543,16 +547,10 @@ def dashboard(request):
     # sort the enrollment pairs by the enrollment date
     course_enrollments.sort(key=lambda x: x.created, reverse=True)
 
-    # Retrieve the course modes for each course
-    enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
-    __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
-    course_modes_by_course = {
-        course_id: {
-            mode.slug: mode
-            for mode in modes
-        }
-        for course_id, modes in unexpired_course_modes.iteritems()
-    }
+    # Load the certificate, verification, course mode and other per-course
+    # data for all of the enrollments at once, rather than course by course.
+    dashboard_data = DashboardData(user, course_enrollments)
+    course_modes_by_course = dashboard_data.course_modes_by_course
 
     # Check to see if the student has recently enrolled in a course.
     # If so, display a notification message confirming the enrollment.
@@ -615,20 +613,19 @@ def dashboard(request):
     #
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
+    verify_status_by_course = dashboard_data.verify_status_by_course
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
+        enrollment.course_id: cert_info(
+            request.user,
+            enrollment.course_overview,
+            enrollment.mode,
+            cert_status=dashboard_data.certificate_status(enrollment.course_id)
+        )
         for enrollment in course_enrollments
     }
 
     # only show email settings for Mongo course and when bulk email is turned on
-    show_email_settings_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments if (
-            settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL'] and
-            modulestore().get_modulestore_type(enrollment.course_id) != ModuleStoreEnum.Type.xml and
-            CourseAuthorization.instructor_email_enabled(enrollment.course_id)
-        )
-    )
+    show_email_settings_for = dashboard_data.show_email_settings_for
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
@@ -638,27 +635,18 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
-    show_refund_option_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.refundable()
-    )
+    show_refund_option_for = dashboard_data.show_refund_option_for
 
     block_courses = frozenset(
         enrollment.course_id for enrollment in course_enrollments
         if is_course_blocked(
             request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
+            dashboard_data.redeemed_registration_codes(enrollment.course_id),
             enrollment.course_id
         )
     )
 
-    enrolled_courses_either_paid = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
-    )
+    enrolled_courses_either_paid = dashboard_data.enrolled_courses_either_paid
 
     # If there are *any* denied reverifications that have not been toggled off,
     # we'll display the banner
@@ -7,6 +7,18 @@ XASSET_THUMBNAIL_TAIL_NAME = '.jpg'
 
 STREAM_DATA_CHUNK_SIZE = 1024
 
+# The largest dimensions of the thumbnail of an image asset.
+THUMBNAIL_SIZE = (128, 128)
+
+# The widths, in pixels, of the resized copies ("derivatives") of image assets kept for responsive images.
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+# The category of the locations of the derivatives. They are only served in place of their image, so that
+# access to them is checked against it, and never at their own locations.
+IMAGE_DERIVATIVE_CATEGORY = 'derivative'
+
+# Images with more pixels than this aren't thumbnailed or resized, to bound the memory used to decode them.
+MAX_RESIZED_IMAGE_PIXELS = 50 * 1000 * 1000
+
 import os
 import logging
 import StringIO
@@ -47,6 +59,60 @@ class StaticContent(object):
             name_root=name_root,
             extension=XASSET_THUMBNAIL_TAIL_NAME,)
 
+    @staticmethod
+    def generate_derivative_name(original_name, width):
+        """
+        Returns the name of the copy of the image `original_name` resized to `width` pixels wide.
+        """
+        name_root, ext = os.path.splitext(original_name)
+        return u"{name_root}{ext}-{width}w{extension}".format(
+            name_root=name_root,
+            ext=ext.replace(u'.', u'-'),
+            width=width,
+            extension=XASSET_THUMBNAIL_TAIL_NAME,
+        )
+
+    @staticmethod
+    def compute_derivative_location(course_key, original_name, width):
+        """
+        Returns the location of the copy of the image `original_name` resized to `width` pixels wide.
+        """
+        name = StaticContent.generate_derivative_name(original_name, width)
+        return course_key.make_asset_key(
+            IMAGE_DERIVATIVE_CATEGORY, AssetLocator.clean_keeping_underscores(name)
+        ).for_branch(None)
+
+    @staticmethod
+    def compute_derivative_locations(location):
+        """
+        Returns the locations of the copies of the image asset `location` resized to each of the widths.
+        """
+        return [
+            StaticContent.compute_derivative_location(location.course_key, location.name, width)
+            for width in IMAGE_DERIVATIVE_WIDTHS
+        ]
+
+    @staticmethod
+    def derivative_width(requested_width):
+        """
+        Returns the width of the smallest image derivative at least `requested_width` pixels wide, or None if
+        the original image should be served instead.
+        """
+        for width in IMAGE_DERIVATIVE_WIDTHS:
+            if width >= requested_width:
+                return width
+        return None
+
+    @property
+    def is_image(self):
+        return self.content_type is not None and self.content_type.split('/')[0] == 'image'
+
+    def open_file(self):
+        """
+        Returns a seekable file-like object of the content's data.
+        """
+        return StringIO.StringIO(self._data)
+
     @staticmethod
     def compute_location(course_key, path, revision=None, is_thumbnail=False):
         """
@@ -202,6 +268,10 @@ class StaticContentStream(StaticContent):
     def close(self):
         self._stream.close()
 
+    def open_file(self):
+        self._stream.seek(0)
+        return self._stream
+
     def copy_to_in_mem(self):
         self._stream.seek(0)
         content = StaticContent(self.location, self.name, self.content_type, self._stream.read(),
@@ -220,11 +290,17 @@ class ContentStore(object):
     def find(self, filename):
         raise NotImplementedError
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
+    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None,
+                                   fields=None, after=None, with_count=True):
         '''
         Returns a list of static assets for a course, followed by the total number of assets.
         By default all assets are returned, but start and maxresults can be provided to limit the query.
 
+        Instead of skipping `start` assets, `after` can be a cursor returned by `asset_cursor` for the
+        last asset of the previous page, for the page of assets which follows it in the same sort order.
+        `fields` limits the asset data returned to the given fields (and the asset key), and if
+        `with_count` is False the total number of assets isn't counted, and None is returned for it.
+
         The return format is a list of asset data dictionaries.
         The asset data dictionaries have the following keys:
             asset_key (:class:`opaque_keys.edx.AssetKey`): The key of the asset
@@ -235,6 +311,13 @@ class ContentStore(object):
         '''
         raise NotImplementedError
 
+    def asset_cursor(self, asset, sort):
+        '''
+        Returns an opaque cursor for the position of `asset`, as returned by `get_all_content_for_course`
+        with the given sort, which can be passed back to it as `after` for the assets which follow.
+        '''
+        raise NotImplementedError
+
     def delete_all_course_assets(self, course_key):
         """
         Delete all of the assets which use this course_key as an identifier
@@ -259,38 +342,92 @@ class ContentStore(object):
 
         # if we're uploading an image, then let's generate a thumbnail so that we can
         # serve it up when needed without having to rescale on the fly
-        if content.content_type is not None and content.content_type.split('/')[0] == 'image':
+        if content.is_image:
             try:
-                # use PIL to do the thumbnail generation (http://www.pythonware.com/products/pil/)
-                # My understanding is that PIL will maintain aspect ratios while restricting
-                # the max-height/width to be whatever you pass in as 'size'
-                # @todo: move the thumbnail size to a configuration setting?!?
-                if tempfile_path is None:
-                    im = Image.open(StringIO.StringIO(content.data))
-                else:
-                    im = Image.open(tempfile_path)
-
-                # I've seen some exceptions from the PIL library when trying to save palletted
-                # PNG files to JPEG. Per the google-universe, they suggest converting to RGB first.
-                im = im.convert('RGB')
-                size = 128, 128
-                im.thumbnail(size, Image.ANTIALIAS)
-                thumbnail_file = StringIO.StringIO()
-                im.save(thumbnail_file, 'JPEG')
-                thumbnail_file.seek(0)
-
-                # store this thumbnail as any other piece of content
-                thumbnail_content = StaticContent(thumbnail_file_location, thumbnail_name,
-                                                  'image/jpeg', thumbnail_file)
-
-                self.save(thumbnail_content)
-
+                thumbnail_content = self._save_resized_image(
+                    content, tempfile_path, THUMBNAIL_SIZE, thumbnail_file_location, thumbnail_name
+                )
             except Exception, e:
                 # log and continue as thumbnails are generally considered as optional
                 logging.exception(u"Failed to generate thumbnail for {0}. Exception: {1}".format(content.location, str(e)))
 
         return thumbnail_content, thumbnail_file_location
 
+    def delete_image_derivatives(self, location):
+        """
+        Delete the resized copies of the image asset `location`, of every width.
+
+        Returns their locations, e.g. to remove them from caches.
+        """
+        locations = StaticContent.compute_derivative_locations(location)
+        for derivative_location in locations:
+            self.delete(derivative_location)
+        return locations
+
+    def generate_image_derivatives(self, content, tempfile_path=None):
+        """
+        Save copies of the image `content` resized to each of `IMAGE_DERIVATIVE_WIDTHS` narrower than it,
+        to serve to clients asking for smaller versions of it. The copies of any previous content of the
+        asset are deleted first, as the new content may be narrower. The copies are locked if it is.
+
+        Returns the locations of the copies saved.
+        """
+        self.delete_image_derivatives(content.location)
+        locations = []
+        if not content.is_image:
+            return locations
+        for width in IMAGE_DERIVATIVE_WIDTHS:
+            name = StaticContent.generate_derivative_name(content.location.name, width)
+            location = StaticContent.compute_derivative_location(
+                content.location.course_key, content.location.name, width
+            )
+            try:
+                # The height is only bounded so that the aspect ratio is kept.
+                derivative = self._save_resized_image(
+                    content, tempfile_path, (width, MAX_RESIZED_IMAGE_PIXELS), location, name, skip_if_fits=True,
+                    locked=content.locked,
+                )
+            except Exception:  # pylint: disable=broad-except
+                logging.exception(u"Failed to resize %s to %d pixels wide", content.location, width)
+                break
+            if derivative is None:
+                # The image isn't wider than this, nor so any of the larger widths.
+                break
+            locations.append(location)
+        return locations
+
+    def _save_resized_image(self, content, tempfile_path, size, location, name, skip_if_fits=False, locked=False):
+        """
+        Save a JPEG copy of the image `content`, read from `tempfile_path` if given, shrunk to fit within
+        `size`, as the asset `location` named `name`, locked if `locked`.
+
+        Returns the saved content, or None if `skip_if_fits` and the image already fits.
+        """
+        # use PIL to do the resizing (http://www.pythonware.com/products/pil/). PIL maintains
+        # aspect ratios while restricting the max-height/width to be whatever you pass in as 'size'
+        im = Image.open(tempfile_path if tempfile_path is not None else content.open_file())
+        width, height = im.size
+        if skip_if_fits and width <= size[0] and height <= size[1]:
+            return None
+        if width * height > MAX_RESIZED_IMAGE_PIXELS:
+            raise ValueError(u"{} is too large to resize: {}x{}".format(content.location, width, height))
+
+        # Opening an image only reads its header. For JPEGs, draft mode then decodes the image at the
+        # smallest scale still larger than the result, so that the full size image is never held in memory.
+        scale = min(float(size[0]) / width, float(size[1]) / height)
+        im.draft('RGB', (max(1, int(width * scale)), max(1, int(height * scale))))
+        # I've seen some exceptions from the PIL library when trying to save palletted
+        # PNG files to JPEG. Per the google-universe, they suggest converting to RGB first.
+        im = im.convert('RGB')
+        im.thumbnail(size, Image.ANTIALIAS)
+        resized_file = StringIO.StringIO()
+        im.save(resized_file, 'JPEG')
+
+        # store this copy as any other piece of content
+        resized_content = StaticContent(location, name, 'image/jpeg', resized_file.getvalue(), locked=locked)
+        self.save(resized_content)
+        return resized_content
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
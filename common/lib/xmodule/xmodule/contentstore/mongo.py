@@ -1,7 +1,18 @@
+import base64
+import calendar
+import datetime
+import errno
+import hashlib
+from collections import Counter
+from multiprocessing.pool import ThreadPool
+
 import pymongo
 import gridfs
+from bson.objectid import ObjectId
 from gridfs.errors import NoFile
+from pymongo.errors import DuplicateKeyError
 
+from openedx.core.lib.request_profile import ProfiledProxy
 from xmodule.contentstore.content import XASSET_LOCATION_TAG
 
 import logging
@@ -11,11 +22,19 @@ from xmodule.exceptions import NotFoundError
 from fs.osfs import OSFS
 import os
 import json
+from bson import json_util
 from bson.son import SON
 from opaque_keys.edx.keys import AssetKey
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 from xmodule.util.misc import escape_invalid_characters
 
+# The default number of threads used to export a course's assets.
+DEFAULT_EXPORT_WORKERS = 4
+
+# The default number of threads used to copy a course's assets, and the number of assets copied together.
+DEFAULT_COPY_WORKERS = 4
+ASSET_COPY_BATCH_SIZE = 100
+
 
 class MongoContentStore(ContentStore):
 
@@ -44,9 +63,21 @@ class MongoContentStore(ContentStore):
         if user is not None and password is not None:
             _db.authenticate(user, password)
 
-        self.fs = gridfs.GridFS(_db, bucket)
+        # The operations on GridFS and the collections are counted in the profiles of the requests
+        self.fs = ProfiledProxy(gridfs.GridFS(_db, bucket), 'mongo', 'contentstore.fs')
 
-        self.fs_files = _db[bucket + ".files"]  # the underlying collection GridFS uses
+        # the underlying collection GridFS uses
+        self.fs_files = ProfiledProxy(_db[bucket + ".files"], 'mongo', 'contentstore.files')
+        self.fs_chunks = ProfiledProxy(_db[bucket + ".chunks"], 'mongo', 'contentstore.chunks')
+
+        # The content of assets is stored once per distinct content, in "blobs" identified by their sha1 hash and
+        # counting the assets which reference them. An asset's document in fs_files then only holds its metadata
+        # and the id of its blob, so copying an asset or saving the same content again doesn't copy any data.
+        # Assets saved before blobs were introduced keep their content in their own chunks, until converted by
+        # `deduplicate_assets`.
+        self.blobs = ProfiledProxy(gridfs.GridFS(_db, bucket + "_blobs"), 'mongo', 'contentstore.blobs')
+        self.blob_files = ProfiledProxy(_db[bucket + "_blobs.files"], 'mongo', 'contentstore.blob_files')
+        self.blob_chunks = ProfiledProxy(_db[bucket + "_blobs.chunks"], 'mongo', 'contentstore.blob_chunks')
 
     def close_connections(self):
         """
@@ -65,23 +96,29 @@ class MongoContentStore(ContentStore):
     def save(self, content):
         content_id, content_son = self.asset_db_key(content.location)
 
-        # The way to version files in gridFS is to not use the file id as the _id but just as the filename.
-        # Then you can upload as many versions as you like and access by date or version. Because we use
-        # the location as the _id, we must delete before adding (there's no replace method in gridFS)
+        # Store the content before deleting the asset it replaces, so that if the content hasn't changed, its blob
+        # is never left unreferenced, and so deleted, in between.
+        blob_id, md5, length = self._store_blob(content.data)
+
+        # Because we use the location as the _id, we must delete before adding
         self.delete(content_id)  # delete is a noop if the entry doesn't exist; so, don't waste time checking
 
         thumbnail_location = content.thumbnail_location.to_deprecated_list_repr() if content.thumbnail_location else None
-        with self.fs.new_file(_id=content_id, filename=unicode(content.location), content_type=content.content_type,
-                              displayname=content.name, content_son=content_son,
-                              thumbnail_location=thumbnail_location,
-                              import_path=content.import_path,
-                              # getattr b/c caching may mean some pickled instances don't have attr
-                              locked=getattr(content, 'locked', False)) as fp:
-            if hasattr(content.data, '__iter__'):
-                for chunk in content.data:
-                    fp.write(chunk)
-            else:
-                fp.write(content.data)
+        self.fs_files.insert({
+            '_id': content_id,
+            'filename': unicode(content.location),
+            'contentType': content.content_type,
+            'length': length,
+            'md5': md5,
+            'uploadDate': datetime.datetime.utcnow(),
+            'displayname': content.name,
+            'content_son': content_son,
+            'thumbnail_location': thumbnail_location,
+            'import_path': content.import_path,
+            # getattr b/c caching may mean some pickled instances don't have attr
+            'locked': getattr(content, 'locked', False),
+            'blob_id': blob_id,
+        })
 
         return content
 
@@ -89,39 +126,43 @@ class MongoContentStore(ContentStore):
         if isinstance(location_or_id, AssetKey):
             location_or_id, _ = self.asset_db_key(location_or_id)
         # Deletes of non-existent files are considered successful
-        self.fs.delete(location_or_id)
+        asset = self.fs_files.find_and_modify({'_id': location_or_id}, remove=True, fields={'blob_id': True})
+        if asset is None:
+            return
+        if asset.get('blob_id') is not None:
+            self._release_blob(asset['blob_id'])
+        else:
+            self.fs_chunks.remove({'files_id': location_or_id})
 
     def find(self, location, throw_on_not_found=True, as_stream=False):
         content_id, __ = self.asset_db_key(location)
 
         try:
+            asset = self.fs_files.find_one({'_id': content_id})
+            if asset is None:
+                raise NoFile(content_id)
+            fp = self._open(asset)
+            thumbnail_location = asset.get('thumbnail_location')
+            if thumbnail_location:
+                thumbnail_location = location.course_key.make_asset_key(
+                    'thumbnail',
+                    thumbnail_location[4]
+                )
             if as_stream:
-                fp = self.fs.get(content_id)
-                thumbnail_location = getattr(fp, 'thumbnail_location', None)
-                if thumbnail_location:
-                    thumbnail_location = location.course_key.make_asset_key(
-                        'thumbnail',
-                        thumbnail_location[4]
-                    )
                 return StaticContentStream(
-                    location, fp.displayname, fp.content_type, fp, last_modified_at=fp.uploadDate,
+                    location, asset['displayname'], asset['contentType'], fp, last_modified_at=asset['uploadDate'],
                     thumbnail_location=thumbnail_location,
-                    import_path=getattr(fp, 'import_path', None),
-                    length=fp.length, locked=getattr(fp, 'locked', False)
+                    import_path=asset.get('import_path'),
+                    length=asset['length'], locked=asset.get('locked', False)
                 )
             else:
-                with self.fs.get(content_id) as fp:
-                    thumbnail_location = getattr(fp, 'thumbnail_location', None)
-                    if thumbnail_location:
-                        thumbnail_location = location.course_key.make_asset_key(
-                            'thumbnail',
-                            thumbnail_location[4]
-                        )
+                with fp:
                     return StaticContent(
-                        location, fp.displayname, fp.content_type, fp.read(), last_modified_at=fp.uploadDate,
+                        location, asset['displayname'], asset['contentType'], fp.read(),
+                        last_modified_at=asset['uploadDate'],
                         thumbnail_location=thumbnail_location,
-                        import_path=getattr(fp, 'import_path', None),
-                        length=fp.length, locked=getattr(fp, 'locked', False)
+                        import_path=asset.get('import_path'),
+                        length=asset['length'], locked=asset.get('locked', False)
                     )
         except NoFile:
             if throw_on_not_found:
@@ -129,25 +170,177 @@ class MongoContentStore(ContentStore):
             else:
                 return None
 
-    def export(self, location, output_directory):
-        content = self.find(location)
+    def _open(self, asset):
+        """
+        Returns a file-like `GridOut` of the content of the asset with the given fs_files document.
+        """
+        if asset.get('blob_id') is not None:
+            return self.blobs.get(asset['blob_id'])
+        return self.fs.get(self.make_id_son(asset))
 
-        filename = content.name
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
+    def _store_blob(self, data):
+        """
+        Store `data`, a string or an iterable of strings, as a blob unless there's a blob of the same content
+        already, and add a reference to that blob.
 
-        if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
+        Returns the id of the blob, and the md5 hash and length of the data.
+        """
+        md5 = hashlib.md5()
+        sha1 = hashlib.sha1()
+        if not hasattr(data, '__iter__'):
+            md5.update(data)
+            sha1.update(data)
+            blob_id = self._add_blob_reference(sha1.hexdigest())
+            if blob_id is not None:
+                return blob_id, md5.hexdigest(), len(data)
+            data = [data]
+
+        # The hash of streamed data is only known once it has all been read, and so written.
+        length = 0
+        new_blob_id = ObjectId()
+        with self.blobs.new_file(_id=new_blob_id) as fp:
+            for chunk in data:
+                md5.update(chunk)
+                sha1.update(chunk)
+                length += len(chunk)
+                fp.write(chunk)
+        return self._claim_blob(new_blob_id, sha1.hexdigest()), md5.hexdigest(), length
+
+    def _claim_blob(self, new_blob_id, sha1):
+        """
+        Add a reference to the blob with the hash `sha1`, which is the blob `new_blob_id` just written unless
+        another blob of the same content was stored first, in which case the new blob is deleted.
 
-        # Escape invalid char from filename.
-        export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
+        Returns the id of the blob referenced.
+        """
+        while True:
+            blob_id = self._add_blob_reference(sha1)
+            if blob_id is not None:
+                self.blobs.delete(new_blob_id)
+                return blob_id
+            try:
+                self.blob_files.update({'_id': new_blob_id}, {'$set': {'sha1': sha1, 'refcount': 1}})
+                return new_blob_id
+            except DuplicateKeyError:
+                # The same content was stored concurrently: reference that blob instead.
+                continue
+
+    def _add_blob_reference(self, sha1):
+        """
+        Add a reference to the blob with the hash `sha1`, and return its id, or None if there is no such blob.
+        """
+        blob = self.blob_files.find_and_modify({'sha1': sha1}, {'$inc': {'refcount': 1}}, fields={'_id': True})
+        return blob['_id'] if blob is not None else None
 
-        disk_fs = OSFS(output_directory)
+    def _add_blob_references(self, blob_id, references):
+        """
+        Add `references` references to the blob `blob_id`, and return whether it still exists.
+        """
+        blob = self.blob_files.find_and_modify(
+            {'_id': blob_id}, {'$inc': {'refcount': references}}, fields={'_id': True}
+        )
+        return blob is not None
 
-        with disk_fs.open(export_name, 'wb') as asset_file:
-            asset_file.write(content.data)
+    def _release_blob(self, blob_id):
+        """
+        Remove a reference to the blob `blob_id`, deleting the blob if it was the last one.
+        """
+        blob = self.blob_files.find_and_modify(
+            {'_id': blob_id}, {'$inc': {'refcount': -1}}, new=True, fields={'refcount': True}
+        )
+        if blob is not None and blob['refcount'] <= 0:
+            # Unless the same content was saved again in the meantime and so referenced the blob again.
+            result = self.blob_files.remove({'_id': blob_id, 'refcount': {'$lte': 0}})
+            if result.get('n'):
+                self.blob_chunks.remove({'files_id': blob_id})
 
-    def export_all_for_course(self, course_key, output_directory, assets_policy_file):
+    def _convert_to_blob(self, asset):
+        """
+        Move the content of the asset with the given fs_files document, if it isn't in a blob yet, to a blob,
+        sharing the blob of any other asset with the same content.
+
+        Returns the id of the asset's blob, and whether the asset was converted.
+        """
+        if asset.get('blob_id') is not None:
+            return asset['blob_id'], False
+        asset_id = self.make_id_son(asset)
+        with self._open(asset) as fp:
+            blob_id, __, __ = self._store_blob(fp)
+        result = self.fs_files.update(
+            {'_id': asset_id, 'blob_id': {'$exists': False}}, {'$set': {'blob_id': blob_id}}
+        )
+        if not result.get('n'):
+            # The asset was deleted, replaced or converted concurrently.
+            self._release_blob(blob_id)
+            asset = self.fs_files.find_one({'_id': asset_id}, fields={'blob_id': True})
+            return (asset.get('blob_id') if asset is not None else None), False
+        self.fs_chunks.remove({'files_id': asset_id})
+        return blob_id, True
+
+    def deduplicate_assets(self):
+        """
+        Move the content of all assets saved before their content was stored in blobs to blobs, so that assets
+        with identical content share their storage.
+
+        Returns the number of assets converted.
+        """
+        converted = 0
+        legacy_ids = [
+            self.make_id_son(asset) for asset in self.fs_files.find({'blob_id': {'$exists': False}}, fields=['_id'])
+        ]
+        for asset_id in legacy_ids:
+            asset = self.fs_files.find_one({'_id': asset_id})
+            if asset is not None:
+                try:
+                    __, was_converted = self._convert_to_blob(asset)
+                except NoFile:
+                    logging.warning("Could not read the content of asset %s", asset_id)
+                    continue
+                converted += was_converted
+        return converted
+
+    def export(self, location, output_directory, incremental=False):
+        """
+        Write the content of the asset at `location` into `output_directory`.
+
+        The content is streamed from GridFS in chunks rather than read into memory at once. If
+        `incremental` is True and the file already on disk has the asset's length and is no older
+        than its upload date, it is left untouched.
+
+        Returns the path of the exported file.
+        """
+        content = self.find(location, as_stream=True)
+        try:
+            filename = content.name
+            if content.import_path is not None:
+                output_directory = output_directory + '/' + os.path.dirname(content.import_path)
+
+            try:
+                os.makedirs(output_directory)
+            except OSError as exc:
+                # Assets are exported concurrently, so another thread may have created the directory.
+                if exc.errno != errno.EEXIST:
+                    raise
+
+            # Escape invalid char from filename.
+            export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
+            export_path = os.path.join(output_directory, export_name)
+
+            if incremental and _is_exported_file_current(export_path, content):
+                return export_path
+
+            disk_fs = OSFS(output_directory)
+
+            with disk_fs.open(export_name, 'wb') as asset_file:
+                for chunk in content.stream_data():
+                    asset_file.write(chunk)
+        finally:
+            content.close()
+
+        return export_path
+
+    def export_all_for_course(self, course_key, output_directory, assets_policy_file,
+                              max_workers=DEFAULT_EXPORT_WORKERS, incremental=False):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
         attributes to the policy file.
@@ -157,11 +350,23 @@ class MongoContentStore(ContentStore):
             output_directory: the directory under which to put all the asset files
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
+            max_workers (int): the number of threads used to download assets concurrently.
+            incremental (bool): if True, assets already exported and unchanged since are not
+                written again, and files in output_directory which no longer belong to any
+                asset are removed.
         """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
         for asset in assets:
+            for attr, value in asset.iteritems():
+                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key', 'blob_id']:
+                    policy.setdefault(asset['asset_key'].name, {})[attr] = value
+
+        def export_asset(asset):
+            """
+            Export a single asset; run by the worker threads.
+            """
             # TODO: On 6/19/14, I had to put a try/except around this
             # to export a course. The course failed on JSON files in
             # the /static/ directory placed in it with an import.
@@ -170,10 +375,20 @@ class MongoContentStore(ContentStore):
             #
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
-            for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].name, {})[attr] = value
+            return self.export(asset['asset_key'], output_directory, incremental=incremental)
+
+        if max_workers > 1 and len(assets) > 1:
+            pool = ThreadPool(min(max_workers, len(assets)))
+            try:
+                exported_paths = pool.map(export_asset, assets)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            exported_paths = [export_asset(asset) for asset in assets]
+
+        if incremental:
+            _remove_stale_files(output_directory, exported_paths)
 
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
@@ -181,11 +396,23 @@ class MongoContentStore(ContentStore):
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
+    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None,
+                                   fields=None, after=None, with_count=True):
         return self._get_all_content_for_course(
-            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort, filter_params=filter_params
+            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort,
+            filter_params=filter_params, fields=fields, after=after, with_count=with_count
         )
 
+    def asset_cursor(self, asset, sort):
+        """
+        Returns an opaque cursor for the position of `asset` in the given sort order: its values of the
+        sort fields, followed by its name, which breaks ties between them.
+        """
+        asset_id = asset.get('content_son', asset['_id'])
+        values = [asset.get(field) for field, __ in sort or []]
+        values.append(asset_id['name'])
+        return base64.urlsafe_b64encode(json_util.dumps(values))
+
     def remove_redundant_content_for_courses(self):
         """
         Finds and removes all redundant files (Mac OS metadata files with filename ".DS_Store"
@@ -198,12 +425,10 @@ class MongoContentStore(ContentStore):
                 ('{}.category'.format(prefix), 'asset'),
                 ('{}.name'.format(prefix), {'$regex': ASSET_IGNORE_REGEX}),
             ])
-            items = self.fs_files.find(query)
+            items = self.fs_files.find(query, fields=['_id'])
             assets_to_delete = assets_to_delete + items.count()
             for asset in items:
-                self.fs.delete(asset[prefix])
-
-            self.fs_files.remove(query)
+                self.delete(self.make_id_son(asset))
         return assets_to_delete
 
     def _get_all_content_for_course(self,
@@ -212,7 +437,10 @@ class MongoContentStore(ContentStore):
                                     start=0,
                                     maxresults=-1,
                                     sort=None,
-                                    filter_params=None):
+                                    filter_params=None,
+                                    fields=None,
+                                    after=None,
+                                    with_count=True):
         '''
         Returns a list of all static assets for a course. The return format is a list of asset data dictionary elements.
 
@@ -222,19 +450,41 @@ class MongoContentStore(ContentStore):
             uploadDate (datetime.datetime): The date and time that the file was uploadDate
             contentType: The mimetype string of the asset
             md5: An md5 hash of the asset content
+
+        If `fields` is given, only those fields (and the ones making up the asset key) are returned.
+
+        `after` is a cursor, returned by `asset_cursor` for the same sort, of the asset the results
+        should follow. Paging with it rather than with `start` lets the database seek straight to the
+        page in the sort's index, instead of walking through all of the assets before it.
+
+        The total count of the matching assets is None unless `with_count`.
         '''
         query = query_for_course(course_key, "asset" if not get_thumbnails else "thumbnail")
+        prefix = '_id' if getattr(course_key, 'deprecated', False) else 'content_son'
+        if sort:
+            # Sort by name last, so that the order of the assets, and so any cursor into it, is well defined.
+            # The name goes the same way as the first sort field, so that the sort can walk an index either way.
+            sort = list(sort) + [('{}.name'.format(prefix), sort[0][1])]
         find_args = {"sort": sort}
         if maxresults > 0:
             find_args.update({
-                "skip": start,
+                "skip": start if after is None else 0,
                 "limit": maxresults,
             })
+        if fields is not None:
+            find_args["fields"] = list(fields) + [prefix]
         if filter_params:
             query.update(filter_params)
 
+        count = None
+        if after is not None:
+            if with_count:
+                count = self.fs_files.find(query).count()
+            query = SON(query)
+            query['$or'] = _after_cursor_query(after, sort)
         items = self.fs_files.find(query, **find_args)
-        count = items.count()
+        if with_count and count is None:
+            count = items.count()
         assets = list(items)
 
         # We're constructing the asset key immediately after retrieval from the database so that
@@ -280,7 +530,7 @@ class MongoContentStore(ContentStore):
         :param location:  a c4x asset location
         """
         for attr in attr_dict.iterkeys():
-            if attr in ['_id', 'md5', 'uploadDate', 'length']:
+            if attr in ['_id', 'md5', 'uploadDate', 'length', 'blob_id']:
                 raise AttributeError("{} is a protected attribute.".format(attr))
         asset_db_key, __ = self.asset_db_key(location)
         # catch upsert error and raise NotFoundError if asset doesn't exist
@@ -304,44 +554,144 @@ class MongoContentStore(ContentStore):
             raise NotFoundError(asset_db_key)
         return item
 
-    def copy_all_course_assets(self, source_course_key, dest_course_key):
+    def copy_all_course_assets(self, source_course_key, dest_course_key,
+                               max_workers=DEFAULT_COPY_WORKERS, batch_size=ASSET_COPY_BATCH_SIZE):
         """
         See :meth:`.ContentStore.copy_all_course_assets`
 
-        This implementation fairly expensively copies all of the data
+        This implementation only copies the assets' metadata: the copies reference the same blobs of content.
+        The assets are copied `batch_size` at a time: the content of any of them saved before blobs is first moved
+        to blobs by `max_workers` threads, then the copies are inserted together.
+
+        Assets which the destination course already has are skipped, so that a copy which failed part way can be
+        run again to finish it.
+
+        Returns the number of assets copied.
         """
-        source_query = query_for_course(source_course_key)
-        # it'd be great to figure out how to do all of this on the db server and not pull the bits over
-        for asset in self.fs_files.find(source_query):
-            asset_key = self.make_id_son(asset)
-            # don't convert from string until fs access
-            source_content = self.fs.get(asset_key)
-            if isinstance(asset_key, basestring):
-                asset_key = AssetKey.from_string(asset_key)
-                __, asset_key = self.asset_db_key(asset_key)
-            asset_key['org'] = dest_course_key.org
-            asset_key['course'] = dest_course_key.course
-            if getattr(dest_course_key, 'deprecated', False):  # remove the run if exists
-                if 'run' in asset_key:
-                    del asset_key['run']
-                asset_id = asset_key
-            else:  # add the run, since it's the last field, we're golden
-                asset_key['run'] = dest_course_key.run
-                asset_id = unicode(
-                    dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
-                )
+        existing_ids = set(
+            _id_key(self.make_id_son(asset))
+            for asset in self.fs_files.find(query_for_course(dest_course_key), fields=['_id'])
+        )
+        pool = ThreadPool(max_workers) if max_workers > 1 else None
+        copied = 0
+        try:
+            batch = []
+            for asset in self.fs_files.find(query_for_course(source_course_key)):
+                asset_id, asset_key = self._copied_asset_id(asset, dest_course_key)
+                if _id_key(asset_id) not in existing_ids:
+                    batch.append((asset, asset_id, asset_key))
+                if len(batch) == batch_size:
+                    copied += self._copy_assets(batch, pool)
+                    batch = []
+            if batch:
+                copied += self._copy_assets(batch, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return copied
+
+    def _copied_asset_id(self, asset, dest_course_key):
+        """
+        Returns the _id and content_son of the copy in `dest_course_key` of the asset with the given fs_files
+        document.
+        """
+        asset_key = self.make_id_son(asset)
+        if isinstance(asset_key, basestring):
+            asset_key = AssetKey.from_string(asset_key)
+            __, asset_key = self.asset_db_key(asset_key)
+        else:
+            asset_key = SON(asset_key)
+        asset_key['org'] = dest_course_key.org
+        asset_key['course'] = dest_course_key.course
+        if getattr(dest_course_key, 'deprecated', False):  # remove the run if exists
+            if 'run' in asset_key:
+                del asset_key['run']
+            asset_id = asset_key
+        else:  # add the run, since it's the last field, we're golden
+            asset_key['run'] = dest_course_key.run
+            asset_id = unicode(
+                dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
+            )
+        return asset_id, asset_key
+
+    def _copy_assets(self, batch, pool):
+        """
+        Copy a batch of assets, given as (fs_files document, copy's _id, copy's content_son) tuples, with the
+        thread `pool` (if not None) moving any of their content not in blobs yet to blobs.
 
-            self.fs.put(
-                source_content.read(),
-                _id=asset_id, filename=asset['filename'], content_type=asset['contentType'],
-                displayname=asset['displayname'], content_son=asset_key,
+        Returns the number of assets copied.
+        """
+        assets = [asset for asset, __, __ in batch]
+        if pool is not None and len(assets) > 1:
+            blobs = pool.map(self._convert_to_blob, assets)
+        else:
+            blobs = [self._convert_to_blob(asset) for asset in assets]
+
+        # Mongo stores times to the millisecond: truncate it so that the copies can be found by it below.
+        now = datetime.datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        copies = []
+        sources = []
+        for (asset, asset_id, asset_key), (blob_id, __) in zip(batch, blobs):
+            if blob_id is None:
+                # The source asset was deleted since it was found.
+                continue
+            sources.append((asset, asset_id, asset_key))
+            copies.append({
+                '_id': asset_id,
+                'filename': asset['filename'],
+                'contentType': asset['contentType'],
+                'length': asset['length'],
+                'md5': asset['md5'],
+                'uploadDate': now,
+                'displayname': asset['displayname'],
+                'content_son': asset_key,
                 # thumbnail is not technically correct but will be functionally correct as the code
                 # only looks at the name which is not course relative.
-                thumbnail_location=asset['thumbnail_location'],
-                import_path=asset['import_path'],
+                'thumbnail_location': asset['thumbnail_location'],
+                'import_path': asset['import_path'],
                 # getattr b/c caching may mean some pickled instances don't have attr
-                locked=asset.get('locked', False)
-            )
+                'locked': asset.get('locked', False),
+                'blob_id': blob_id,
+            })
+        if not copies:
+            return 0
+
+        # Count the copies' references to their blobs before inserting them, so that no blob is ever
+        # referenced by more assets than it counts.
+        blob_references = Counter(copy['blob_id'] for copy in copies)
+        referenced = set(
+            blob_id for blob_id, references in blob_references.iteritems()
+            if self._add_blob_references(blob_id, references)
+        )
+        retried = 0
+        if len(referenced) < len(blob_references):
+            # The blobs of some of the source assets were deleted since they were read, as the assets were
+            # deleted or replaced: copy them again as they are now, if they still exist.
+            retry = []
+            for source, copy in zip(sources, copies):
+                if copy['blob_id'] not in referenced:
+                    asset = self.fs_files.find_one({'_id': source[0]['_id']})
+                    if asset is not None:
+                        retry.append((asset,) + source[1:])
+            copies = [copy for copy in copies if copy['blob_id'] in referenced]
+            if retry:
+                retried = self._copy_assets(retry, None)
+            if not copies:
+                return retried
+        try:
+            self.fs_files.insert(copies)
+        except DuplicateKeyError:
+            # Some of the assets were created in the destination concurrently, and the insert stopped at the
+            # first of them: insert the rest one at a time, releasing the references of those already there.
+            for copy in copies:
+                try:
+                    self.fs_files.insert(copy)
+                except DuplicateKeyError:
+                    if self.fs_files.find_one({'_id': copy['_id'], 'uploadDate': now}, fields=['_id']) is None:
+                        self._release_blob(copy['blob_id'])
+        return len(copies) + retried
 
     def delete_all_course_assets(self, course_key):
         """
@@ -353,7 +703,7 @@ class MongoContentStore(ContentStore):
         matching_assets = self.fs_files.find(course_query)
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
-            self.fs.delete(asset_key)
+            self.delete(asset_key)
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -393,6 +743,9 @@ class MongoContentStore(ContentStore):
         return dbkey
 
     def ensure_indexes(self):
+        # Blobs are looked up by the hash of their content, and must be unique by it. Blobs being written
+        # don't have a hash yet.
+        self.blob_files.create_index('sha1', unique=True, sparse=True, background=True)
         # Index needed thru 'category' by `_get_all_content_for_course` and others. That query also takes a sort
         # which can be `uploadDate`, `display_name`,
         self.fs_files.create_index(
@@ -468,6 +821,24 @@ class MongoContentStore(ContentStore):
             sparse=True,
             background=True
         )
+        # The indexes for the sort orders of the Studio asset listing, matching all of the fields of
+        # `query_for_course` and ending with the name, which breaks ties, so that both the first page
+        # and those which follow a cursor are read straight from the index.
+        for prefix in ('_id', 'content_son'):
+            for sort_field in ('uploadDate', 'displayname'):
+                self.fs_files.create_index(
+                    [
+                        ('{}.tag'.format(prefix), pymongo.ASCENDING),
+                        ('{}.org'.format(prefix), pymongo.ASCENDING),
+                        ('{}.course'.format(prefix), pymongo.ASCENDING),
+                        ('{}.category'.format(prefix), pymongo.ASCENDING),
+                        ('{}.run'.format(prefix), pymongo.ASCENDING),
+                        (sort_field, pymongo.ASCENDING),
+                        ('{}.name'.format(prefix), pymongo.ASCENDING),
+                    ],
+                    sparse=True,
+                    background=True
+                )
 
 
 def query_for_course(course_key, category=None):
@@ -491,3 +862,57 @@ def query_for_course(course_key, category=None):
     else:
         dbkey['{}.run'.format(prefix)] = course_key.run
     return dbkey
+
+
+def _id_key(asset_id):
+    """
+    Returns a hashable key for the fs_files _id `asset_id`, which is a string or a SON.
+    """
+    return asset_id if isinstance(asset_id, basestring) else tuple(asset_id.items())
+
+
+def _after_cursor_query(cursor, sort):
+    """
+    Returns the clauses of an `$or` query for the assets which follow the one at `cursor` in the given
+    sort order, whose last field must be the asset name that `asset_cursor` adds to the cursor.
+
+    Raises ValueError if the cursor isn't one for this sort.
+    """
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(str(cursor)))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid asset cursor: {}".format(cursor))
+    if not sort or not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("Invalid asset cursor: {}".format(cursor))
+
+    # An asset follows the cursor if it matches it on each of the first sort fields, and then comes after
+    # it on the next one.
+    clauses = []
+    for index, (field, direction) in enumerate(sort):
+        clause = SON((previous_field, values[previous]) for previous, (previous_field, __) in enumerate(sort[:index]))
+        clause[field] = {'$gt' if direction == pymongo.ASCENDING else '$lt': values[index]}
+        clauses.append(clause)
+    return clauses
+
+
+def _is_exported_file_current(export_path, content):
+    """
+    Returns whether the file at `export_path` was written from the current version of `content`.
+    """
+    if not os.path.isfile(export_path) or os.path.getsize(export_path) != content.length:
+        return False
+    if content.last_modified_at is None:
+        return False
+    return os.path.getmtime(export_path) >= calendar.timegm(content.last_modified_at.utctimetuple())
+
+
+def _remove_stale_files(output_directory, exported_paths):
+    """
+    Remove files under `output_directory` which are not in `exported_paths`.
+    """
+    exported_paths = set(os.path.abspath(export_path) for export_path in exported_paths)
+    for dirpath, __, filenames in os.walk(output_directory):
+        for filename in filenames:
+            file_path = os.path.abspath(os.path.join(dirpath, filename))
+            if file_path not in exported_paths:
+                os.remove(file_path)
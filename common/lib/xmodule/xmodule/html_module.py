@@ -67,13 +67,21 @@ class HtmlBlock(object):
         scope=Scope.settings
     )
 
-    @XBlock.supports("multi_device")
+    @XBlock.supports("multi_device", "cacheable")
     def student_view(self, _context):
         """
         Return a fragment that contains the html for the student view
         """
         return Fragment(self.get_html())
 
+    def has_support(self, view, functionality):
+        """
+        The student view's output can't be reused for other students if it embeds the student's id.
+        """
+        if functionality == "cacheable" and "%%USER_ID%%" in self.data:  # pylint: disable=no-member
+            return False
+        return super(HtmlBlock, self).has_support(view, functionality)
+
     def get_html(self):
         """
         When we switch this to an XBlock, we can merge this with student_view,
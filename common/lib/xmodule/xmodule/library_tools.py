@@ -1,13 +1,14 @@
 """
 XBlock runtime services for LibraryContentModule
+
+The runtimes and modulestores import this module at startup, so the block modules, which
+import capa, are only imported by the methods which need them, once such a block is loaded.
 """
 from django.core.exceptions import PermissionDenied
 from opaque_keys.edx.locator import LibraryLocator, LibraryUsageLocator
 from search.search_engine_base import SearchEngine
-from xmodule.library_content_module import ANY_CAPA_TYPE_VALUE
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from xmodule.capa_module import CapaDescriptor
 
 
 def normalize_key_for_search(library_key):
@@ -94,6 +95,7 @@ class LibraryToolsService(object):
 
     def _problem_type_filter(self, library, capa_type):
         """ Filters library children by capa type"""
+        from xmodule.capa_module import CapaDescriptor
         search_engine = SearchEngine.get_search_engine(index="library_index")
         if search_engine:
             filter_clause = {
@@ -114,6 +116,7 @@ class LibraryToolsService(object):
         if usage_key.block_type != "problem":
             return False
 
+        from xmodule.capa_module import CapaDescriptor
         descriptor = self.store.get_item(usage_key, depth=0)
         assert isinstance(descriptor, CapaDescriptor)
         return capa_type in descriptor.problem_types
@@ -152,6 +155,7 @@ class LibraryToolsService(object):
             raise ValueError("Requested library not found.")
         if user_perms and not user_perms.can_read(library_key):
             raise PermissionDenied()
+        from xmodule.library_content_module import ANY_CAPA_TYPE_VALUE
         filter_children = (dest_block.capa_type != ANY_CAPA_TYPE_VALUE)
         if filter_children:
             # Apply simple filtering based on CAPA problem types:
@@ -1096,12 +1096,15 @@ class ModuleStoreWrite(ModuleStoreRead, ModuleStoreAssetWriteInterface):
         pass
 
     @abstractmethod
-    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None):
+    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, copy_assets=True):
         """
         Sets up source_course_id to point a course with the same content as the desct_course_id. This
         operation may be cheap or expensive. It may have to copy all assets and all xblock content or
         merely setup new pointers.
 
+        If copy_assets is False, the assets aren't copied, e.g. so that the caller can copy them as a
+        separate step.
+
         Backward compatibility: this method used to require in some modulestores that dest_course_id
         pointed to an empty but already created course. Implementers should support this or should
         enable creating the course from scratch.
@@ -1301,14 +1304,14 @@ class ModuleStoreWriteBase(ModuleStoreReadBase, ModuleStoreWrite):
             continue_version=True,
         )
 
-    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, **kwargs):
+    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, copy_assets=True, **kwargs):
         """
-        This base method just copies the assets. The lower level impls must do the actual cloning of
-        content.
+        This base method just copies the assets, unless copy_assets is False. The lower level impls must do
+        the actual cloning of content.
         """
         with self.bulk_operations(dest_course_id):
             # copy the assets
-            if self.contentstore:
+            if copy_assets and self.contentstore:
                 self.contentstore.copy_all_course_assets(source_course_id, dest_course_id)
             return dest_course_id
 
@@ -81,6 +81,28 @@ class ModuleStoreDraftAndPublished(BranchSettingMixin, BulkOperationsMixin):
     def has_changes(self, xblock):
         raise NotImplementedError
 
+    def get_subtree_changes(self, xblock):
+        """
+        Computes `has_changes` for xblock and each of its descendants.
+
+        Stores which can do better than calling `has_changes` on every block of the subtree,
+        which may walk each block's subtree again, should override this.
+
+        :return: a dict mapping the (block_type, block_id) of each block in the subtree to
+            whether it has unpublished changes
+        """
+        changes = {}
+
+        def visit(block):
+            """ Record whether block and each of its descendants have changes. """
+            changes[(block.location.block_type, block.location.block_id)] = self.has_changes(block)
+            if block.has_children:
+                for child in block.get_children():
+                    visit(child)
+
+        visit(xblock)
+        return changes
+
     @abstractmethod
     def publish(self, location, user_id):
         raise NotImplementedError
@@ -3,6 +3,7 @@ Support for inheritance of fields down an XBlock hierarchy.
 """
 from __future__ import absolute_import
 
+import copy
 from datetime import datetime
 from django.conf import settings
 from pytz import UTC
@@ -250,41 +251,91 @@ def own_metadata(module):
 
 
 class InheritingFieldData(KvsFieldData):
-    """A `FieldData` implementation that can inherit value from parents to children."""
+    """
+    A `FieldData` implementation that can inherit value from parents to children.
+
+    The values each block passes down to its children are computed once, from its parent's, and kept
+    in the `inherited_values` table, so reading an inherited field doesn't walk up the whole tree.
+    The table may be shared by all the blocks of a runtime, and is cleared whenever an inheritable
+    field, or a parent, is saved or deleted on any of them. The values read through a block bound to
+    a user include that user's overrides, so they are kept apart from those of the other users.
+    """
 
-    def __init__(self, inheritable_names, **kwargs):
+    def __init__(self, inheritable_names, inherited_values=None, **kwargs):
         """
         `inheritable_names` is a list of names that can be inherited from
         parents.
 
+        `inherited_values` is the table, mapping the user a block is bound to and its usage id to the
+        serialized values its children inherit, by field name. If not given, this field data gets a
+        table of its own.
         """
         super(InheritingFieldData, self).__init__(**kwargs)
         self.inheritable_names = set(inheritable_names)
+        self.inherited_values = {} if inherited_values is None else inherited_values
 
     def default(self, block, name):
         """
         The default for an inheritable name is found on a parent.
         """
         if name in self.inheritable_names:
-            # Walk up the content tree to find the first ancestor
-            # that this field is set on. Use the field from the current
-            # block so that if it has a different default than the root
-            # node of the tree, the block's default will be used.
-            field = block.fields[name]
-            ancestor = block.get_parent()
-            while ancestor is not None:
-                if field.is_set_on(ancestor):
-                    return field.read_json(ancestor)
-                else:
-                    ancestor = ancestor.get_parent()
+            parent = block.get_parent()
+            if parent is not None:
+                values = self._values_for_children(parent)
+                if name in values:
+                    value = values[name]
+                    # Don't let the caller change the value shared with the rest of the table.
+                    return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
         return super(InheritingFieldData, self).default(block, name)
 
+    def _values_for_children(self, block):
+        """
+        Returns the serialized values of the inheritable fields that block passes down to its children:
+        those set on block, or else on its nearest ancestor which sets them.
+        """
+        key = (block.scope_ids.user_id, block.scope_ids.usage_id)
+        values = self.inherited_values.get(key)
+        if values is None:
+            parent = block.get_parent()
+            values = dict(self._values_for_children(parent)) if parent is not None else {}
+            for name in self.inheritable_names:
+                field = block.fields.get(name)
+                if field is not None and field.is_set_on(block):
+                    values[name] = field.read_json(block)
+            self.inherited_values[key] = values
+        return values
+
+    def _invalidate_inherited_values(self, names):
+        """
+        Clear the table if any of names is inherited, or moves a block under another parent.
+        """
+        if 'parent' in names or not self.inheritable_names.isdisjoint(names):
+            self.inherited_values.clear()
+
+    def set(self, block, name, value):
+        super(InheritingFieldData, self).set(block, name, value)
+        self._invalidate_inherited_values([name])
+
+    def delete(self, block, name):
+        super(InheritingFieldData, self).delete(block, name)
+        self._invalidate_inherited_values([name])
+
+    def set_many(self, block, update_dict):
+        super(InheritingFieldData, self).set_many(block, update_dict)
+        self._invalidate_inherited_values(update_dict)
+
 
-def inheriting_field_data(kvs):
-    """Create an InheritanceFieldData that inherits the names in InheritanceMixin."""
+def inheriting_field_data(kvs, inherited_values=None):
+    """
+    Create an InheritanceFieldData that inherits the names in InheritanceMixin.
+
+    Pass the same `inherited_values` dict for all of the blocks of a runtime so that they share the
+    table of inherited values.
+    """
     return InheritingFieldData(
         inheritable_names=InheritanceMixin.fields.keys(),
         kvs=kvs,
+        inherited_values=inherited_values,
     )
 
 
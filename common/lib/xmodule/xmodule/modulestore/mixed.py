@@ -15,6 +15,7 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey, AssetKey
 from opaque_keys.edx.locator import LibraryLocator
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from openedx.core.lib.request_profile import profiled
 from xmodule.assetstore import AssetMetadata
 
 from . import ModuleStoreWriteBase
@@ -218,6 +219,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
             return course_key
         return store.fill_in_run(course_key)
 
+    @profiled('modulestore')
     def has_item(self, usage_key, **kwargs):
         """
         Does the course include the xblock who's id is reference?
@@ -225,6 +227,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(usage_key.course_key)
         return store.has_item(usage_key, **kwargs)
 
+    @profiled('modulestore')
     @strip_key
     def get_item(self, usage_key, depth=0, **kwargs):
         """
@@ -233,6 +236,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(usage_key.course_key)
         return store.get_item(usage_key, depth, **kwargs)
 
+    @profiled('modulestore')
     @strip_key
     def get_items(self, course_key, **kwargs):
         """
@@ -265,6 +269,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(course_key)
         return store.get_items(course_key, **kwargs)
 
+    @profiled('modulestore')
     @strip_key
     def get_courses(self, **kwargs):
         '''
@@ -322,6 +327,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(course_key)
         return store.make_course_usage_key(course_key)
 
+    @profiled('modulestore')
     @strip_key
     def get_course(self, course_key, depth=0, **kwargs):
         """
@@ -355,6 +361,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except ItemNotFoundError:
             return None
 
+    @profiled('modulestore')
     @strip_key
     def has_course(self, course_id, ignore_case=False, **kwargs):
         """
@@ -414,6 +421,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(asset_metadata_list[0].asset_id.course_key)
         return store.save_asset_metadata_list(asset_metadata_list, user_id, import_only)
 
+    @profiled('modulestore')
     @strip_key
     @contract(asset_key='AssetKey')
     def find_asset_metadata(self, asset_key, **kwargs):
@@ -429,6 +437,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(asset_key.course_key)
         return store.find_asset_metadata(asset_key, **kwargs)
 
+    @profiled('modulestore')
     @strip_key
     @contract(course_key='CourseKey', asset_type='None | basestring', start=int, maxresults=int, sort='tuple|None')
     def get_all_asset_metadata(self, course_key, asset_type, start=0, maxresults=-1, sort=None, **kwargs):
@@ -528,6 +537,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(asset_key.course_key)
         return store.set_asset_metadata_attrs(asset_key, attr_dict, user_id)
 
+    @profiled('modulestore')
     @strip_key
     def get_parent_location(self, location, **kwargs):
         """
@@ -558,6 +568,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         """
         return self._get_modulestore_for_courselike(course_id).get_modulestore_type()
 
+    @profiled('modulestore')
     @strip_key
     def get_orphans(self, course_key, **kwargs):
         """
@@ -636,7 +647,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         return library
 
     @strip_key
-    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, **kwargs):
+    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, copy_assets=True, **kwargs):
         """
         See the superclass for the general documentation.
 
@@ -652,7 +663,9 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         # to have only course re-runs go to split. This code, however, uses the config'd priority
         dest_modulestore = self._get_modulestore_for_courselike(dest_course_id)
         if source_modulestore == dest_modulestore:
-            return source_modulestore.clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
+            return source_modulestore.clone_course(
+                source_course_id, dest_course_id, user_id, fields, copy_assets=copy_assets, **kwargs
+            )
 
         if dest_modulestore.get_modulestore_type() == ModuleStoreEnum.Type.split:
             split_migrator = SplitMigrator(dest_modulestore, source_modulestore)
@@ -660,12 +673,15 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
                                                 dest_course_id.course, dest_course_id.run, fields, **kwargs)
 
             # the super handles assets and any other necessities
-            super(MixedModuleStore, self).clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
+            super(MixedModuleStore, self).clone_course(
+                source_course_id, dest_course_id, user_id, fields, copy_assets=copy_assets, **kwargs
+            )
         else:
             raise NotImplementedError("No code for cloning from {} to {}".format(
                 source_modulestore, dest_modulestore
             ))
 
+    @profiled('modulestore')
     @strip_key
     def create_item(self, user_id, course_key, block_type, block_id=None, fields=None, **kwargs):
         """
@@ -686,6 +702,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         modulestore = self._verify_modulestore_support(course_key, 'create_item')
         return modulestore.create_item(user_id, course_key, block_type, block_id=block_id, fields=fields, **kwargs)
 
+    @profiled('modulestore')
     @strip_key
     def create_child(self, user_id, parent_usage_key, block_type, block_id=None, fields=None, **kwargs):
         """
@@ -724,6 +741,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(dest_key.course_key, 'copy_from_template')
         return store.copy_from_template(source_keys, dest_key, user_id)
 
+    @profiled('modulestore')
     @strip_key
     def update_item(self, xblock, user_id, allow_not_found=False, **kwargs):
         """
@@ -733,6 +751,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(xblock.location.course_key, 'update_item')
         return store.update_item(xblock, user_id, allow_not_found, **kwargs)
 
+    @profiled('modulestore')
     @strip_key
     def delete_item(self, location, user_id, **kwargs):
         """
@@ -788,6 +807,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(course_key, 'create_xblock')
         return store.create_xblock(runtime, course_key, block_type, block_id, fields or {}, **kwargs)
 
+    @profiled('modulestore')
     @strip_key
     def get_courses_for_wiki(self, wiki_slug, **kwargs):
         """
@@ -826,6 +846,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(course_id)
         return store.has_published_version(xblock)
 
+    @profiled('modulestore')
     @strip_key
     def publish(self, location, user_id, **kwargs):
         """
@@ -863,6 +884,15 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(xblock.location.course_key, 'has_changes')
         return store.has_changes(xblock)
 
+    def get_subtree_changes(self, xblock):
+        """
+        Checks if each block in the subtree rooted at xblock has unpublished changes
+        :param xblock: the root of the subtree to check
+        :return: a dict mapping the (block_type, block_id) of each block to whether it has changes
+        """
+        store = self._verify_modulestore_support(xblock.location.course_key, 'get_subtree_changes')
+        return store.get_subtree_changes(xblock)
+
     def check_supports(self, course_key, method):
         """
         Verifies that the modulestore for a particular course supports a feature.
@@ -23,6 +23,7 @@ from bson.son import SON
 from datetime import datetime
 from fs.osfs import OSFS
 from mongodb_proxy import MongoProxy, autoretry_read
+from openedx.core.lib.request_profile import ProfiledProxy
 from path import Path as path
 from pytz import UTC
 from contracts import contract, new_contract
@@ -65,9 +66,33 @@ SORT_REVISION_FAVOR_DRAFT = ('_id.revision', pymongo.DESCENDING)
 # sort order that returns PUBLISHED items first
 SORT_REVISION_FAVOR_PUBLISHED = ('_id.revision', pymongo.ASCENDING)
 
-BLOCK_TYPES_WITH_CHILDREN = list(set(
-    name for name, class_ in XBlock.load_classes() if getattr(class_, 'has_children', False)
-))
+# Finding these loads every XBlock class, and so imports all their modules, which is slow, so
+# they are only found when first needed rather than when the modulestore is imported.
+_BLOCK_TYPES_WITH_CHILDREN = None
+_DETACHED_CATEGORIES = None
+
+
+def block_types_with_children():
+    """
+    Returns the list of the block types which can have children.
+    """
+    global _BLOCK_TYPES_WITH_CHILDREN  # pylint: disable=global-statement
+    if _BLOCK_TYPES_WITH_CHILDREN is None:
+        _BLOCK_TYPES_WITH_CHILDREN = list(set(
+            name for name, class_ in XBlock.load_classes() if getattr(class_, 'has_children', False)
+        ))
+    return _BLOCK_TYPES_WITH_CHILDREN
+
+
+def detached_categories():
+    """
+    Returns the list of the block types tagged "detached", which don't inherit metadata.
+    """
+    global _DETACHED_CATEGORIES  # pylint: disable=global-statement
+    if _DETACHED_CATEGORIES is None:
+        _DETACHED_CATEGORIES = [name for name, __ in XBlock.load_tagged_classes("detached")]
+    return _DETACHED_CATEGORIES
+
 
 # Allow us to call _from_deprecated_(son|string) throughout the file
 # pylint: disable=protected-access
@@ -75,8 +100,6 @@ BLOCK_TYPES_WITH_CHILDREN = list(set(
 # at module level, cache one instance of OSFS per filesystem root.
 _OSFS_INSTANCE = {}
 
-_DETACHED_CATEGORIES = [name for name, __ in XBlock.load_tagged_classes("detached")]
-
 
 class MongoRevisionKey(object):
     """
@@ -574,12 +597,13 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 ),
                 wait_time=retry_wait_time
             )
-            self.collection = self.database[collection]
+            # The operations on the collections are counted in the profiles of the requests
+            self.collection = ProfiledProxy(self.database[collection], 'mongo', 'draft.modules')
 
             # Collection which stores asset metadata.
             if asset_collection is None:
                 asset_collection = self.DEFAULT_ASSET_COLLECTION_NAME
-            self.asset_collection = self.database[asset_collection]
+            self.asset_collection = ProfiledProxy(self.database[asset_collection], 'mongo', 'draft.assets')
 
             if user is not None and password is not None:
                 self.database.authenticate(user, password)
@@ -686,7 +710,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             ('_id.tag', 'i4x'),
             ('_id.org', course_id.org),
             ('_id.course', course_id.course),
-            ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
+            ('_id.category', {'$in': block_types_with_children()})
         ])
         # if we're only dealing in the published branch, then only get published containers
         if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
@@ -975,7 +999,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         of inherited metadata onto the item
         """
         category = item['location']['category']
-        apply_cached_metadata = category not in _DETACHED_CATEGORIES and \
+        apply_cached_metadata = category not in detached_categories() and \
             not (category == 'course' and depth == 0)
         return apply_cached_metadata
 
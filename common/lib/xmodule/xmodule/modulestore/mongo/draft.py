@@ -169,7 +169,7 @@ class DraftModuleStore(MongoModuleStore):
 
         self._emit_course_deleted_signal(course_key)
 
-    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, **kwargs):
+    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, copy_assets=True, **kwargs):
         """
         Only called if cloning within this store or if env doesn't set up mixed.
         * copy the courseware
@@ -193,7 +193,9 @@ class DraftModuleStore(MongoModuleStore):
                 )
 
             # clone the assets
-            super(DraftModuleStore, self).clone_course(source_course_id, dest_course_id, user_id, fields)
+            super(DraftModuleStore, self).clone_course(
+                source_course_id, dest_course_id, user_id, fields, copy_assets=copy_assets
+            )
 
             # get the whole old course
             new_course = self.get_course(dest_course_id)
@@ -660,6 +662,36 @@ class DraftModuleStore(MongoModuleStore):
         else:
             return False
 
+    def get_subtree_changes(self, xblock):
+        """
+        Checks if each block in the subtree rooted at xblock has drafts, in a single post-order
+        pass over the subtree rather than one `has_changes` walk per block.
+        :param xblock: the root of the subtree to check
+        :return: a dict mapping the (block_type, block_id) of each block to whether it has changes,
+            as `has_changes` would return for it
+        """
+        changes = {}
+
+        def visit(block):
+            """
+            Record whether the block and each of its descendants have changes, and return the former.
+            """
+            has_changes = getattr(block, 'is_draft', False)
+            if block.has_children:
+                children = block.get_children()
+                # as in has_changes, dangling pointers imply a change
+                if len(block.children) > len(children):
+                    has_changes = True
+                # Unlike has_changes, keep visiting the children even once a change is found,
+                # since their own state is needed too.
+                for child in children:
+                    has_changes = visit(child) or has_changes
+            changes[(block.location.block_type, block.location.block_id)] = has_changes
+            return has_changes
+
+        visit(xblock)
+        return changes
+
     def publish(self, location, user_id, **kwargs):
         """
         Publish the subtree rooted at location to the live course and remove the drafts.
@@ -0,0 +1,144 @@
+"""
+Times modulestore operations and records the results as JSON, one result per line, so
+that the timings of two runs can be compared and regressions reported.
+"""
+
+import datetime
+import json
+import os
+import time
+
+try:
+    import click
+except ImportError:
+    click = None
+
+
+# Environment variable naming the file benchmark results are appended to.
+RESULTS_FILE_ENV_VAR = 'MODULESTORE_BENCHMARK_RESULTS'
+DEFAULT_RESULTS_FILE = 'modulestore_benchmarks.json'
+
+# Number of times each operation is timed by default.
+DEFAULT_REPEAT = 5
+
+# A slowdown by more than this fraction of the baseline's time is reported as a regression.
+DEFAULT_TOLERANCE = 0.2
+
+# Operations faster than this (in seconds) in the baseline are too noisy to be compared.
+MIN_COMPARABLE_SECONDS = 0.001
+
+
+class BenchmarkRecorder(object):
+    """
+    Times operations and saves the timings.
+
+    Each result is a dict with the keys `suite`, `store`, `course_shape`, `operation`,
+    `repeat`, `min`, `mean` and `max` (all times in seconds) and `timestamp`.
+    """
+    def __init__(self, suite, results_file=None):
+        self.suite = suite
+        self.results_file = results_file or os.environ.get(RESULTS_FILE_ENV_VAR, DEFAULT_RESULTS_FILE)
+        self.results = []
+
+    def measure(self, store, course_shape, operation, func, setup=None, repeat=DEFAULT_REPEAT):
+        """
+        Call `func` `repeat` times and record how long it took.
+
+        `setup`, if given, is called (and not timed) before each call of `func`.
+
+        Returns:
+            the recorded result.
+        """
+        timings = []
+        for __ in xrange(repeat):
+            if setup is not None:
+                setup()
+            start = time.time()
+            func()
+            timings.append(time.time() - start)
+
+        result = {
+            'suite': self.suite,
+            'store': store,
+            'course_shape': course_shape,
+            'operation': operation,
+            'repeat': repeat,
+            'min': min(timings),
+            'mean': sum(timings) / len(timings),
+            'max': max(timings),
+            'timestamp': datetime.datetime.utcnow().isoformat(),
+        }
+        self.results.append(result)
+        return result
+
+    def save(self):
+        """
+        Append the recorded results to the results file.
+        """
+        with open(self.results_file, 'a') as results_file:
+            for result in self.results:
+                results_file.write(json.dumps(result, sort_keys=True) + '\n')
+        self.results = []
+
+
+def result_key(result):
+    """
+    The key identifying what a result measured, which is the same across runs.
+    """
+    return result['suite'], result['store'], result['course_shape'], result['operation']
+
+
+def load_results(filename):
+    """
+    Read the results saved in `filename`, keyed by `result_key`. For anything measured more
+    than once, only the latest result is kept.
+    """
+    results = {}
+    with open(filename) as results_file:
+        for line in results_file:
+            line = line.strip()
+            if line:
+                result = json.loads(line)
+                results[result_key(result)] = result
+    return results
+
+
+def find_regressions(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare two sets of results, as returned by `load_results`, by the fastest time of each operation.
+
+    Returns:
+        a list of (key, baseline time, current time) for each operation which got slower by
+        more than `tolerance` (a fraction of the baseline time), sorted by key.
+    """
+    regressions = []
+    for key, current_result in current.iteritems():
+        baseline_result = baseline.get(key)
+        if baseline_result is None or baseline_result['min'] < MIN_COMPARABLE_SECONDS:
+            continue
+        if current_result['min'] > baseline_result['min'] * (1 + tolerance):
+            regressions.append((key, baseline_result['min'], current_result['min']))
+    return sorted(regressions)
+
+
+if click is not None:
+    @click.command()
+    @click.argument('baseline_file', type=click.Path(exists=True))
+    @click.argument('current_file', type=click.Path(exists=True))
+    @click.option('--tolerance', type=click.FLOAT, default=DEFAULT_TOLERANCE,
+                  help='Fraction of the baseline time by which an operation may get slower.')
+    def cli(baseline_file, current_file, tolerance):
+        """
+        Compare two benchmark result files, and exit with an error if anything got slower.
+        """
+        regressions = find_regressions(load_results(baseline_file), load_results(current_file), tolerance)
+        for key, baseline_time, current_time in regressions:
+            click.echo("{}: {:.4f}s -> {:.4f}s".format(':'.join(key), baseline_time, current_time))
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == '__main__':
+    if click is not None:
+        cli()  # pylint: disable=no-value-for-parameter
+    else:
+        print "Aborted! Module 'click' is not installed."
@@ -0,0 +1,54 @@
+"""
+Generates synthetic courses of a given size and shape in a modulestore.
+"""
+
+from xmodule.modulestore import ModuleStoreEnum
+
+# The block type created at each level of a synthetic course, starting just below the course.
+BLOCK_TYPES = ('chapter', 'sequential', 'vertical', 'html')
+
+
+def course_shape_name(branching, depth):
+    """
+    A short name for the shape of a synthetic course, used to label benchmark results.
+    """
+    return "{}x{}".format(branching, depth)
+
+
+def make_synthetic_course(store, org, course, run, branching, depth, user_id=ModuleStoreEnum.UserID.test):
+    """
+    Create and publish a course whose every block down to `depth` levels has `branching` children.
+
+    The blocks at each level are of the matching type in `BLOCK_TYPES`, so a course of depth 4 has
+    `branching` chapters, `branching` ** 2 sequentials and so on.
+
+    Returns:
+        the course's key, and a dict mapping each block type to the locations of the blocks of that type.
+    """
+    if not 0 < depth <= len(BLOCK_TYPES):
+        raise ValueError("depth must be between 1 and {}".format(len(BLOCK_TYPES)))
+
+    course_key = store.make_course_key(org, course, run)
+    locations = {}
+
+    def create_children(parent_location, level):
+        """
+        Create the children of `parent_location`, and their descendants.
+        """
+        if level == depth:
+            return
+        block_type = BLOCK_TYPES[level]
+        for index in xrange(branching):
+            child = store.create_child(
+                user_id, parent_location, block_type,
+                fields={'display_name': u"{} {}".format(block_type, index)}
+            )
+            locations.setdefault(block_type, []).append(child.location)
+            create_children(child.location, level + 1)
+
+    with store.bulk_operations(course_key):
+        course_block = store.create_course(org, course, run, user_id)
+        create_children(course_block.location, 0)
+        store.publish(course_block.location, user_id)
+
+    return course_block.id, locations
@@ -0,0 +1,58 @@
+"""
+Tests for the recording and comparison of benchmark results.
+"""
+import os
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from xmodule.modulestore.perf_tests.benchmark import BenchmarkRecorder, find_regressions, load_results
+
+
+class TestBenchmarkResults(unittest.TestCase):
+    """
+    Tests for BenchmarkRecorder, load_results and find_regressions.
+    """
+    def setUp(self):
+        super(TestBenchmarkResults, self).setUp()
+        results_dir = mkdtemp()
+        self.addCleanup(rmtree, results_dir)
+        self.results_file = os.path.join(results_dir, 'results.json')
+
+    def test_record_and_load(self):
+        recorder = BenchmarkRecorder('suite', results_file=self.results_file)
+        calls = []
+        result = recorder.measure('split', '2x4', 'get_item', lambda: calls.append('call'), repeat=3)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(result['repeat'], 3)
+        self.assertLessEqual(result['min'], result['mean'])
+        self.assertLessEqual(result['mean'], result['max'])
+
+        recorder.save()
+        recorder.measure('split', '2x4', 'get_item', lambda: None)
+        recorder.save()
+        results = load_results(self.results_file)
+        # Only the latest result of each operation is kept.
+        self.assertEqual(results.keys(), [('suite', 'split', '2x4', 'get_item')])
+        self.assertEqual(results[('suite', 'split', '2x4', 'get_item')]['repeat'], 5)
+
+    def test_setup_is_not_timed(self):
+        recorder = BenchmarkRecorder('suite', results_file=self.results_file)
+        calls = []
+        recorder.measure(
+            'split', '2x4', 'publish', lambda: calls.append('func'), setup=lambda: calls.append('setup'), repeat=2
+        )
+        self.assertEqual(calls, ['setup', 'func', 'setup', 'func'])
+
+    def test_find_regressions(self):
+        def results(**times):
+            """ Results for the given operations and times. """
+            return {('suite', 'split', '2x4', operation): {'min': time} for operation, time in times.iteritems()}
+
+        baseline = results(get_item=1.0, get_items=1.0, publish=0.0001)
+        current = results(get_item=1.1, get_items=1.5, publish=0.01, has_changes=5.0)
+        self.assertEqual(
+            find_regressions(baseline, current),
+            [(('suite', 'split', '2x4', 'get_items'), 1.0, 1.5)]
+        )
+        self.assertEqual(find_regressions(baseline, current, tolerance=0.6), [])
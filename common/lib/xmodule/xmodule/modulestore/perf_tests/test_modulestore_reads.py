@@ -0,0 +1,185 @@
+"""
+Benchmarks of the modulestore read paths, and of the writes the read paths must keep up with,
+on synthetic courses in every modulestore.
+
+These are skipped unless the MODULESTORE_BENCHMARKS environment variable is set, e.g.:
+
+    MODULESTORE_BENCHMARKS=1 MODULESTORE_BENCHMARK_SHAPES=2x4,5x4 \
+        nosetests common/lib/xmodule/xmodule/modulestore/perf_tests/test_modulestore_reads.py
+
+The results are appended to the file named by MODULESTORE_BENCHMARK_RESULTS, and two such
+files can be compared with `python -m xmodule.modulestore.perf_tests.benchmark`.
+"""
+import itertools
+import os
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import ddt
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.perf_tests.benchmark import BenchmarkRecorder
+from xmodule.modulestore.perf_tests.generate_course import (
+    BLOCK_TYPES,
+    course_shape_name,
+    make_synthetic_course,
+)
+from xmodule.modulestore.tests.utils import (
+    MODULESTORE_SETUPS,
+    SHORT_NAME_MAP,
+    XBLOCK_MIXINS,
+    MongoModulestoreBuilder,
+)
+from xmodule.modulestore.xml import XMLModuleStore
+from xmodule.modulestore.xml_exporter import export_course_to_xml
+
+# The course shapes benchmarked, as (branching, depth) pairs.
+DEFAULT_COURSE_SHAPES = ((2, 4), (5, 4), (10, 3))
+
+
+def _course_shapes():
+    """
+    The course shapes to benchmark, from MODULESTORE_BENCHMARK_SHAPES (e.g. "2x4,5x4") if set.
+    """
+    shapes = os.environ.get('MODULESTORE_BENCHMARK_SHAPES')
+    if not shapes:
+        return DEFAULT_COURSE_SHAPES
+    return tuple(tuple(int(part) for part in shape.split('x')) for shape in shapes.split(','))
+
+
+COURSE_SHAPES = _course_shapes()
+
+USER_ID = ModuleStoreEnum.UserID.test
+
+
+@ddt.ddt
+@unittest.skipUnless(os.environ.get('MODULESTORE_BENCHMARKS'), "Set MODULESTORE_BENCHMARKS to run benchmarks.")
+class ModulestoreReadBenchmark(unittest.TestCase):
+    """
+    Times the common modulestore operations on synthetic courses of various shapes.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @classmethod
+    def setUpClass(cls):
+        super(ModulestoreReadBenchmark, cls).setUpClass()
+        cls.recorder = BenchmarkRecorder('modulestore_reads')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.recorder.save()
+        super(ModulestoreReadBenchmark, cls).tearDownClass()
+
+    def measure_reads(self, store_name, shape, store, course_key, locations, depth):
+        """
+        Time the read operations supported by all modulestores.
+        """
+        leaf_locations = locations[BLOCK_TYPES[depth - 1]]
+
+        def get_items():
+            """ Get every block of the leaf type. """
+            store.get_items(course_key, qualifiers={'category': BLOCK_TYPES[depth - 1]})
+
+        def get_item():
+            """ Get every leaf block. """
+            for location in leaf_locations:
+                store.get_item(location)
+
+        def get_parent_location():
+            """ Get the parent of every leaf block. """
+            for location in leaf_locations:
+                store.get_parent_location(location)
+
+        self.recorder.measure(store_name, shape, 'get_course', lambda: store.get_course(course_key, depth=None))
+        self.recorder.measure(store_name, shape, 'get_items', get_items)
+        self.recorder.measure(store_name, shape, 'get_item', get_item)
+        self.recorder.measure(store_name, shape, 'get_parent_location', get_parent_location)
+
+    def measure_writes(self, store_name, shape, store, course_key, locations, depth):
+        """
+        Time the draft and publishing operations, which the XML modulestore doesn't support.
+        """
+        leaf_type = BLOCK_TYPES[depth - 1]
+        leaf_location = locations[leaf_type][0]
+        # The first leaf was created under the first block of every level.
+        chapter_location = locations[BLOCK_TYPES[0]][0]
+        if depth > 1:
+            parent_location = locations[BLOCK_TYPES[depth - 2]][0]
+        else:
+            parent_location = store.make_course_usage_key(course_key)
+
+        def has_changes():
+            """ Check every chapter for changes. """
+            for location in locations[BLOCK_TYPES[0]]:
+                store.has_changes(store.get_item(location))
+
+        def edit_leaf():
+            """ Change a leaf block, so that there is something to publish. """
+            leaf = store.get_item(leaf_location)
+            leaf.display_name = u"{} edited".format(leaf.display_name)
+            store.update_item(leaf, USER_ID)
+
+        def add_children_in_bulk():
+            """ Add a child to the parent of the first leaf for every existing child, in a bulk operation. """
+            with store.bulk_operations(course_key):
+                for __ in xrange(len(store.get_item(parent_location).children)):
+                    store.create_child(USER_ID, parent_location, leaf_type)
+
+        with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, course_key):
+            self.recorder.measure(store_name, shape, 'has_changes', has_changes)
+            self.recorder.measure(
+                store_name, shape, 'publish', lambda: store.publish(chapter_location, USER_ID), setup=edit_leaf
+            )
+            self.recorder.measure(store_name, shape, 'bulk_operations', add_children_in_bulk, repeat=1)
+
+    @ddt.data(*itertools.product(MODULESTORE_SETUPS, COURSE_SHAPES))
+    @ddt.unpack
+    def test_modulestore(self, store_builder, course_shape):
+        """
+        Benchmark a Mongo or Split modulestore.
+        """
+        branching, depth = course_shape
+        store_name = SHORT_NAME_MAP[store_builder]
+        shape = course_shape_name(branching, depth)
+
+        with store_builder.build() as (__, store):
+            course_key, locations = make_synthetic_course(store, 'bench', 'course', 'run', branching, depth)
+            self.measure_reads(store_name, shape, store, course_key, locations, depth)
+            self.measure_writes(store_name, shape, store, course_key, locations, depth)
+
+    @ddt.data(*COURSE_SHAPES)
+    @ddt.unpack
+    def test_xml_modulestore(self, branching, depth):
+        """
+        Benchmark the XML modulestore, with a synthetic course exported from Mongo.
+        """
+        shape = course_shape_name(branching, depth)
+        export_dir = mkdtemp()
+        self.addCleanup(rmtree, export_dir, ignore_errors=True)
+
+        with MongoModulestoreBuilder().build() as (contentstore, store):
+            course_key, __ = make_synthetic_course(store, 'bench', 'course', 'run', branching, depth)
+            export_course_to_xml(store, contentstore, course_key, export_dir, 'synthetic_course')
+
+        def load_store():
+            """ Parse the exported course. """
+            return XMLModuleStore(
+                export_dir,
+                source_dirs=['synthetic_course'],
+                default_class='xmodule.hidden_module.HiddenDescriptor',
+                xblock_mixins=XBLOCK_MIXINS,
+            )
+
+        self.recorder.measure('xml', shape, 'load_course', load_store, repeat=1)
+        xml_store = load_store()
+        course_key = xml_store.get_courses()[0].id
+        locations = {
+            block_type: [
+                block.location for block in xml_store.get_items(course_key, qualifiers={'category': block_type})
+            ]
+            for block_type in BLOCK_TYPES[:depth]
+        }
+        self.measure_reads('xml', shape, xml_store, course_key, locations, depth)
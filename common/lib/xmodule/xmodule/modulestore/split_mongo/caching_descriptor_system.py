@@ -30,6 +30,9 @@ new_contract('BlockData', BlockData)
 new_contract('CourseEnvelope', CourseEnvelope)
 new_contract('XBlock', XBlock)
 
+# The most definitions loaded at once when a block's definition is lazily loaded.
+DEFINITION_PREFETCH_LIMIT = 100
+
 
 class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
     """
@@ -79,6 +82,10 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.module_data = module_data
         self.default_class = default_class
         self.local_modules = {}
+        # The table of inherited field values shared by all of the blocks of this runtime.
+        self.inherited_values = {}
+        # The definitions loaded for lazily loaded blocks, by id. Definitions never change once written.
+        self.definitions = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
 
     @lazy
@@ -149,6 +156,27 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         return json_data
 
+    def get_definition(self, course_key, definition_id, block_type):
+        """
+        Returns the definition with definition_id, of a block of block_type.
+
+        Blocks of a type tend to be read together (e.g. all of the problems when grading), so when the
+        definition isn't loaded yet, those of up to DEFINITION_PREFETCH_LIMIT other blocks of the same
+        type in module_data are loaded with it, in a single query.
+        """
+        if definition_id not in self.definitions:
+            definition_ids = [definition_id]
+            # Iterate over a copy, as the runtime may be shared with other threads adding to module_data.
+            for block_key, block_data in self.module_data.items():
+                if len(definition_ids) >= DEFINITION_PREFETCH_LIMIT:
+                    break
+                if block_key.type == block_type and block_data.definition is not None and \
+                        not block_data.definition_loaded and block_data.definition not in self.definitions:
+                    definition_ids.append(block_data.definition)
+            for definition in self.modulestore.get_definitions(course_key, definition_ids):
+                self.definitions[definition['_id']] = definition
+        return self.definitions.get(definition_id)
+
     # xblock's runtime does not always pass enough contextual information to figure out
     # which named container (course x branch) or which parent is requesting an item. Because split allows
     # a many:1 mapping from named containers to structures and because item's identities encode
@@ -188,6 +216,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 block_key.type,
                 definition_id,
                 convert_fields,
+                runtime=self,
             )
         else:
             definition_loader = None
@@ -218,7 +247,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         )
 
         if InheritanceMixin in self.modulestore.xblock_mixins:
-            field_data = inheriting_field_data(kvs)
+            field_data = inheriting_field_data(kvs, inherited_values=self.inherited_values)
         else:
             field_data = KvsFieldData(kvs)
 
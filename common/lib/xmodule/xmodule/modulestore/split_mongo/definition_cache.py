@@ -0,0 +1,80 @@
+"""
+A per-process cache of split definitions.
+
+Definitions are never changed once written, so a definition loaded by one request can serve every
+later request which needs it. The runtimes themselves aren't shared: each request or bulk operation
+builds its own, as they hold the state of the blocks loaded in them.
+"""
+import copy
+import threading
+from collections import OrderedDict
+
+
+class SharedDefinitionCache(object):
+    """
+    A thread-safe, least recently used cache of definitions, by id.
+
+    Definitions are copied into and out of the cache, so that callers changing the definitions
+    they get don't change the cached ones.
+    """
+    def __init__(self, max_definitions):
+        """
+        `max_definitions` is the most definitions to keep in memory. The least recently used ones
+        are evicted to stay under it.
+        """
+        self.max_definitions = max_definitions
+        self._definitions = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, ids):
+        """
+        Returns copies of the cached definitions with the given ids, by id.
+        """
+        found = {}
+        with self._lock:
+            for definition_id in ids:
+                definition = self._definitions.pop(definition_id, None)
+                if definition is None:
+                    self.misses += 1
+                    continue
+                # Reinsert it, as the most recently used.
+                self._definitions[definition_id] = definition
+                self.hits += 1
+                found[definition_id] = definition
+        return {definition_id: copy.deepcopy(definition) for definition_id, definition in found.iteritems()}
+
+    def add_many(self, definitions):
+        """
+        Caches copies of the definitions, which must have been written to the database.
+        """
+        copies = [(definition['_id'], copy.deepcopy(definition)) for definition in definitions]
+        with self._lock:
+            for definition_id, definition in copies:
+                self._definitions.pop(definition_id, None)
+                self._definitions[definition_id] = definition
+                if len(self._definitions) > self.max_definitions:
+                    self._definitions.popitem(last=False)
+                    self.evictions += 1
+
+    def clear(self):
+        """
+        Empty the cache.
+        """
+        with self._lock:
+            self._definitions.clear()
+
+    def stats(self):
+        """
+        Returns a dict of the cache's size and its hit, miss and eviction counts.
+        """
+        with self._lock:
+            return {
+                'definitions': len(self._definitions),
+                'max_definitions': self.max_definitions,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
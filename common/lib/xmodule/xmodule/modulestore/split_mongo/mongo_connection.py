@@ -24,6 +24,7 @@ import dogstats_wrapper as dog_stats_api
 
 from contracts import check, new_contract
 from mongodb_proxy import autoretry_read, MongoProxy
+from openedx.core.lib.request_profile import ProfiledProxy
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
@@ -306,9 +307,10 @@ class MongoConnection(object):
         if user is not None and password is not None:
             self.database.authenticate(user, password)
 
-        self.course_index = self.database[collection + '.active_versions']
-        self.structures = self.database[collection + '.structures']
-        self.definitions = self.database[collection + '.definitions']
+        # The operations on the collections are counted in the profiles of the requests
+        self.course_index = ProfiledProxy(self.database[collection + '.active_versions'], 'mongo', 'split.course_index')
+        self.structures = ProfiledProxy(self.database[collection + '.structures'], 'mongo', 'split.structures')
+        self.definitions = ProfiledProxy(self.database[collection + '.definitions'], 'mongo', 'split.definitions')
 
         # every app has write access to the db (v having a flag to indicate r/o v write)
         # Force mongo to report errors, at the expense of performance
@@ -516,14 +518,19 @@ class MongoConnection(object):
             tagger.tag(block_type=definition['block_type'])
             return definition
 
-    def get_definitions(self, definitions, course_context=None):
+    def get_definitions(self, definitions, course_context=None, fields=None):
         """
         Retrieve all definitions listed in `definitions`.
+
+        If `fields` is given, the definitions only hold those of their fields.
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
-            return definitions
+            projection = None
+            if fields is not None:
+                tagger.measure('projected_fields', len(fields))
+                projection = ['block_type'] + ['fields.{}'.format(field) for field in fields]
+            return list(self.definitions.find({'_id': {'$in': definitions}}, projection))
 
     def insert_definition(self, definition, course_context=None):
         """
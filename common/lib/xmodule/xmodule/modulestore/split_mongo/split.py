@@ -80,6 +80,7 @@ from xmodule.modulestore import (
 
 from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
+from .definition_cache import SharedDefinitionCache
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.error_module import ErrorDescriptor
@@ -111,6 +112,9 @@ log = logging.getLogger(__name__)
 # When blacklists are this, all children should be excluded
 EXCLUDE_ALL = '*'
 
+# The most definitions fetched from the database in a single query.
+DEFINITION_BATCH_SIZE = 500
+
 
 new_contract('BlockUsageLocator', BlockUsageLocator)
 new_contract('BlockKey', BlockKey)
@@ -188,6 +192,9 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
     """
     _bulk_ops_record_type = SplitBulkWriteRecord
 
+    # The SharedDefinitionCache keeping the definitions loaded from the database between requests, if any
+    definition_cache = None
+
     def _get_bulk_ops_record(self, course_key, ignore_case=False):
         """
         Return the :class:`.SplitBulkWriteRecord` for this course.
@@ -392,7 +399,7 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
             # The definition hasn't been loaded from the db yet, so load it
             if definition is None:
-                definition = self.db_connection.get_definition(definition_guid, course_key)
+                definition = self._load_definition(course_key, definition_guid)
                 bulk_write_record.definitions[definition_guid] = definition
                 if definition is not None:
                     bulk_write_record.definitions_in_db.add(definition_guid)
@@ -401,9 +408,23 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         else:
             # cast string to ObjectId if necessary
             definition_guid = course_key.as_object_id(definition_guid)
-            return self.db_connection.get_definition(definition_guid, course_key)
+            return self._load_definition(course_key, definition_guid)
+
+    def _load_definition(self, course_key, definition_guid):
+        """
+        Load a definition written to the database, from the shared definition cache if it's there.
+        """
+        if self.definition_cache is not None:
+            cached = self.definition_cache.get_many([definition_guid])
+            if definition_guid in cached:
+                return cached[definition_guid]
 
-    def get_definitions(self, course_key, ids):
+        definition = self.db_connection.get_definition(definition_guid, course_key)
+        if definition is not None and self.definition_cache is not None:
+            self.definition_cache.add_many([definition])
+        return definition
+
+    def get_definitions(self, course_key, ids, fields=None):
         """
         Return all definitions that specified in ``ids``.
 
@@ -414,6 +435,8 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             course_key (:class:`.CourseKey`): The course that these definitions are being loaded
                 for (to respect bulk operations).
             ids (list): A list of definition ids
+            fields (list): If given, only these fields need to be loaded for each definition.
+                Definitions loaded this way aren't cached, as they are incomplete.
         """
         definitions = []
         ids = set(ids)
@@ -427,11 +450,25 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
                     ids.remove(definition_id)
                     definitions.append(definition)
 
-        if len(ids):
-            # Query the db for the definitions.
-            defs_from_db = self.db_connection.get_definitions(list(ids), course_key)
-            # Add the retrieved definitions to the cache.
-            bulk_write_record.definitions.update({d.get('_id'): d for d in defs_from_db})
+        if self.definition_cache is not None:
+            # The definitions loaded from the database by earlier requests.
+            cached = self.definition_cache.get_many(ids)
+            if fields is None:
+                bulk_write_record.definitions.update(cached)
+            definitions.extend(cached.itervalues())
+            ids.difference_update(cached)
+
+        # Query the db for the definitions, in batches so that no query gets too big.
+        ids = list(ids)
+        for start in xrange(0, len(ids), DEFINITION_BATCH_SIZE):
+            defs_from_db = self.db_connection.get_definitions(
+                ids[start:start + DEFINITION_BATCH_SIZE], course_key, fields=fields
+            )
+            if fields is None:
+                # Add the retrieved definitions to the cache.
+                bulk_write_record.definitions.update({d.get('_id'): d for d in defs_from_db})
+                if self.definition_cache is not None:
+                    self.definition_cache.add_many(defs_from_db)
             definitions.extend(defs_from_db)
         return definitions
 
@@ -641,9 +678,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, definition_cache_size=0, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param definition_cache_size: if positive, keep up to this many of the definitions loaded from the
+            database in memory, for later requests.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
@@ -675,6 +714,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         self.signal_handler = signal_handler
 
+        if definition_cache_size > 0:
+            self.definition_cache = SharedDefinitionCache(definition_cache_size)
+
     def close_connections(self):
         """
         Closes any open connections to the underlying databases
@@ -788,6 +830,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         Should only be used by testing or something which implements transactional boundary semantics.
         :param course_version_guid: if provided, clear only this entry
         """
+        if self.definition_cache is not None and not course_version_guid:
+            self.definition_cache.clear()
+
         if self.request_cache is None:
             return
 
@@ -1090,18 +1135,34 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         def _block_matches_all(block_data):
             """
-            Check that the block matches all the criteria
+            Check that the block matches all the criteria which don't require loading any additional data
             """
-            # do the checks which don't require loading any additional data
-            if (  # pylint: disable=bad-continuation
+            return (
                 self._block_matches(block_data, qualifiers) and
                 self._block_matches(block_data.fields, settings)
-            ):
-                if content:
-                    definition_block = self.get_definition(course_locator, block_data.definition)
-                    return self._block_matches(definition_block['fields'], content)
-                else:
-                    return True
+            )
+
+        def _blocks_matching_content(block_ids):
+            """
+            Filter block_ids down to the blocks whose definitions match the content criteria, loading
+            only the fields those criteria need for all of the blocks at once.
+            """
+            if not content:
+                return block_ids
+            blocks = course.structure['blocks']
+            definitions = {
+                definition['_id']: definition
+                for definition in self.get_definitions(
+                    course_locator,
+                    [blocks[block_id].definition for block_id in block_ids],
+                    fields=content.keys(),
+                )
+            }
+            return [
+                block_id for block_id in block_ids
+                if blocks[block_id].definition in definitions and
+                self._block_matches(definitions[blocks[block_id].definition].get('fields', {}), content)
+            ]
 
         if settings is None:
             settings = {}
@@ -1113,7 +1174,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 if block_name == block_id.id and _block_matches_all(block):
                     block_ids.append(block_id)
 
-            return self._load_items(course, block_ids, **kwargs)
+            return self._load_items(course, _blocks_matching_content(block_ids), **kwargs)
 
         if 'category' in qualifiers:
             qualifiers['block_type'] = qualifiers.pop('category')
@@ -1124,6 +1185,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         for block_id, value in course.structure['blocks'].iteritems():
             if _block_matches_all(value):
                 items.append(block_id)
+        items = _blocks_matching_content(items)
 
         if len(items) > 0:
             return self._load_items(course, items, depth=0, **kwargs)
@@ -1643,7 +1705,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # don't need to update the index b/c create_item did it for this version
         return xblock
 
-    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, **kwargs):
+    def clone_course(self, source_course_id, dest_course_id, user_id, fields=None, copy_assets=True, **kwargs):
         """
         See :meth: `.ModuleStoreWrite.clone_course` for documentation.
 
@@ -1665,7 +1727,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 **kwargs
             )
             # don't copy assets until we create the course in case something's awry
-            super(SplitMongoModuleStore, self).clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
+            super(SplitMongoModuleStore, self).clone_course(
+                source_course_id, dest_course_id, user_id, fields, copy_assets=copy_assets, **kwargs
+            )
             return new_course
 
     DEFAULT_ROOT_COURSE_BLOCK_ID = 'course'
@@ -1,6 +1,7 @@
 """
 Module for the dual-branch fall-back Draft->Published Versioning ModuleStore
 """
+from collections import defaultdict
 
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore, EXCLUDE_ALL
 from xmodule.exceptions import InvalidVersionError
@@ -319,6 +320,11 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         :param xblock: the block to check
         :return: True if the draft and published versions differ
         """
+        changes_index = self._get_changes_index(xblock.location.course_key)
+        if changes_index is not None:
+            # Blocks missing from the draft are treated as changed (temporary fix for bad pointers TNL-1141)
+            return changes_index.get(BlockKey.from_usage_key(xblock.location), True)
+
         def get_course(branch_name):
             return self._lookup_course(xblock.location.course_key.for_branch(branch_name)).structure
 
@@ -350,6 +356,175 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
 
+    def get_subtree_changes(self, xblock):
+        """
+        Checks if each block in the subtree rooted at xblock has unpublished changes, in a single
+        post-order pass over the draft structure rather than one subtree walk per block.
+        :param xblock: the root of the subtree to check
+        :return: a dict mapping the (block_type, block_id) of each block to whether it has changes,
+            as `has_changes` would return for it
+        """
+        changes_index = self._get_changes_index(xblock.location.course_key)
+        if changes_index is not None:
+            draft_course = self._lookup_course(
+                xblock.location.course_key.for_branch(ModuleStoreEnum.BranchName.draft)
+            )
+            subtree = self.descendants(
+                draft_course.structure['blocks'], BlockKey.from_usage_key(xblock.location), None, {}
+            )
+            return {block_key: changes_index.get(block_key, True) for block_key in subtree}
+
+        draft_course = self._lookup_course(xblock.location.course_key.for_branch(ModuleStoreEnum.BranchName.draft))
+        published_course = self._lookup_course(
+            xblock.location.course_key.for_branch(ModuleStoreEnum.BranchName.published)
+        )
+        changes = {}
+
+        def visit(block_key):
+            """
+            Record whether the block and each of its descendants have changes, and return the former.
+            """
+            draft_block = self._get_block_from_structure(draft_course.structure, block_key)
+            if draft_block is None:  # temporary fix for bad pointers TNL-1141
+                changes[block_key] = True
+                return True
+
+            published_block = self._get_block_from_structure(published_course.structure, block_key)
+            # Unlike has_changes, keep visiting the children even once a change is found,
+            # since their own state is needed too.
+            has_changes = (
+                published_block is None or
+                self._get_version(draft_block) != self._get_version(published_block)
+            )
+            for child_block_key in draft_block.fields.get('children', []):
+                has_changes = visit(child_block_key) or has_changes
+
+            changes[block_key] = has_changes
+            return has_changes
+
+        visit(BlockKey.from_usage_key(xblock.location))
+        return changes
+
+    def _get_changes_index(self, course_key):
+        """
+        Returns a dict mapping the key of every block in the draft branch of the course to whether
+        it has changes, as `has_changes` would return for it, or None if it can't be cached.
+
+        The index is kept in the request cache along with the draft and published structures it was
+        built from. When either branch gets a new version, the index is updated from the previous one
+        by only recomputing the blocks which changed between the versions, and their ancestors.
+
+        It can't be cached without a request cache, nor during a bulk operation which has changed
+        either branch, since those changes don't create new structure versions.
+        """
+        if self.request_cache is None:
+            return None
+
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active and bulk_write_record.dirty_branches:
+            return None
+
+        try:
+            draft_structure = self._lookup_course(
+                course_key.for_branch(ModuleStoreEnum.BranchName.draft)
+            ).structure
+            published_structure = self._lookup_course(
+                course_key.for_branch(ModuleStoreEnum.BranchName.published)
+            ).structure
+        except ItemNotFoundError:
+            # e.g. libraries, which have no published branch
+            return None
+
+        cache_key = course_key.for_branch(None)
+        entries = self.request_cache.data.setdefault('split_changes_index', {})
+        entry = entries.get(cache_key)
+        if entry is not None and \
+                entry['draft']['_id'] == draft_structure['_id'] and \
+                entry['published']['_id'] == published_structure['_id']:
+            return entry['changes']
+
+        changes = self._compute_changes_index(draft_structure, published_structure, entry)
+        entries[cache_key] = {'draft': draft_structure, 'published': published_structure, 'changes': changes}
+        return changes
+
+    def _compute_changes_index(self, draft_structure, published_structure, previous=None):
+        """
+        Computes the index returned by `_get_changes_index`, in a single post-order pass over the draft
+        structure.
+
+        If `previous` (a cache entry of `_get_changes_index`) is given, only the blocks which changed since
+        its structures, and their ancestors, are recomputed; the others keep their previous values.
+        """
+        draft_blocks = draft_structure['blocks']
+        published_blocks = published_structure['blocks']
+
+        def own_changes(block_key):
+            """
+            Whether the block itself (not considering its children) differs between the branches.
+            """
+            published_block = published_blocks.get(block_key)
+            return (
+                published_block is None or
+                self._get_version(draft_blocks[block_key]) != self._get_version(published_block)
+            )
+
+        changes = {}
+        if previous is not None:
+            stale = self._changed_block_keys(previous['draft']['blocks'], draft_blocks)
+            stale.update(self._changed_block_keys(previous['published']['blocks'], published_blocks))
+
+            parents = defaultdict(list)
+            for block_key, block in draft_blocks.iteritems():
+                for child_key in block.fields.get('children', []):
+                    parents[child_key].append(block_key)
+            # The ancestors of changed blocks must be recomputed too.
+            to_visit = list(stale)
+            while to_visit:
+                for parent_key in parents.get(to_visit.pop(), []):
+                    if parent_key not in stale:
+                        stale.add(parent_key)
+                        to_visit.append(parent_key)
+
+            changes = {
+                block_key: has_changes
+                for block_key, has_changes in previous['changes'].iteritems()
+                if block_key in draft_blocks and block_key not in stale
+            }
+
+        def visit(block_key):
+            """
+            Record whether the block has changes, after visiting its children, and return it.
+            """
+            if block_key in changes:
+                return changes[block_key]
+            if block_key not in draft_blocks:  # temporary fix for bad pointers TNL-1141
+                return True
+            # Keep visiting the children even once a change is found, since they're indexed too.
+            has_changes = own_changes(block_key)
+            for child_key in draft_blocks[block_key].fields.get('children', []):
+                has_changes = visit(child_key) or has_changes
+            changes[block_key] = has_changes
+            return has_changes
+
+        for block_key in draft_blocks:
+            visit(block_key)
+        return changes
+
+    def _changed_block_keys(self, old_blocks, new_blocks):
+        """
+        Returns the set of keys of the blocks which were added, removed, given another version or
+        other children between two versions of a structure's blocks.
+        """
+        changed = set(old_blocks.viewkeys() ^ new_blocks.viewkeys())
+        for block_key, new_block in new_blocks.iteritems():
+            old_block = old_blocks.get(block_key)
+            if old_block is not None and (
+                    self._get_version(old_block) != self._get_version(new_block) or
+                    old_block.fields.get('children') != new_block.fields.get('children')
+            ):
+                changed.add(block_key)
+        return changed
+
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
         Publishes the subtree under location from the draft branch to the published branch
@@ -1,13 +1,16 @@
 """
  Test contentstore.mongo functionality
 """
+import itertools
 import logging
 from uuid import uuid4
 import unittest
 import mimetypes
 from tempfile import mkdtemp
+import os
 import path
 import shutil
+import time
 
 from opaque_keys.edx.locator import CourseLocator, AssetLocator
 from opaque_keys.edx.keys import AssetKey
@@ -16,6 +19,8 @@ from xmodule.contentstore.mongo import MongoContentStore
 from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
 import ddt
+from mock import patch
+import pymongo
 from __builtin__ import delattr
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 
@@ -146,6 +151,37 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(1, 4)
+    def test_incremental_export_for_course(self, max_workers):
+        """
+        Test that an incremental export only writes changed assets and removes deleted ones
+        """
+        self.set_up_assets(False)
+        root_dir = path.Path(mkdtemp())
+        self.addCleanup(shutil.rmtree, root_dir)
+        policy_file = path.Path(root_dir / "policy.json")
+        self.contentstore.export_all_for_course(
+            self.course1_key, root_dir, policy_file, max_workers=max_workers, incremental=True
+        )
+
+        unchanged_file, truncated_file, __ = [path.Path(root_dir / filename) for filename in self.course1_files]
+        exported_size = truncated_file.getsize()
+        # Pretend the first file was written after any upload, and make the second one out of date.
+        future = int(time.time()) + 3600
+        os.utime(unchanged_file, (future, future))
+        with open(truncated_file, 'wb') as stale_file:
+            stale_file.write('stale')
+        stray_file = path.Path(root_dir / 'deleted_asset.txt')
+        stray_file.write_text(u'deleted')
+
+        self.contentstore.export_all_for_course(
+            self.course1_key, root_dir, policy_file, max_workers=max_workers, incremental=True
+        )
+        self.assertEqual(unchanged_file.getmtime(), future)
+        self.assertEqual(truncated_file.getsize(), exported_size)
+        self.assertFalse(stray_file.exists())
+        self.assertTrue(policy_file.isfile())
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
@@ -166,6 +202,108 @@ class TestContentstore(unittest.TestCase):
         self.assertEqual(count, 0)
         self.assertEqual(course_assets, [])
 
+    @ddt.data(
+        *itertools.product((True, False), (('displayname', pymongo.ASCENDING), ('uploadDate', pymongo.DESCENDING)))
+    )
+    @ddt.unpack
+    def test_get_all_content_after_cursor(self, deprecated, sort_field):
+        """
+        Test paging through get_all_content_for_course with cursors
+        """
+        self.set_up_assets(deprecated)
+        sort = [sort_field]
+        all_assets, __ = self.contentstore.get_all_content_for_course(self.course1_key, sort=sort)
+
+        paged_assets = []
+        cursor = None
+        while True:
+            page, count = self.contentstore.get_all_content_for_course(
+                self.course1_key, maxresults=2, sort=sort, after=cursor
+            )
+            self.assertEqual(count, len(self.course1_files))
+            if not page:
+                break
+            paged_assets.extend(page)
+            cursor = self.contentstore.asset_cursor(page[-1], sort)
+
+        self.assertEqual(
+            [asset['asset_key'] for asset in paged_assets],
+            [asset['asset_key'] for asset in all_assets]
+        )
+
+        with self.assertRaises(ValueError):
+            self.contentstore.get_all_content_for_course(self.course1_key, sort=sort, after='not a cursor')
+
+    @ddt.data(True, False)
+    def test_get_all_content_fields(self, deprecated):
+        """
+        Test getting only some fields, and no count, from get_all_content_for_course
+        """
+        self.set_up_assets(deprecated)
+        course1_assets, count = self.contentstore.get_all_content_for_course(
+            self.course1_key, fields=['displayname'], with_count=False
+        )
+        self.assertIsNone(count)
+        self.assertEqual(
+            sorted(asset['asset_key'].name for asset in course1_assets),
+            sorted(self.course1_files)
+        )
+        for asset in course1_assets:
+            self.assertIn('displayname', asset)
+            self.assertNotIn('md5', asset)
+
+    def blob_of(self, asset_key):
+        """
+        Returns the document of the blob holding the content of the asset `asset_key`.
+        """
+        return self.contentstore.blob_files.find_one({'_id': self.contentstore.get_attrs(asset_key)['blob_id']})
+
+    @ddt.data(True, False)
+    def test_shared_blobs(self, deprecated):
+        """
+        Test that assets of the same content share a blob, which is deleted with the last of them
+        """
+        self.set_up_assets(deprecated)
+        asset1_key = self.course1_key.make_asset_key('asset', 'picture1.jpg')
+        asset2_key = self.course2_key.make_asset_key('asset', 'picture1.jpg')
+        blob = self.blob_of(asset1_key)
+        self.assertEqual(blob['_id'], self.blob_of(asset2_key)['_id'])
+        self.assertEqual(blob['refcount'], 2)
+        self.assertEqual(self.contentstore.blob_files.count(), 5)
+
+        # Saving the same content again keeps the blob.
+        self.save_asset('picture1.jpg', asset1_key, 'picture1.jpg', False)
+        self.assertEqual(self.blob_of(asset1_key)['refcount'], 2)
+
+        self.contentstore.delete(asset1_key)
+        self.assertEqual(self.blob_of(asset2_key)['refcount'], 1)
+        self.assertIsNotNone(self.contentstore.find(asset2_key).data)
+
+        self.contentstore.delete(asset2_key)
+        self.assertIsNone(self.contentstore.blob_files.find_one({'_id': blob['_id']}))
+        self.assertEqual(self.contentstore.blob_chunks.find({'files_id': blob['_id']}).count(), 0)
+
+    @ddt.data(True, False)
+    def test_deduplicate_assets(self, deprecated):
+        """
+        Test that assets stored before blobs are readable, and moved to shared blobs by deduplicate_assets
+        """
+        self.set_up_assets(deprecated)
+        asset_key = self.course1_key.make_asset_key('asset', 'legacy.jpg')
+        content = self.contentstore.find(self.course1_key.make_asset_key('asset', 'picture1.jpg'))
+        content_id, content_son = self.contentstore.asset_db_key(asset_key)
+        self.contentstore.fs.put(
+            content.data, _id=content_id, filename=unicode(asset_key), content_type=content.content_type,
+            displayname='legacy.jpg', content_son=content_son, thumbnail_location=None, import_path=None, locked=False
+        )
+        self.assertEqual(self.contentstore.find(asset_key).data, content.data)
+
+        self.assertEqual(self.contentstore.deduplicate_assets(), 1)
+        self.assertEqual(self.contentstore.deduplicate_assets(), 0)
+        self.assertEqual(self.contentstore.fs_chunks.find({'files_id': content_id}).count(), 0)
+        self.assertEqual(self.blob_of(asset_key)['refcount'], 3)
+        self.assertEqual(self.contentstore.find(asset_key).data, content.data)
+
     @ddt.data(True, False)
     def test_attrs(self, deprecated):
         """
@@ -185,7 +323,10 @@ class TestContentstore(unittest.TestCase):
         """
         self.set_up_assets(deprecated)
         dest_course = CourseLocator('test', 'destination', 'copy')
+        blob_count = self.contentstore.blob_files.count()
         self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+        # The copies share the content of the originals.
+        self.assertEqual(self.contentstore.blob_files.count(), blob_count)
         for filename in self.course1_files:
             asset_key = self.course1_key.make_asset_key('asset', filename)
             dest_key = dest_course.make_asset_key('asset', filename)
@@ -197,6 +338,46 @@ class TestContentstore(unittest.TestCase):
         __, count = self.contentstore.get_all_content_for_course(dest_course)
         self.assertEqual(count, len(self.course1_files))
 
+    @ddt.data(True, False)
+    def test_copy_assets_resumes(self, deprecated):
+        """
+        copy_all_course_assets in batches, skipping the assets copied by an earlier copy
+        """
+        self.set_up_assets(deprecated)
+        dest_course = CourseLocator('test', 'destination', 'resume')
+        copied = self.contentstore.copy_all_course_assets(self.course1_key, dest_course, max_workers=2, batch_size=1)
+        self.assertEqual(copied, len(self.course1_files))
+        self.assertEqual(self.contentstore.copy_all_course_assets(self.course1_key, dest_course), 0)
+
+        __, count = self.contentstore.get_all_content_for_course(dest_course)
+        self.assertEqual(count, len(self.course1_files))
+
+    @ddt.data(True, False)
+    def test_copy_assets_replaced(self, deprecated):
+        """
+        copy_all_course_assets copies an asset replaced while it is copied as it is now, rather than
+        referencing the deleted blob of its previous content
+        """
+        self.set_up_assets(deprecated)
+        asset_key = self.course1_key.make_asset_key('asset', 'replaced.txt')
+        self.contentstore.save(StaticContent(asset_key, 'replaced.txt', 'text/plain', 'old content'))
+        convert_to_blob = self.contentstore._convert_to_blob  # pylint: disable=protected-access
+
+        def convert_and_replace(asset):
+            """ Replace the asset once its blob was read. """
+            blob = convert_to_blob(asset)
+            if asset['displayname'] == 'replaced.txt' and asset['length'] == len('old content'):
+                self.contentstore.save(StaticContent(asset_key, 'replaced.txt', 'text/plain', 'the new content'))
+            return blob
+
+        dest_course = CourseLocator('test', 'destination', 'replaced')
+        with patch.object(self.contentstore, '_convert_to_blob', side_effect=convert_and_replace):
+            copied = self.contentstore.copy_all_course_assets(self.course1_key, dest_course, max_workers=1)
+        self.assertEqual(copied, len(self.course1_files) + 1)
+        copy_key = dest_course.make_asset_key('asset', 'replaced.txt')
+        self.assertEqual(self.contentstore.find(copy_key).data, 'the new content')
+        self.assertEqual(self.blob_of(copy_key)['refcount'], 2)
+
     @ddt.data(True, False)
     def test_delete_assets(self, deprecated):
         """
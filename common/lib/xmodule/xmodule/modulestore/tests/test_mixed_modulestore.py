@@ -706,6 +706,57 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
         for key in locations:
             self.assertFalse(self._has_changes(locations[key]))
 
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_get_subtree_changes(self, default_ms):
+        """
+        Tests that get_subtree_changes() agrees with has_changes() on every block of the subtree
+        """
+        locations = self.setup_has_changes(default_ms)
+
+        child = self.store.get_item(locations['child'])
+        child.display_name = 'Changed Display Name'
+        self.store.update_item(child, self.user_id)
+
+        changes = self.store.get_subtree_changes(self.store.get_item(locations['grandparent']))
+        for location in locations.values():
+            self.assertEqual(changes[(location.block_type, location.block_id)], self._has_changes(location))
+        self.assertTrue(changes[(locations['parent'].block_type, locations['parent'].block_id)])
+        self.assertFalse(changes[(locations['parent_sibling'].block_type, locations['parent_sibling'].block_id)])
+
+    def test_has_changes_index(self):
+        """
+        Tests that split indexes has_changes once per pair of draft and published versions,
+        and updates the index when either branch gets a new version
+        """
+        locations = self.setup_has_changes(ModuleStoreEnum.Type.split)
+        # pylint: disable=protected-access
+        split_store = self.store._get_modulestore_by_type(ModuleStoreEnum.Type.split)
+        compute_changes_index = split_store._compute_changes_index
+
+        with patch.object(split_store, 'request_cache', Mock(data={})):
+            with patch.object(split_store, '_compute_changes_index', wraps=compute_changes_index) as compute:
+                for key in locations:
+                    self.assertFalse(self._has_changes(locations[key]))
+                self.assertEqual(compute.call_count, 1)
+
+                child = self.store.get_item(locations['child'])
+                child.display_name = 'Changed Display Name'
+                self.store.update_item(child, self.user_id)
+
+                self.assertTrue(self._has_changes(locations['grandparent']))
+                self.assertTrue(self._has_changes(locations['parent']))
+                self.assertTrue(self._has_changes(locations['child']))
+                self.assertFalse(self._has_changes(locations['parent_sibling']))
+                self.assertFalse(self._has_changes(locations['child_sibling']))
+                # The index was updated from the previous one.
+                self.assertEqual(compute.call_count, 2)
+                self.assertIsNotNone(compute.call_args[0][2])
+
+                self.store.publish(locations['parent'], self.user_id)
+                for key in locations:
+                    self.assertFalse(self._has_changes(locations[key]))
+                self.assertEqual(compute.call_count, 3)
+
     @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
     def test_has_changes_publish_ancestors(self, default_ms):
         """
@@ -30,6 +30,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.split_mongo.definition_cache import SharedDefinitionCache
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.modulestore.tests.factories import check_mongo_calls
@@ -1001,6 +1002,50 @@ class TestCourseStructureCache(SplitModuleTest):
         )
 
 
+class TestSharedDefinitionCache(SplitModuleTest):
+    """Tests of keeping the definitions loaded from the database between requests"""
+
+    def setUp(self):
+        super(TestSharedDefinitionCache, self).setUp()
+        self.store = modulestore()
+        self.store.definition_cache = SharedDefinitionCache(max_definitions=1000)
+        self.addCleanup(delattr, self.store, 'definition_cache')
+        self.course_key = CourseLocator(org='testx', course='wonderful', run="run", branch=BRANCH_NAME_PUBLISHED)
+
+    def test_definitions_loaded_once(self):
+        course = self.store.get_course(self.course_key, depth=None, lazy=False)
+        self.assertGreater(self.store.definition_cache.stats()['definitions'], 0)
+
+        get_definitions = self.store.db_connection.get_definitions
+        with patch.object(self.store.db_connection, 'get_definitions', wraps=get_definitions) as db_get_definitions:
+            reloaded = self.store.get_course(self.course_key, depth=None, lazy=False)
+        self.assertFalse(db_get_definitions.called)
+        self.assertGreater(self.store.definition_cache.hits, 0)
+
+        # Each request still builds a runtime of its own.
+        self.assertIsNot(reloaded.runtime, course.runtime)
+        self.assertEqual(reloaded.display_name, course.display_name)
+
+    def test_cached_definitions_copied(self):
+        course = self.store.get_course(self.course_key)
+        definition_id = course.definition_locator.definition_id
+        definition = self.store.get_definition(self.course_key, definition_id)
+        definition['fields']['changed'] = True
+        self.assertNotIn('changed', self.store.get_definition(self.course_key, definition_id)['fields'])
+        self.assertNotIn('changed', self.store.get_definitions(self.course_key, [definition_id])[0]['fields'])
+
+    def test_eviction(self):
+        cache = SharedDefinitionCache(max_definitions=2)
+        cache.add_many([{'_id': 'first'}, {'_id': 'second'}])
+        # Using the first definition makes the second the least recently used.
+        self.assertEqual(cache.get_many(['first']), {'first': {'_id': 'first'}})
+        cache.add_many([{'_id': 'third'}])
+        self.assertEqual(sorted(cache.get_many(['first', 'second', 'third'])), ['first', 'third'])
+        self.assertEqual(cache.stats()['definitions'], 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.misses, 1)
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
@@ -1209,6 +1254,18 @@ class SplitModuleItemTests(SplitModuleTest):
         matches = modulestore().get_items(locator, settings={'group_access': {'$exists': False}})
         self.assertEqual(len(matches), 6)
 
+    def test_lazy_definitions_prefetched(self):
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        chapters = modulestore().get_items(locator, qualifiers={'category': 'chapter'})
+        runtime = chapters[0].runtime
+        db_connection = modulestore().db_connection
+        with patch.object(db_connection, 'get_definitions', wraps=db_connection.get_definitions) as get_definitions:
+            # Loading the definition of one chapter loads those of the other chapters with it.
+            for chapter in chapters:
+                definition = runtime.get_definition(locator, chapter.definition_locator.definition_id, 'chapter')
+                self.assertEqual(definition['_id'], chapter.definition_locator.definition_id)
+        self.assertEqual(get_definitions.call_count, 1)
+
     def test_get_parents(self):
         '''
         get_parent_location(locator): BlockUsageLocator
@@ -2,7 +2,7 @@ import copy
 import ddt
 import unittest
 from bson.objectid import ObjectId
-from mock import MagicMock, Mock, call
+from mock import MagicMock, Mock, call, patch
 from xmodule.modulestore.split_mongo.split import SplitBulkWriteMixin
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
 
@@ -429,7 +429,7 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
         results = self.bulk.get_definitions(self.course_key, search_ids)
         definitions_gotten = list(set(search_ids) - set(active_ids))
         if len(definitions_gotten) > 0:
-            self.conn.get_definitions.assert_called_once_with(definitions_gotten, self.course_key)
+            self.conn.get_definitions.assert_called_once_with(definitions_gotten, self.course_key, fields=None)
         else:
             # If no definitions to get, then get_definitions() should *not* have been called.
             self.assertEquals(self.conn.get_definitions.call_count, 0)
@@ -444,6 +444,23 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
             else:
                 self.assertNotIn(db_definition(_id), results)
 
+    @patch('xmodule.modulestore.split_mongo.split.DEFINITION_BATCH_SIZE', 2)
+    def test_get_definitions_in_batches(self):
+        self.conn.get_definitions.side_effect = lambda ids, course_key, fields: [{'_id': _id} for _id in ids]
+        results = self.bulk.get_definitions(self.course_key, [1, 2, 3])
+        self.assertEquals(self.conn.get_definitions.call_count, 2)
+        self.assertItemsEqual(results, [{'_id': 1}, {'_id': 2}, {'_id': 3}])
+
+    def test_get_projected_definitions(self):
+        self.bulk._begin_bulk_operation(self.course_key)
+        self.conn.get_definitions.return_value = [{'_id': 1, 'fields': {'data': 'data'}}]
+        results = self.bulk.get_definitions(self.course_key, [1], fields=['data'])
+        self.conn.get_definitions.assert_called_once_with([1], self.course_key, fields=['data'])
+        self.assertEquals(results, [{'_id': 1, 'fields': {'data': 'data'}}])
+        # Definitions without all of their fields aren't cached.
+        self.bulk.get_definitions(self.course_key, [1])
+        self.assertEquals(self.conn.get_definitions.call_count, 2)
+
     def test_no_bulk_find_structures_derived_from(self):
         ids = [Mock(name='id')]
         self.conn.find_structures_derived_from.return_value = [MagicMock(name='result')]
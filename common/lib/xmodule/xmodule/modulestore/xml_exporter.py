@@ -7,12 +7,14 @@ from abc import abstractmethod
 import lxml.etree
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
 from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.mongo import DEFAULT_EXPORT_WORKERS
 from xmodule.exceptions import NotFoundError
 from xmodule.assetstore import AssetMetadata
 from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
 from xmodule.modulestore import LIBRARY_ROOT
+from xmodule.modulestore.exceptions import ItemNotFoundError
 from fs.osfs import OSFS
 from json import dumps
 import json
@@ -26,6 +28,10 @@ DRAFT_DIR = "drafts"
 PUBLISHED_DIR = "published"
 EXPORT_VERSION_FILE = "format.json"
 EXPORT_VERSION_KEY = "export_format"
+# Suffix of the file, written next to an export's directory, which records the structure versions exported.
+EXPORTED_STRUCTURES_FILE_SUFFIX = ".structures.json"
+
+log = logging.getLogger(__name__)
 
 DEFAULT_CONTENT_FIELDS = ['metadata', 'data']
 
@@ -106,7 +112,8 @@ class ExportManager(object):
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir,
+                 incremental=False, asset_export_workers=DEFAULT_EXPORT_WORKERS):
         """
         Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -115,12 +122,18 @@ class ExportManager(object):
         `courselike_key`: The Locator of the Descriptor to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `incremental`: If True, update a previous export in `root_dir`/`target_dir` rather than write
+            a new one: blocks are only rendered again if the split structures they come from have
+            changed since, and only new or changed assets are written.
+        `asset_export_workers`: The number of threads used to export the static assets
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = target_dir
+        self.incremental = incremental
+        self.asset_export_workers = asset_export_workers
 
     @abstractmethod
     def get_key(self):
@@ -136,7 +149,12 @@ class ExportManager(object):
 
     def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
         """
-        Process additional content, like static assets.
+        Process additional content, like drafts and policies.
+        """
+
+    def export_static_content(self, root_courselike_dir, courselike=None):
+        """
+        Export the static assets from the contentstore. `courselike` is loaded if not given.
         """
 
     def post_process(self, root, export_fs):
@@ -155,6 +173,17 @@ class ExportManager(object):
         Perform the export given the parameters handed to this class at init.
         """
         with self.modulestore.bulk_operations(self.courselike_key):
+            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            structures = None
+            if self.incremental:
+                structures = get_structure_versions(self.modulestore, self.courselike_key)
+                if structures is not None and structures == self._read_exported_structures():
+                    # None of the blocks changed since the last export, so only the assets need updating.
+                    log.info(u"%s is unchanged since its last export; exporting its assets only", self.courselike_key)
+                    self.export_static_content(root_courselike_dir)
+                    return
+                # Start over, so that no file is left behind from blocks which no longer exist.
+                self._remove_previous_export()
 
             fsm = OSFS(self.root_dir)
             root = lxml.etree.Element('unknown')
@@ -173,12 +202,74 @@ class ExportManager(object):
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
             self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
+            self.export_static_content(root_courselike_dir, courselike)
 
             # Any last pass adjustments
             self.post_process(root, export_fs)
 
+            if structures is not None:
+                self._write_exported_structures(structures)
+
+    @property
+    def exported_structures_file(self):
+        """
+        The path of the file recording which structure versions were last exported to `target_dir`.
+        """
+        return os.path.join(self.root_dir, self.target_dir + EXPORTED_STRUCTURES_FILE_SUFFIX)
+
+    def _read_exported_structures(self):
+        """
+        Returns the structure versions recorded by the previous export, or None if there is none.
+        """
+        if not os.path.isdir(os.path.join(self.root_dir, self.target_dir)):
+            return None
+        try:
+            with open(self.exported_structures_file) as structures_file:
+                return json.load(structures_file)
+        except (IOError, ValueError):
+            return None
+
+    def _write_exported_structures(self, structures):
+        """
+        Record the structure versions which have just been exported.
+        """
+        with open(self.exported_structures_file, 'w') as structures_file:
+            json.dump(structures, structures_file, sort_keys=True, indent=4)
+
+    def _remove_previous_export(self):
+        """
+        Remove everything but the static assets from the previous export, along with its structure versions.
+        """
+        if os.path.exists(self.exported_structures_file):
+            os.remove(self.exported_structures_file)
+        courselike_dir = os.path.join(self.root_dir, self.target_dir)
+        if not os.path.isdir(courselike_dir):
+            return
+        for name in os.listdir(courselike_dir):
+            if name == 'static':
+                continue
+            entry_path = os.path.join(courselike_dir, name)
+            if os.path.isdir(entry_path):
+                shutil.rmtree(entry_path)
+            else:
+                os.remove(entry_path)
+
+    def _export_all_assets(self, root_courselike_dir):
+        """
+        Export all of the courselike's assets from the contentstore into `root_courselike_dir`.
+        """
+        policies_dir = root_courselike_dir + '/policies/'
+        if not os.path.isdir(policies_dir):
+            os.makedirs(policies_dir)
+        self.contentstore.export_all_for_course(
+            self.courselike_key,
+            root_courselike_dir + '/static/',
+            policies_dir + 'assets.json',
+            max_workers=self.asset_export_workers,
+            incremental=self.incremental,
+        )
+
 
 class CourseExportManager(ExportManager):
     """
@@ -215,33 +306,7 @@ class CourseExportManager(ExportManager):
         with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file)
 
-        # export the static assets
         policies_dir = export_fs.makeopendir('policies')
-        if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
-
-            # If we are using the default course image, export it to the
-            # legacy location to support backwards compatibility.
-            if courselike.course_image == courselike.fields['course_image'].default:
-                try:
-                    course_image = self.contentstore.find(
-                        StaticContent.compute_location(
-                            courselike.id,
-                            courselike.course_image
-                        ),
-                    )
-                except NotFoundError:
-                    pass
-                else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
-                        course_image_file.write(course_image.data)
 
         # export the static tabs
         export_extra_content(
@@ -288,6 +353,41 @@ class CourseExportManager(ExportManager):
             _export_drafts(self.modulestore, self.courselike_key, export_fs, xml_centric_courselike_key)
 
 
+    def export_static_content(self, root_courselike_dir, courselike=None):
+        if not self.contentstore:
+            return
+
+        self._export_all_assets(root_courselike_dir)
+
+        # If we are using the default course image, export it to the
+        # legacy location to support backwards compatibility.
+        course = courselike
+        if course is None:
+            with self.modulestore.branch_setting(ModuleStoreEnum.Branch.published_only, self.courselike_key):
+                course = self.modulestore.get_course(self.courselike_key, depth=0)
+        if course.course_image == course.fields['course_image'].default:
+            try:
+                course_image = self.contentstore.find(
+                    StaticContent.compute_location(
+                        course.id,
+                        course.course_image
+                    ),
+                    as_stream=True,
+                )
+            except NotFoundError:
+                pass
+            else:
+                output_dir = root_courselike_dir + '/static/images/'
+                if not os.path.isdir(output_dir):
+                    os.makedirs(output_dir)
+                try:
+                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                        for chunk in course_image.stream_data():
+                            course_image_file.write(chunk)
+                finally:
+                    course_image.close()
+
+
 class LibraryExportManager(ExportManager):
     """
     Export manager for Libraries
@@ -318,15 +418,11 @@ class LibraryExportManager(ExportManager):
         Notionally, libraries may have assets. This is currently unsupported, but the structure is here
         to ease in duck typing during import. This may be expanded as a useful feature eventually.
         """
-        # export the static assets
         export_fs.makeopendir('policies')
 
+    def export_static_content(self, root_courselike_dir, courselike=None):
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self._export_all_assets(root_courselike_dir)
 
     def post_process(self, root, export_fs):
         """
@@ -341,11 +437,11 @@ class LibraryExportManager(ExportManager):
         xml_file.close()
 
 
-def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
+def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir, incremental=False):
     """
     Thin wrapper for the Course Export Manager. See ExportManager for details.
     """
-    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir).export()
+    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir, incremental=incremental).export()
 
 
 def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir):
@@ -355,6 +451,28 @@ def export_library_to_xml(modulestore, contentstore, library_key, root_dir, libr
     LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
 
 
+def get_structure_versions(modulestore, courselike_key):
+    """
+    Returns the ids of the split structures, by branch, from which `courselike_key` would be exported,
+    or None if it isn't stored in split.
+
+    Every change to a course in split creates a new structure (whose edit info records the change),
+    so the versions identify the exported content.
+    """
+    store = modulestore
+    if hasattr(store, '_get_modulestore_for_courselike'):
+        store = store._get_modulestore_for_courselike(courselike_key)  # pylint: disable=protected-access
+    if store.get_modulestore_type() != ModuleStoreEnum.Type.split:
+        return None
+    try:
+        index = store.get_course_index_info(courselike_key)
+    except ItemNotFoundError:
+        return None
+    if index is None:
+        return None
+    return {branch: unicode(version) for branch, version in index['versions'].iteritems()}
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
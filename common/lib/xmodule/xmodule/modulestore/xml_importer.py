@@ -21,13 +21,17 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
 import logging
+import time
 from abc import abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
 from path import Path as path
 import json
 import re
+from multiprocessing.pool import ThreadPool
 from lxml import etree
 
 from xmodule.modulestore.xml import XMLModuleStore, LibraryXMLModuleStore, ImportSystem
@@ -54,18 +58,33 @@ from xmodule.util.misc import escape_invalid_characters
 log = logging.getLogger(__name__)
 
 
+# Number of threads used to upload static files (and generate their
+# thumbnails) into the contentstore during import.
+DEFAULT_STATIC_IMPORT_WORKERS = 4
+
+
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
+        target_id, subpath='static', verbose=False,
+        max_workers=DEFAULT_STATIC_IMPORT_WORKERS, generate_thumbnails=True):
+    """
+    Import all files found under `course_data_path/subpath` into the static
+    content store, generating thumbnails for images unless `generate_thumbnails`
+    is False, in which case the caller is expected to generate them later.
 
-    remap_dict = {}
+    Uploads are independent of each other, so they're done by a pool of
+    `max_workers` threads.  Each worker reads, thumbnails and saves one file
+    at a time, so at most `max_workers` files are held in memory at once.
 
+    Returns:
+        dict mapping each file's path (relative to the static dir) to its asset key.
+    """
     # now import all static assets
     static_dir = course_data_path / subpath
     try:
         with open(course_data_path / 'policies/assets.json') as f:
             policy = json.load(f)
-    except (IOError, ValueError) as err:
+    except (IOError, ValueError):
         # xml backed courses won't have this file, only exported courses;
         # so, its absence is not really an exception.
         policy = {}
@@ -76,73 +95,98 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
-
-            content_path = os.path.join(dirname, filename)
-
-            if re.match(ASSET_IGNORE_REGEX, filename):
-                if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+    def static_files():
+        """
+        Yields (content_path, filename) for each static file to be imported.
+        """
+        for dirname, _, filenames in os.walk(static_dir):
+            for filename in filenames:
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+                content_path = os.path.join(dirname, filename)
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                if re.match(ASSET_IGNORE_REGEX, filename):
+                    if verbose:
+                        log.debug('skipping static content %s...', content_path)
                     continue
-                # Not a 'hidden file', then re-raise exception
-                raise
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+                yield content_path, filename
 
-            policy_ele = policy.get(asset_key.path, {})
+    def import_static_file(content_path, filename):
+        """
+        Saves a single static file (and its thumbnail) to the content store.
 
-            # During export display name is used to create files, strip away slashes from name
-            displayname = escape_invalid_characters(
-                name=policy_ele.get('displayname', filename),
-                invalid_char_list=['/', '\\']
-            )
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+        Returns:
+            (relative path, asset key), or None if the file was skipped.
+        """
+        if verbose:
+            log.debug('importing static content %s...', content_path)
 
+        try:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            if filename.startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return None
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        # strip away leading path from the name
+        fullname_with_subpath = content_path.replace(static_dir, '')
+        if fullname_with_subpath.startswith('/'):
+            fullname_with_subpath = fullname_with_subpath[1:]
+        asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+        policy_ele = policy.get(asset_key.path, {})
+
+        # During export display name is used to create files, strip away slashes from name
+        displayname = escape_invalid_characters(
+            name=policy_ele.get('displayname', filename),
+            invalid_char_list=['/', '\\']
+        )
+        locked = policy_ele.get('locked', False)
+        mime_type = policy_ele.get('contentType')
+
+        # Check extracted contentType in list of all valid mimetypes
+        if not mime_type or mime_type not in mimetypes_list:
+            mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked
+        )
+
+        if generate_thumbnails:
             # first let's save a thumbnail so we can get back a thumbnail location
             thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
 
             if thumbnail_content is not None:
                 content.thumbnail_location = thumbnail_location
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                fullname_with_subpath, err
+            ))
 
-            # store the remapping information which will be needed
-            # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+        return fullname_with_subpath, asset_key
 
-    return remap_dict
+    if max_workers > 1:
+        pool = ThreadPool(max_workers)
+        try:
+            # Exceptions raised by a worker are re-raised here, when its result is fetched.
+            results = list(pool.imap_unordered(lambda args: import_static_file(*args), static_files()))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [import_static_file(content_path, filename) for content_path, filename in static_files()]
+
+    # store the remapping information which will be needed
+    # to subsitute in the module data
+    return dict(result for result in results if result is not None)
 
 
 class ImportManager(object):
@@ -177,16 +221,28 @@ class ImportManager(object):
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
+
+        static_import_workers: the number of threads used to upload static files into static_content_store.
+
+        generate_thumbnails: if False, the thumbnails of imported images aren't generated, so that the
+            caller can generate them in the background.
+
+    After an import, `phase_timings` maps each courselike key to an ordered dict of
+    phase name -> seconds spent in that phase; the time spent parsing the XML is
+    recorded under `PARSE_PHASE`.
     """
     store_class = XMLModuleStore
 
+    PARSE_PHASE = 'parse_xml'
+
     def __init__(
             self, store, user_id, data_dir, source_dirs=None,
             default_class='xmodule.raw_module.RawDescriptor',
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, static_import_workers=DEFAULT_STATIC_IMPORT_WORKERS,
+            generate_thumbnails=True
     ):
         self.store = store
         self.user_id = user_id
@@ -199,6 +255,10 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_import_workers = static_import_workers
+        self.generate_thumbnails = generate_thumbnails
+        self.phase_timings = {}
+        parse_start = time.time()
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -208,8 +268,21 @@ class ImportManager(object):
             xblock_select=store.xblock_select,
             target_course_id=target_id,
         )
+        self.parse_time = time.time() - parse_start
         self.logger, self.errors = make_error_tracker()
 
+    @contextmanager
+    def timed_phase(self, courselike_key, phase):
+        """
+        Records the time spent in the wrapped import phase for the given courselike.
+        """
+        timings = self.phase_timings.setdefault(courselike_key, OrderedDict([(self.PARSE_PHASE, self.parse_time)]))
+        start = time.time()
+        try:
+            yield
+        finally:
+            timings[phase] = timings.get(phase, 0) + time.time() - start
+
     def preflight(self):
         """
         Perform any pre-import sanity checks.
@@ -227,7 +300,8 @@ class ImportManager(object):
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose,
+                max_workers=self.static_import_workers, generate_thumbnails=self.generate_thumbnails
             )
 
         elif self.verbose and not self.do_import_static:
@@ -250,7 +324,8 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose,
+                max_workers=self.static_import_workers, generate_thumbnails=self.generate_thumbnails
             )
 
     def import_asset_metadata(self, data_dir, course_id):
@@ -436,25 +511,39 @@ class ImportManager(object):
             # This bulk operation wraps all the operations to populate the published branch.
             with self.store.bulk_operations(dest_id):
                 # Retrieve the course itself.
-                source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
+                with self.timed_phase(courselike_key, 'courselike'):
+                    source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
                 # Import all static pieces.
-                self.import_static(data_path, dest_id)
+                with self.timed_phase(courselike_key, 'static'):
+                    self.import_static(data_path, dest_id)
 
                 # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                with self.timed_phase(courselike_key, 'asset_metadata'):
+                    self.import_asset_metadata(data_path, dest_id)
 
                 # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                with self.timed_phase(courselike_key, 'children'):
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
             # Drafts must be imported in a separate bulk operation from published items to import properly,
             # due to the recursive_build() above creating a draft item for each course block
             # and then publishing it.
-            with self.store.bulk_operations(dest_id):
-                # Import all draft items into the courselike.
-                courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+            with self.timed_phase(courselike_key, 'drafts'):
+                with self.store.bulk_operations(dest_id):
+                    # Import all draft items into the courselike.
+                    courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+
+            log.info(
+                u'Imported %s into %s; seconds per phase: %s',
+                courselike_key, dest_id,
+                u', '.join(
+                    u'{}={:.2f}'.format(phase, seconds)
+                    for phase, seconds in self.phase_timings[courselike_key].items()
+                )
+            )
 
             yield courselike
 
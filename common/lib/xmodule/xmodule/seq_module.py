@@ -164,6 +164,15 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
         raise NotFoundError('Unexpected dispatch type')
 
     def student_view(self, context):
+        """
+        Renders the sequence, with a tab for each of its display items.
+
+        If `context` has `lazy_tabs` set, only the item at `position` is rendered: the other tabs
+        only carry the metadata needed to display them in the sequence's navigation, and their
+        content is fetched from the runtime's `view_url` when they are first shown.
+        """
+        context = context or {}
+
         # If we're rendering this sequence, but no position is set yet,
         # default the position to the first element
         if self.position is None:
@@ -184,7 +193,11 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
                 fragment.add_content(view_html)
                 return fragment
 
-        for child in self.get_display_items():
+        for position, child in enumerate(self.get_display_items(), start=1):
+            if context.get('lazy_tabs') and position != self.position:
+                contents.append(self._lazy_childinfo(child))
+                continue
+
             progress = child.get_progress()
             rendered_child = child.render(STUDENT_VIEW, context)
             fragment.add_frag_resources(rendered_child)
@@ -194,6 +207,7 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
             titles = [title.strip() for title in child.get_content_titles() if title.strip()]
             childinfo = {
                 'content': rendered_child.content,
+                'content_url': None,
                 'title': "\n".join(titles),
                 'page_title': titles[0] if titles else '',
                 'progress_status': Progress.to_js_status_str(progress),
@@ -218,6 +232,33 @@ class SequenceModule(SequenceFields, ProctoringFields, XModule):
 
         return fragment
 
+    def _lazy_childinfo(self, child):
+        """
+        The tab of a display item which isn't rendered with the sequence.
+
+        It is described from the item's own fields and the types of its children alone, without
+        loading its children or their student state, and its content is fetched when it's shown.
+        """
+        if child.has_children:
+            block_types = set(child_key.block_type for child_key in child.children)
+        else:
+            block_types = {child.location.block_type}
+        icon_class = 'other'
+        for higher_class in class_priority:
+            if higher_class in block_types:
+                icon_class = higher_class
+
+        return {
+            'content': '',
+            'content_url': self.system.view_url(child, STUDENT_VIEW),
+            'title': child.display_name_with_default,
+            'page_title': child.display_name_with_default,
+            'progress_status': Progress.to_js_status_str(None),
+            'progress_detail': Progress.to_js_detail_str(None),
+            'type': icon_class,
+            'id': child.scope_ids.usage_id.to_deprecated_string(),
+        }
+
     def _time_limited_student_view(self, context):
         """
         Delegated rendering of a student view when in a time
@@ -39,3 +39,26 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+    def test_parallel_import(self):
+        """
+        Test that importing with a thread pool saves every file once and
+        returns the same remapping as a serial import.
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+
+        serial_store = Mock()
+        serial_store.generate_thumbnail.return_value = (None, None)
+        serial_remap = import_static_content(course_dir, serial_store, course_id, max_workers=1)
+
+        parallel_store = Mock()
+        parallel_store.generate_thumbnail.return_value = (None, None)
+        parallel_remap = import_static_content(course_dir, parallel_store, course_id, max_workers=4)
+
+        self.assertEqual(serial_remap, parallel_remap)
+        self.assertEqual(
+            sorted(call[0][0].name for call in serial_store.save.call_args_list),
+            sorted(call[0][0].name for call in parallel_store.save.call_args_list),
+        )
+        self.assertEqual(parallel_store.generate_thumbnail.call_count, parallel_store.save.call_count)
@@ -3,7 +3,7 @@
 
 import unittest
 
-from mock import Mock
+from mock import Mock, patch
 from nose.tools import assert_equals, assert_not_equals, assert_true, assert_false, assert_in, assert_not_in  # pylint: disable=no-name-in-module
 
 from xblock.field_data import DictFieldData
@@ -79,6 +79,7 @@ class InheritingFieldDataTest(unittest.TestCase):
         if usage_id is None:
             usage_id = "_auto%d" % len(self.all_blocks)
         scope_ids.usage_id = usage_id
+        scope_ids.user_id = None
         block = self.system.construct_xblock_from_class(
             self.TestableInheritingXBlock,
             field_data=self.field_data,
@@ -132,6 +133,59 @@ class InheritingFieldDataTest(unittest.TestCase):
         child.parent = "parent"
         self.assertEqual(child.not_inherited, "nothing")
 
+    def test_inherited_values_table(self):
+        # The values passed down by each ancestor are computed once, and shared with the other blocks.
+        grandparent = self.get_a_block(usage_id="grandparent")
+        grandparent.inherited = "Changed!"
+        grandparent.save()
+        parent = self.get_a_block(usage_id="parent")
+        parent.parent = "grandparent"
+        child = self.get_a_block(usage_id="child")
+        child.parent = "parent"
+        self.assertEqual(child.inherited, "Changed!")
+        self.assertEqual(self.field_data.inherited_values[(None, "parent")], {"inherited": "Changed!"})
+        self.assertEqual(self.field_data.inherited_values[(None, "grandparent")], {"inherited": "Changed!"})
+
+        sibling = self.get_a_block(usage_id="sibling")
+        sibling.parent = "parent"
+        values_for_children = self.field_data._values_for_children  # pylint: disable=protected-access
+        with patch.object(self.field_data, '_values_for_children', wraps=values_for_children) as values:
+            self.assertEqual(sibling.inherited, "Changed!")
+        self.assertEqual(values.call_count, 1)
+
+    def test_inherited_values_invalidated(self):
+        # Saving an inherited field clears the table, so children see the new value.
+        parent = self.get_a_block(usage_id="parent")
+        parent.inherited = "Changed!"
+        parent.save()
+        child = self.get_a_block(usage_id="child")
+        child.parent = "parent"
+        self.assertEqual(child.inherited, "Changed!")
+
+        # Blocks cache the values they've read, so read them again from new children.
+        parent.inherited = "Changed again!"
+        parent.save()
+        self.assertEqual(self.field_data.inherited_values, {})
+        child = self.get_a_block(usage_id="second_child")
+        child.parent = "parent"
+        self.assertEqual(child.inherited, "Changed again!")
+
+        del parent.inherited
+        parent.save()
+        child = self.get_a_block(usage_id="third_child")
+        child.parent = "parent"
+        self.assertEqual(child.inherited, "the default")
+
+    def test_shared_inherited_values(self):
+        # Field data given the same table share it.
+        inherited_values = {}
+        field_data = InheritingFieldData(
+            inheritable_names=['inherited'],
+            kvs=DictKeyValueStore({}),
+            inherited_values=inherited_values,
+        )
+        self.assertIs(field_data.inherited_values, inherited_values)
+
 
 class EditableMetadataFieldsTest(unittest.TestCase):
     def test_display_name_field(self):
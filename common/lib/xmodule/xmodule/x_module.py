@@ -35,6 +35,7 @@ from opaque_keys.edx.keys import UsageKey
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideDefinitionKeyV1
 from xmodule.exceptions import UndefinedContext
 import dogstats_wrapper as dog_stats_api
+from openedx.core.lib import request_profile
 
 log = logging.getLogger(__name__)
 
@@ -1237,7 +1238,8 @@ class MetricsMixin(object):
         start_time = time.time()
         try:
             status = "success"
-            return super(MetricsMixin, self).render(block, view_name, context=context)
+            with request_profile.timed('render', u'{}.{}'.format(block.scope_ids.block_type, view_name)):
+                return super(MetricsMixin, self).render(block, view_name, context=context)
 
         except:
             status = "failure"
@@ -249,6 +249,24 @@ class CourseAuthorization(models.Model):
         except cls.DoesNotExist:
             return False
 
+    @classmethod
+    def instructor_email_enabled_for_courses(cls, course_ids):
+        """
+        Returns the subset of the given course ids for which email is enabled.
+
+        This is the bulk version of `instructor_email_enabled`, which loads
+        the authorizations for all of the courses with a single query.
+        """
+        course_ids = set(course_ids)
+        if not settings.FEATURES['REQUIRE_COURSE_EMAIL_AUTH']:
+            return course_ids
+        if not course_ids:
+            return set()
+
+        return set(
+            cls.objects.filter(course_id__in=course_ids, email_enabled=True).values_list('course_id', flat=True)
+        )
+
     def __unicode__(self):
         not_en = "Not "
         if self.email_enabled:
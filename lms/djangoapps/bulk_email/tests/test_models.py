@@ -182,3 +182,24 @@ class CourseAuthorizationTest(TestCase):
 
         # Now, course should STILL be authorized!
         self.assertTrue(CourseAuthorization.instructor_email_enabled(course_id))
+
+    @patch.dict(settings.FEATURES, {'REQUIRE_COURSE_EMAIL_AUTH': True})
+    def test_enabled_for_courses_auth_on(self):
+        enabled_id = SlashSeparatedCourseKey('abc', '123', 'enabled')
+        disabled_id = SlashSeparatedCourseKey('abc', '123', 'disabled')
+        missing_id = SlashSeparatedCourseKey('abc', '123', 'missing')
+        CourseAuthorization(course_id=enabled_id, email_enabled=True).save()
+        CourseAuthorization(course_id=disabled_id, email_enabled=False).save()
+
+        with self.assertNumQueries(1):
+            enabled = CourseAuthorization.instructor_email_enabled_for_courses(
+                [enabled_id, disabled_id, missing_id]
+            )
+        self.assertEqual(enabled, {enabled_id})
+
+    @patch.dict(settings.FEATURES, {'REQUIRE_COURSE_EMAIL_AUTH': False})
+    def test_enabled_for_courses_auth_off(self):
+        course_ids = [SlashSeparatedCourseKey('blahx', 'blah101', 'ehhhhhhh')]
+        with self.assertNumQueries(0):
+            enabled = CourseAuthorization.instructor_email_enabled_for_courses(course_ids)
+        self.assertEqual(enabled, set(course_ids))
@@ -278,6 +278,11 @@ class CCXModulestoreWrapper(object):
         with remove_ccx(xblock) as (xblock, restore):
             return restore(self._modulestore.has_changes(xblock))
 
+    def get_subtree_changes(self, xblock):
+        """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
+        with remove_ccx(xblock) as (xblock, restore):
+            return restore(self._modulestore.get_subtree_changes(xblock))
+
     def check_supports(self, course_key, method):
         """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
         course_key, _ = strip_ccx(course_key)
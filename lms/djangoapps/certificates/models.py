@@ -280,18 +280,54 @@ def certificate_status_for_student(student, course_id):
     try:
         generated_certificate = GeneratedCertificate.objects.get(
             user=student, course_id=course_id)
-        cert_status = {
-            'status': generated_certificate.status,
-            'mode': generated_certificate.mode
-        }
-        if generated_certificate.grade:
-            cert_status['grade'] = generated_certificate.grade
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            cert_status['download_url'] = generated_certificate.download_url
-
-        return cert_status
+        return _certificate_status(generated_certificate)
     except GeneratedCertificate.DoesNotExist:
         pass
+    return _unavailable_certificate_status()
+
+
+def certificate_statuses_for_student(student, course_ids):
+    """
+    Bulk version of `certificate_status_for_student`.
+
+    Loads the certificates for all of the given courses with a single query
+    rather than one query per course.
+
+    Arguments:
+        student (User): The student.
+        course_ids (iterable of CourseKey): The courses to look up.
+
+    Returns:
+        dict: Mapping of course keys to status dictionaries in the same
+            format returned by `certificate_status_for_student`.
+    """
+    course_ids = list(course_ids)
+    statuses = {course_id: _unavailable_certificate_status() for course_id in course_ids}
+    if course_ids:
+        for generated_certificate in GeneratedCertificate.objects.filter(user=student, course_id__in=course_ids):
+            statuses[generated_certificate.course_id] = _certificate_status(generated_certificate)
+    return statuses
+
+
+def _certificate_status(generated_certificate):
+    """
+    Returns the status dictionary for an existing `GeneratedCertificate`.
+    """
+    cert_status = {
+        'status': generated_certificate.status,
+        'mode': generated_certificate.mode
+    }
+    if generated_certificate.grade:
+        cert_status['grade'] = generated_certificate.grade
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        cert_status['download_url'] = generated_certificate.download_url
+    return cert_status
+
+
+def _unavailable_certificate_status():
+    """
+    Returns the status dictionary for a student who has no certificate.
+    """
     return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
 
 
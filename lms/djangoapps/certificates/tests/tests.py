@@ -14,6 +14,7 @@ from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
     certificate_status_for_student,
+    certificate_statuses_for_student,
     certificate_info_for_user
 )
 from certificates.tests.factories import GeneratedCertificateFactory
@@ -40,6 +41,27 @@ class CertificatesModelTest(ModuleStoreTestCase):
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
 
+    def test_certificate_statuses_for_student(self):
+        student = UserFactory()
+        course = CourseFactory.create(org='edx', number='verified', display_name='Verified Course')
+        other_course = CourseFactory.create(org='edx', number='other', display_name='Other Course')
+        GeneratedCertificateFactory.create(
+            user=student,
+            course_id=course.id,
+            status=CertificateStatuses.downloadable,
+            mode='verified',
+            grade='0.9',
+            download_url='http://www.example.com/cert.pdf'
+        )
+
+        with self.assertNumQueries(1):
+            statuses = certificate_statuses_for_student(student, [course.id, other_course.id])
+
+        self.assertEqual(statuses[course.id], certificate_status_for_student(student, course.id))
+        self.assertEqual(statuses[course.id]['download_url'], 'http://www.example.com/cert.pdf')
+        self.assertEqual(statuses[other_course.id], certificate_status_for_student(student, other_course.id))
+        self.assertEqual(statuses[other_course.id]['status'], CertificateStatuses.unavailable)
+
     @unpack
     @data(
         {'allow_certificate': False, 'whitelisted': False, 'grade': None, 'output': ['N', 'N', 'N/A']},
@@ -2,15 +2,22 @@
 Computes the data to display on the Instructor Dashboard
 """
 from util.json_request import JsonResponse
+from util.query import use_read_replica_if_available
 import json
 
 from courseware import models
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Count
+from django.utils import timezone
 from django.utils.translation import ugettext as _
 
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.inheritance import own_metadata
 from instructor_analytics.csvs import create_csv_response
+from class_dashboard.models import (
+    CourseMetrics, ProblemGradeCount, SequentialOpenCount, precomputed_metrics_enabled,
+)
 
 from opaque_keys.edx.locations import Location
 
@@ -18,6 +25,183 @@ from opaque_keys.edx.locations import Location
 MAX_SCREEN_LIST_LENGTH = 250
 
 
+def _precomputed_metrics(course_id):
+    """
+    Returns the CourseMetrics of the course if its metrics are to be read from the precomputed tables, or None.
+    """
+    if not precomputed_metrics_enabled():
+        return None
+    return CourseMetrics.objects.filter(course_id=course_id, computed__isnull=False).first()
+
+
+def _live_problem_grade_rows(course_id, problem_set=None):
+    """
+    Aggregate query on studentmodule table for grade data for all problems in course, or those in `problem_set`.
+
+    Returns dicts with the 'module_state_key', 'grade', 'max_grade' and 'count_grade' of each grade of each problem.
+    """
+    db_query = models.StudentModule.objects.filter(
+        course_id__exact=course_id,
+        grade__isnull=False,
+        module_type__exact="problem",
+    )
+    if problem_set is not None:
+        db_query = db_query.filter(module_state_key__in=problem_set)
+
+    return db_query.values(
+        'module_state_key',
+        'grade',
+        'max_grade',
+    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+
+
+def _problem_grade_rows(course_id, problem_set=None):
+    """
+    Returns the rows of `_live_problem_grade_rows`, from the precomputed tables if the course's are to be used.
+    """
+    if _precomputed_metrics(course_id) is None:
+        return _live_problem_grade_rows(course_id, problem_set)
+
+    db_query = ProblemGradeCount.objects.filter(course_id=course_id)
+    if problem_set is not None:
+        db_query = db_query.filter(module_state_key__in=problem_set)
+
+    return [
+        {'module_state_key': module_state_key, 'grade': grade, 'max_grade': max_grade, 'count_grade': count}
+        for module_state_key, grade, max_grade, count in db_query.order_by('module_state_key', 'grade').values_list(
+            'module_state_key', 'grade', 'max_grade', 'count'
+        )
+    ]
+
+
+def _live_sequential_open_rows(course_id):
+    """
+    Aggregate query on studentmodule table for "opening a subsection" data.
+
+    Returns dicts with the 'module_state_key' of each subsection and the 'count_sequential' of students who opened it.
+    """
+    return models.StudentModule.objects.filter(
+        course_id__exact=course_id,
+        module_type__exact="sequential",
+    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+
+
+def _sequential_open_rows(course_id):
+    """
+    Returns the rows of `_live_sequential_open_rows`, from the precomputed tables if the course's are to be used.
+    """
+    if _precomputed_metrics(course_id) is None:
+        return _live_sequential_open_rows(course_id)
+
+    return [
+        {'module_state_key': module_state_key, 'count_sequential': count}
+        for module_state_key, count in SequentialOpenCount.objects.filter(course_id=course_id).values_list(
+            'module_state_key', 'count'
+        )
+    ]
+
+
+def build_course_outline(course):
+    """
+    Returns the outline of `course` which its metrics are laid out by.
+
+    `course` the course descriptor, loaded down to its problems
+
+    Returns an array of dicts in the order of the sections. Each dict has:
+      'display_name' - display name for the section
+      'subsections' - array of dicts in the order of the section's subsections, with:
+        'module_id' - the subsection's location, as a deprecated string
+        'display_name' - display name for the subsection
+        'units' - array of the arrays of problems in each unit of the subsection, with the 'module_id' and
+          'display_name' of each problem
+    """
+    outline = []
+    for section in course.get_children():
+        subsections = []
+        for subsection in section.get_children():
+            units = []
+            for unit in subsection.get_children():
+                units.append([
+                    {
+                        'module_id': child.location.to_deprecated_string(),
+                        'display_name': own_metadata(child).get('display_name', ''),
+                    }
+                    for child in unit.get_children()
+                    # Student data is at the problem level
+                    if child.location.category == 'problem'
+                ])
+            subsections.append({
+                'module_id': subsection.location.to_deprecated_string(),
+                'display_name': own_metadata(subsection).get('display_name', ''),
+                'units': units,
+            })
+        outline.append({
+            'display_name': own_metadata(section).get('display_name', ''),
+            'subsections': subsections,
+        })
+    return outline
+
+
+def get_course_outline(course_id):
+    """
+    Returns the outline of the course, as built by `build_course_outline`.
+
+    `course_id` the course ID for the course interested in
+
+    The outline is read from the precomputed metrics of the course if they are to be used, rather than from the
+    modulestore.
+    """
+    metrics = _precomputed_metrics(course_id)
+    if metrics is not None:
+        return json.loads(metrics.outline)
+
+    # Retrieve course object down to problems
+    return build_course_outline(modulestore().get_course(course_id, depth=4))
+
+
+def update_course_metrics(course_id):
+    """
+    Recomputes the precomputed metrics of the course, replacing its previous ones.
+
+    `course_id` the course ID for the course interested in
+
+    The metrics are aggregated from the read replica if there is one. Anything which changes them while they are
+    being computed marks them stale again, so that they are recomputed the next time.
+    """
+    course = modulestore().get_course(course_id, depth=4)
+    metrics, __ = CourseMetrics.objects.get_or_create(course_id=course_id)
+    CourseMetrics.objects.filter(id=metrics.id).update(stale=False)
+    cache.delete(CourseMetrics.stale_cache_key(course_id))
+
+    problem_grade_counts = [
+        ProblemGradeCount(
+            course_id=course_id,
+            module_state_key=row['module_state_key'],
+            grade=row['grade'],
+            max_grade=row['max_grade'],
+            count=row['count_grade'],
+        )
+        for row in use_read_replica_if_available(_live_problem_grade_rows(course_id))
+    ]
+    sequential_open_counts = [
+        SequentialOpenCount(
+            course_id=course_id,
+            module_state_key=row['module_state_key'],
+            count=row['count_sequential'],
+        )
+        for row in use_read_replica_if_available(_live_sequential_open_rows(course_id))
+    ]
+
+    with transaction.atomic():
+        ProblemGradeCount.objects.filter(course_id=course_id).delete()
+        ProblemGradeCount.objects.bulk_create(problem_grade_counts)
+        SequentialOpenCount.objects.filter(course_id=course_id).delete()
+        SequentialOpenCount.objects.bulk_create(sequential_open_counts)
+        metrics.outline = json.dumps(build_course_outline(course))
+        metrics.computed = timezone.now()
+        metrics.save(update_fields=['outline', 'computed'])
+
+
 def get_problem_grade_distribution(course_id):
     """
     Returns the grade distribution per problem for the course
@@ -32,12 +216,8 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+    # Grade data for all problems in course
+    db_query = _problem_grade_rows(course_id)
 
     prob_grade_distrib = {}
     total_student_count = {}
@@ -75,11 +255,8 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    # "Opening a subsection" data
+    db_query = _sequential_open_rows(course_id)
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
@@ -105,17 +282,8 @@ def get_problem_set_grade_distrib(course_id, problem_set):
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-        module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+    # Grade data for set of problems in course
+    db_query = _problem_grade_rows(course_id, problem_set)
 
     prob_grade_distrib = {}
 
@@ -151,77 +319,66 @@ def get_d3_problem_grade_distrib(course_id):
     prob_grade_distrib, total_student_count = get_problem_grade_distribution(course_id)
     d3_data = []
 
-    # Retrieve course object down to problems
-    course = modulestore().get_course(course_id, depth=4)
-
     # Iterate through sections, subsections, units, problems
-    for section in course.get_children():
+    for section in get_course_outline(course_id):
         curr_section = {}
-        curr_section['display_name'] = own_metadata(section).get('display_name', '')
+        curr_section['display_name'] = section['display_name']
         data = []
-        c_subsection = 0
-        for subsection in section.get_children():
-            c_subsection += 1
-            c_unit = 0
-            for unit in subsection.get_children():
-                c_unit += 1
-                c_problem = 0
-                for child in unit.get_children():
-
-                    # Student data is at the problem level
-                    if child.location.category == 'problem':
-                        c_problem += 1
-                        stack_data = []
-
-                        # Construct label to display for this problem
-                        label = "P{0}.{1}.{2}".format(c_subsection, c_unit, c_problem)
-
-                        # Only problems in prob_grade_distrib have had a student submission.
-                        if child.location in prob_grade_distrib:
-
-                            # Get max_grade, grade_distribution for this problem
-                            problem_info = prob_grade_distrib[child.location]
-
-                            # Get problem_name for tooltip
-                            problem_name = own_metadata(child).get('display_name', '')
-
-                            # Compute percent of this grade over max_grade
-                            max_grade = float(problem_info['max_grade'])
-                            for (grade, count_grade) in problem_info['grade_distrib']:
-                                percent = 0.0
-                                if max_grade > 0:
-                                    percent = round((grade * 100.0) / max_grade, 1)
-
-                                # Compute percent of students with this grade
-                                student_count_percent = 0
-                                if total_student_count.get(child.location, 0) > 0:
-                                    student_count_percent = count_grade * 100 / total_student_count[child.location]
-
-                                # Tooltip parameters for problem in grade distribution view
-                                tooltip = {
-                                    'type': 'problem',
-                                    'label': label,
-                                    'problem_name': problem_name,
-                                    'count_grade': count_grade,
-                                    'percent': percent,
-                                    'grade': grade,
-                                    'max_grade': max_grade,
-                                    'student_count_percent': student_count_percent,
-                                }
-
-                                # Construct data to be sent to d3
-                                stack_data.append({
-                                    'color': percent,
-                                    'value': count_grade,
-                                    'tooltip': tooltip,
-                                    'module_url': child.location.to_deprecated_string(),
-                                })
-
-                        problem = {
-                            'xValue': label,
-                            'stackData': stack_data,
-                        }
-                        data.append(problem)
+        for c_subsection, subsection in enumerate(section['subsections'], start=1):
+            for c_unit, problems in enumerate(subsection['units'], start=1):
+                for c_problem, child in enumerate(problems, start=1):
+                    location = course_id.make_usage_key_from_deprecated_string(child['module_id'])
+                    stack_data = []
+
+                    # Construct label to display for this problem
+                    label = "P{0}.{1}.{2}".format(c_subsection, c_unit, c_problem)
+
+                    # Only problems in prob_grade_distrib have had a student submission.
+                    if location in prob_grade_distrib:
+
+                        # Get max_grade, grade_distribution for this problem
+                        problem_info = prob_grade_distrib[location]
+
+                        # Get problem_name for tooltip
+                        problem_name = child['display_name']
+
+                        # Compute percent of this grade over max_grade
+                        max_grade = float(problem_info['max_grade'])
+                        for (grade, count_grade) in problem_info['grade_distrib']:
+                            percent = 0.0
+                            if max_grade > 0:
+                                percent = round((grade * 100.0) / max_grade, 1)
+
+                            # Compute percent of students with this grade
+                            student_count_percent = 0
+                            if total_student_count.get(location, 0) > 0:
+                                student_count_percent = count_grade * 100 / total_student_count[location]
+
+                            # Tooltip parameters for problem in grade distribution view
+                            tooltip = {
+                                'type': 'problem',
+                                'label': label,
+                                'problem_name': problem_name,
+                                'count_grade': count_grade,
+                                'percent': percent,
+                                'grade': grade,
+                                'max_grade': max_grade,
+                                'student_count_percent': student_count_percent,
+                            }
+
+                            # Construct data to be sent to d3
+                            stack_data.append({
+                                'color': percent,
+                                'value': count_grade,
+                                'tooltip': tooltip,
+                                'module_url': child['module_id'],
+                            })
+
+                    problem = {
+                        'xValue': label,
+                        'stackData': stack_data,
+                    }
+                    data.append(problem)
         curr_section['data'] = data
 
         d3_data.append(curr_section)
@@ -243,24 +400,22 @@ def get_d3_sequential_open_distrib(course_id):
 
     d3_data = []
 
-    # Retrieve course object down to subsection
-    course = modulestore().get_course(course_id, depth=2)
-
     # Iterate through sections, subsections
-    for section in course.get_children():
+    for section in get_course_outline(course_id):
         curr_section = {}
-        curr_section['display_name'] = own_metadata(section).get('display_name', '')
+        curr_section['display_name'] = section['display_name']
         data = []
         c_subsection = 0
 
         # Construct data for each subsection to be sent to d3
-        for subsection in section.get_children():
+        for subsection in section['subsections']:
             c_subsection += 1
-            subsection_name = own_metadata(subsection).get('display_name', '')
+            subsection_name = subsection['display_name']
+            location = course_id.make_usage_key_from_deprecated_string(subsection['module_id'])
 
             num_students = 0
-            if subsection.location in sequential_open_distrib:
-                num_students = sequential_open_distrib[subsection.location]
+            if location in sequential_open_distrib:
+                num_students = sequential_open_distrib[location]
 
             stack_data = []
 
@@ -276,7 +431,7 @@ def get_d3_sequential_open_distrib(course_id):
                 'color': 0,
                 'value': num_students,
                 'tooltip': tooltip,
-                'module_url': subsection.location.to_deprecated_string(),
+                'module_url': subsection['module_id'],
             })
             subsection = {
                 'xValue': "SS {0}".format(c_subsection),
@@ -313,27 +468,18 @@ def get_d3_section_grade_distrib(course_id, section):
         'tooltip' - (Optional) Text to display on mouse hover
     """
 
-    # Retrieve course object down to problems
-    course = modulestore().get_course(course_id, depth=4)
-
     problem_set = []
     problem_info = {}
-    c_subsection = 0
-    for subsection in course.get_children()[section].get_children():
-        c_subsection += 1
-        c_unit = 0
-        for unit in subsection.get_children():
-            c_unit += 1
-            c_problem = 0
-            for child in unit.get_children():
-                if child.location.category == 'problem':
-                    c_problem += 1
-                    problem_set.append(child.location)
-                    problem_info[child.location] = {
-                        'id': child.location.to_deprecated_string(),
-                        'x_value': "P{0}.{1}.{2}".format(c_subsection, c_unit, c_problem),
-                        'display_name': own_metadata(child).get('display_name', ''),
-                    }
+    for c_subsection, subsection in enumerate(get_course_outline(course_id)[section]['subsections'], start=1):
+        for c_unit, problems in enumerate(subsection['units'], start=1):
+            for c_problem, child in enumerate(problems, start=1):
+                location = course_id.make_usage_key_from_deprecated_string(child['module_id'])
+                problem_set.append(location)
+                problem_info[location] = {
+                    'id': child['module_id'],
+                    'x_value': "P{0}.{1}.{2}".format(c_subsection, c_unit, c_problem),
+                    'display_name': child['display_name'],
+                }
 
     # Retrieve grade distribution for these problems
     grade_distrib = get_problem_set_grade_distrib(course_id, problem_set)
@@ -385,15 +531,7 @@ def get_section_display_name(course_id):
     The ith string in the array is the display name of the ith section in the course.
     """
 
-    course = modulestore().get_course(course_id, depth=4)
-
-    section_display_name = [""] * len(course.get_children())
-    i = 0
-    for section in course.get_children():
-        section_display_name[i] = own_metadata(section).get('display_name', '')
-        i += 1
-
-    return section_display_name
+    return [section['display_name'] for section in get_course_outline(course_id)]
 
 
 def get_array_section_has_problem(course_id):
@@ -405,25 +543,10 @@ def get_array_section_has_problem(course_id):
     The ith value in the array is true if the ith section in the course contains problems and false otherwise.
     """
 
-    course = modulestore().get_course(course_id, depth=4)
-
-    b_section_has_problem = [False] * len(course.get_children())
-    i = 0
-    for section in course.get_children():
-        for subsection in section.get_children():
-            for unit in subsection.get_children():
-                for child in unit.get_children():
-                    if child.location.category == 'problem':
-                        b_section_has_problem[i] = True
-                        break  # out of child loop
-                if b_section_has_problem[i]:
-                    break  # out of unit loop
-            if b_section_has_problem[i]:
-                break  # out of subsection loop
-
-        i += 1
-
-    return b_section_has_problem
+    return [
+        any(problems for subsection in section['subsections'] for problems in subsection['units'])
+        for section in get_course_outline(course_id)
+    ]
 
 
 def get_students_opened_subsection(request, csv=False):
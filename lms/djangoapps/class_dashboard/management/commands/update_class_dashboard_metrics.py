@@ -0,0 +1,61 @@
+"""
+Recomputes the precomputed metrics of the Metrics tab of the instructor dashboard.
+
+Meant to be run periodically, e.g. from cron, when the ENABLE_PRECOMPUTED_CLASS_DASHBOARD_METRICS feature is on.
+"""
+import logging
+import optparse
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from class_dashboard.dashboard_data import update_course_metrics
+from class_dashboard.models import CourseMetrics
+
+log = logging.getLogger(__name__)
+
+
+#
+# To run from command line: ./manage.py lms update_class_dashboard_metrics --settings=aws [course_id ...]
+#
+class Command(BaseCommand):
+    """Recompute the precomputed metrics of courses"""
+    help = ("Recompute the precomputed metrics of the given courses, or of every course whose metrics are stale. "
+            "The metrics of a course are first computed when it is given, or when it gets any activity.")
+    args = "[<course_id> ...]"
+
+    option_list = BaseCommand.option_list + (
+        optparse.make_option(
+            '--all',
+            action='store_true',
+            default=False,
+            help="Recompute the metrics of every course which has them, stale or not.",
+        ),
+    )
+
+    def handle(self, *args, **options):
+        "Execute the command"
+        try:
+            course_keys = [CourseKey.from_string(arg) for arg in args]
+        except InvalidKeyError as error:
+            raise CommandError(u"Invalid course_key: {}".format(error))
+
+        if not course_keys:
+            course_metrics = CourseMetrics.objects.all()
+            if not options['all']:
+                course_metrics = course_metrics.filter(stale=True)
+            course_keys = [metrics.course_id for metrics in course_metrics.only('course_id')]
+
+        failures = 0
+        for course_key in course_keys:
+            try:
+                update_course_metrics(course_key)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u"Computing the metrics of %s failed", course_key)
+                failures += 1
+            else:
+                log.info(u"Computed the metrics of %s", course_key)
+
+        if failures:
+            raise CommandError(u"Computing the metrics of {} of {} courses failed.".format(failures, len(course_keys)))
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import xmodule_django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseMetrics',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', xmodule_django.models.CourseKeyField(unique=True, max_length=255)),
+                ('outline', models.TextField(default=b'[]')),
+                ('computed', models.DateTimeField(null=True)),
+                ('stale', models.BooleanField(default=True, db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProblemGradeCount',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', xmodule_django.models.CourseKeyField(max_length=255)),
+                ('module_state_key', xmodule_django.models.LocationKeyField(max_length=255)),
+                ('grade', models.FloatField()),
+                ('max_grade', models.FloatField(null=True)),
+                ('count', models.IntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SequentialOpenCount',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', xmodule_django.models.CourseKeyField(max_length=255, db_index=True)),
+                ('module_state_key', xmodule_django.models.LocationKeyField(max_length=255)),
+                ('count', models.IntegerField()),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='problemgradecount',
+            index_together=set([('course_id', 'module_state_key')]),
+        ),
+    ]
@@ -0,0 +1,123 @@
+"""
+Precomputed metrics of the Metrics tab of the instructor dashboard.
+
+The grade distribution of the problems and the number of students who opened each subsection of a
+course are aggregated over all of its StudentModules, which is too slow to do on every page view in
+a big course. When the ENABLE_PRECOMPUTED_CLASS_DASHBOARD_METRICS feature is on, they are computed
+by the update_class_dashboard_metrics management command, which should be run periodically, and
+stored here along with the course's outline. Score changes, newly opened subsections and course
+publishes mark the metrics of their course stale, so the command only recomputes those.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.models import SCORE_CHANGED, StudentModule
+from xmodule.modulestore.django import SignalHandler
+from xmodule_django.models import CourseKeyField, LocationKeyField
+
+# How long a course is remembered to be stale, to avoid marking it so on every score change.
+STALE_CACHE_TIMEOUT = 60 * 60
+
+
+def precomputed_metrics_enabled():
+    """
+    Returns whether the metrics are read from, and kept in, the precomputed tables.
+    """
+    return settings.FEATURES.get('ENABLE_PRECOMPUTED_CLASS_DASHBOARD_METRICS', False)
+
+
+class CourseMetrics(models.Model):
+    """
+    The state of the precomputed metrics of a course.
+    """
+    class Meta(object):
+        app_label = "class_dashboard"
+
+    course_id = CourseKeyField(max_length=255, unique=True)
+
+    # The course's sections, subsections, units and problems, as JSON, see dashboard_data.build_course_outline.
+    outline = models.TextField(default='[]')
+
+    # When the metrics were last computed, or None if they never were.
+    computed = models.DateTimeField(null=True)
+
+    # Whether anything which the metrics count changed since they started being computed.
+    stale = models.BooleanField(default=True, db_index=True)
+
+    @staticmethod
+    def stale_cache_key(course_id):
+        """
+        The cache key remembering that the metrics of the course were marked stale.
+        """
+        return u'class_dashboard.stale.{}'.format(course_id)
+
+    @classmethod
+    def mark_stale(cls, course_id):
+        """
+        Mark the metrics of the course for recomputation, creating its state if need be.
+        """
+        if not cache.add(cls.stale_cache_key(course_id), True, STALE_CACHE_TIMEOUT):
+            return
+        if not cls.objects.filter(course_id=course_id).update(stale=True):
+            cls.objects.get_or_create(course_id=course_id)
+
+    def __unicode__(self):
+        return u'CourseMetrics<{}, computed={}, stale={}>'.format(self.course_id, self.computed, self.stale)
+
+
+class ProblemGradeCount(models.Model):
+    """
+    The number of students who got a grade for a problem.
+    """
+    class Meta(object):
+        app_label = "class_dashboard"
+        index_together = (('course_id', 'module_state_key'),)
+
+    course_id = CourseKeyField(max_length=255)
+    module_state_key = LocationKeyField(max_length=255)
+    grade = models.FloatField()
+    max_grade = models.FloatField(null=True)
+    count = models.IntegerField()
+
+
+class SequentialOpenCount(models.Model):
+    """
+    The number of students who opened a subsection.
+    """
+    class Meta(object):
+        app_label = "class_dashboard"
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255)
+    count = models.IntegerField()
+
+
+@receiver(SCORE_CHANGED)
+def _listen_for_score_change(sender, course_id, **kwargs):  # pylint: disable=unused-argument
+    """
+    Marks the metrics of the course stale when a student's score changes.
+    """
+    if precomputed_metrics_enabled():
+        CourseMetrics.mark_stale(CourseKey.from_string(course_id))
+
+
+@receiver(post_save, sender=StudentModule)
+def _listen_for_student_module_creation(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Marks the metrics of the course stale when a student opens a subsection for the first time.
+    """
+    if created and instance.module_type == 'sequential' and precomputed_metrics_enabled():
+        CourseMetrics.mark_stale(instance.course_id)
+
+
+@receiver(SignalHandler.course_published)
+def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Marks the metrics of the course stale when it is published, as its outline may have changed.
+    """
+    if precomputed_metrics_enabled():
+        CourseMetrics.mark_stale(course_key)
@@ -4,6 +4,7 @@ Tests for class dashboard (Metrics tab in instructor dashboard)
 
 import json
 
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
 from django.test.client import RequestFactory
 from mock import patch
@@ -12,7 +13,7 @@ from nose.plugins.attrib import attr
 from capa.tests.response_xml_factory import StringResponseXMLFactory
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory, AdminFactory
-from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, check_mongo_calls
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 
 from class_dashboard.dashboard_data import (
@@ -21,7 +22,9 @@ from class_dashboard.dashboard_data import (
     get_d3_sequential_open_distrib, get_d3_section_grade_distrib,
     get_section_display_name, get_array_section_has_problem,
     get_students_opened_subsection, get_students_problem_grades,
+    update_course_metrics,
 )
+from class_dashboard.models import CourseMetrics
 from class_dashboard.views import has_instructor_access_for_class
 
 USER_COUNT = 11
@@ -323,3 +326,40 @@ class TestGetProblemGradeDistribution(SharedModuleStoreTestCase):
         """
         ret_val = bool(has_instructor_access_for_class(self.instructor, self.course.id))
         self.assertEquals(ret_val, True)
+
+
+@attr('shard_1')
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_PRECOMPUTED_CLASS_DASHBOARD_METRICS': True})
+class TestPrecomputedProblemGradeDistribution(TestGetProblemGradeDistribution):
+    """
+    Runs the tests of class_dashboard/dashboard_data.py against the precomputed metrics
+    """
+    def setUp(self):
+        super(TestPrecomputedProblemGradeDistribution, self).setUp()
+        update_course_metrics(self.course.id)
+
+    def test_outline_without_modulestore(self):
+        """
+        The course's outline is read from its precomputed metrics
+        """
+        with check_mongo_calls(0):
+            self.assertEquals(
+                get_section_display_name(self.course.id),
+                [u"test factory section omega \u03a9"],
+            )
+
+    def test_stale_until_recomputed(self):
+        """
+        Changes mark the metrics stale, and are counted once they are recomputed
+        """
+        StudentModuleFactory.create(
+            course_id=self.course.id,
+            module_type='sequential',
+            module_state_key=self.sub_section.location,
+        )
+        self.assertTrue(CourseMetrics.objects.get(course_id=self.course.id).stale)
+        self.assertNotIn(self.sub_section.location, get_sequential_open_distrib(self.course.id))
+
+        call_command('update_class_dashboard_metrics')
+        self.assertFalse(CourseMetrics.objects.get(course_id=self.course.id).stale)
+        self.assertEquals(1, get_sequential_open_distrib(self.course.id)[self.sub_section.location])
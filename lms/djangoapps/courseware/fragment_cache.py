@@ -0,0 +1,101 @@
+"""
+A cache of the rendered, wrapped views of XBlocks whose output depends only on their content.
+
+A block declares that a view can be cached by decorating it with `@XBlock.supports("cacheable")`
+(or by answering `has_support(view, "cacheable")`). Such a view must not depend on the user's state
+or identity, nor on the block's children. Its fragment, once wrapped by the runtime, is cached under
+the block's version, the view, the render context and the scope of the runtime's wrappers, so the
+rendering, wrapping and URL rewriting are skipped for every later request.
+"""
+import hashlib
+
+import dogstats_wrapper as dog_stats_api
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+from xblock.fragment import Fragment
+
+# The functionality a view declares with `XBlock.supports` to have its output cached.
+CACHEABLE = 'cacheable'
+
+# Stands in the cached content for the request token of the request which rendered it.
+REQUEST_TOKEN_PLACEHOLDER = u'%%XBLOCK_REQUEST_TOKEN%%'
+
+DEFAULT_TIMEOUT = 60 * 60
+# Fragments bigger than this many characters aren't cached.
+DEFAULT_MAX_SIZE = 100 * 1024
+
+METRIC_NAME = 'lms.courseware.fragment_cache'
+
+
+def _block_version(block):
+    """
+    The time of the last change to `block`, or None if its modulestore doesn't record it.
+    """
+    # XModules are rendered as themselves, but it's their descriptors which know about their edits
+    return getattr(getattr(block, 'descriptor', block), 'edited_on', None)
+
+
+class FragmentCache(object):
+    """
+    Caches the fragments rendered by the runtime of one user's request.
+    """
+    def __init__(self, scope, request_token):
+        """
+        Arguments:
+            scope (unicode): Identifies everything other than the block, the view and the render
+                context which the runtime's wrappers depend on, such as the course.
+            request_token (str): The token of the request, which the wrapped fragments contain
+                and which is replaced in them by the current one's when they are reused.
+        """
+        self.scope = scope
+        self.request_token = request_token
+        self.timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+        self.max_size = getattr(settings, 'FRAGMENT_CACHE_MAX_SIZE', DEFAULT_MAX_SIZE)
+
+    @staticmethod
+    def is_cacheable(block, view_name):
+        """
+        Returns whether `view_name` of `block` declares its output cacheable, and `block` has a version to key it by.
+        """
+        view = getattr(block, view_name, None)
+        if view is None or _block_version(block) is None:
+            return False
+        return block.has_support(view, CACHEABLE)
+
+    def key(self, block, view_name, context):
+        """
+        Returns the cache key of the fragment of `view_name` of `block` rendered with `context`.
+        """
+        context_fingerprint = sorted((unicode(name), unicode(value)) for name, value in (context or {}).iteritems())
+        key = u'|'.join([
+            self.scope,
+            unicode(block.scope_ids.usage_id),
+            _block_version(block).isoformat(),
+            view_name,
+            translation.get_language() or u'',
+            repr(context_fingerprint),
+        ])
+        return u'fragment_cache.{}'.format(hashlib.md5(key.encode('utf-8')).hexdigest())
+
+    def get(self, key):
+        """
+        Returns the fragment cached under `key`, for this request, or None.
+        """
+        pods = cache.get(key)
+        dog_stats_api.increment(METRIC_NAME, tags=['result:{}'.format('hit' if pods is not None else 'miss')])
+        if pods is None:
+            return None
+        pods['content'] = pods['content'].replace(REQUEST_TOKEN_PLACEHOLDER, self.request_token)
+        return Fragment.from_pods(pods)
+
+    def set(self, key, fragment):
+        """
+        Cache `fragment` under `key`, unless it is too big.
+        """
+        if len(fragment.content) > self.max_size:
+            dog_stats_api.increment(METRIC_NAME, tags=['result:too_big'])
+            return
+        pods = fragment.to_pods()
+        pods['content'] = pods['content'].replace(self.request_token, REQUEST_TOKEN_PLACEHOLDER)
+        cache.set(key, pods, self.timeout)
@@ -1,6 +1,6 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
-from collections import defaultdict
+from collections import Counter, defaultdict
 from functools import partial
 import json
 import random
@@ -22,16 +22,18 @@ from util.module_utils import yield_dynamic_descriptor_descendants
 from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
-from xmodule.modulestore.exceptions import ItemNotFoundError
 from .models import StudentModule
 from .module_render import get_module_for_descriptor
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
 
 
 log = logging.getLogger("edx.courseware")
 
+# The number of StudentModule entries read at a time for the answer distribution report.
+ANSWER_DISTRIBUTION_CHUNK_SIZE = 1000
+
 
 class MaxScoresCache(object):
     """
@@ -202,7 +204,7 @@ def field_data_cache_for_grading(course, user):
     )
 
 
-def answer_distributions(course_key):
+def answer_distributions(course_key, chunk_size=ANSWER_DISTRIBUTION_CHUNK_SIZE):
     """
     Given a course_key, return answer distributions in the form of a dictionary
     mapping:
@@ -229,70 +231,106 @@ def answer_distributions(course_key):
     not be aware of problems that are not visible to the user being used to
     generate the report.
 
+    The entries are read `chunk_size` at a time, and only the counts of their
+    answers are kept, so the memory used doesn't grow with the number of
+    submissions.
+
     This method will try to use a read-replica database if one is available.
     """
-    # dict: { module.module_state_key : (url_name, display_name) }
-    state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
+    # dict: { problem url_name : display_name }, for all the problems in the course
+    store = modulestore()
+    with store.bulk_operations(course_key):
+        problem_names = {
+            problem.url_name: problem.display_name_with_default
+            for problem in store.get_items(course_key, qualifiers={'category': 'problem'})
+        }
 
-    def url_and_display_name(usage_key):
-        """
-        For a given usage_key, return the problem's url and display_name.
-        Handle modulestore access and caching. This method ignores permissions.
+    # Count the answers to each part of each problem, keyed by the url_name of the problem
+    answer_counts_by_url = defaultdict(lambda: defaultdict(int))
 
-        Raises:
-            InvalidKeyError: if the usage_key does not parse
-            ItemNotFoundError: if there is no content that corresponds
-                to this usage_key.
+    def merge_counts(chunk_counts):
+        """
+        Add the counts of one chunk of entries to the answer counts.
         """
-        problem_store = modulestore()
-        if usage_key not in state_keys_to_problem_info:
-            problem = problem_store.get_item(usage_key)
-            problem_info = (problem.url_name, problem.display_name_with_default)
-            state_keys_to_problem_info[usage_key] = problem_info
+        answer_counts, unparsable_ids = chunk_counts
+        for module_id in unparsable_ids:
+            log.error(
+                u"Answer Distribution: Could not parse module state or key for StudentModule id=%s, course=%s",
+                module_id,
+                course_key,
+            )
+        for (url, problem_part_id, answer), count in answer_counts.iteritems():
+            answer_counts_by_url[url][(problem_part_id, answer)] += count
 
-        return state_keys_to_problem_info[usage_key]
+    for chunk in _submitted_problem_chunks(course_key, chunk_size):
+        merge_counts(_count_answers(chunk))
 
-    # Iterate through all problems submitted for this course in no particular
-    # order, and build up our answer_counts dict that we will eventually return
     answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_key):
-        try:
-            state_dict = json.loads(module.state) if module.state else {}
-            raw_answers = state_dict.get("student_answers", {})
-        except ValueError:
-            log.error(
-                u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
-                module.id,
+    for url, counts in answer_counts_by_url.iteritems():
+        if url not in problem_names:
+            log.warning(
+                u"Answer Distribution: Problem %s referenced in StudentModule in course %s not found; "
+                u"This can happen if a student answered a question that was later deleted from the course. "
+                u"These answers will be omitted from the answer distribution CSV.",
+                url,
                 course_key,
             )
             continue
+        for (problem_part_id, answer), count in counts.iteritems():
+            answer_counts[(url, problem_names[url], problem_part_id)][answer] += count
 
+    return answer_counts
+
+
+def _submitted_problem_chunks(course_key, chunk_size):
+    """
+    Yields the submitted problem entries for the course, as lists of at most `chunk_size`
+    (StudentModule id, module_state_key string, state) tuples, reading one chunk at a time.
+    """
+    submitted_problems = StudentModule.all_submitted_problems_read_only(course_key).order_by('id')
+    last_id = None
+    while True:
+        chunk_query = submitted_problems if last_id is None else submitted_problems.filter(id__gt=last_id)
+        chunk = [
+            (module_id, unicode(module_state_key), state)
+            for module_id, module_state_key, state
+            in chunk_query.values_list('id', 'module_state_key', 'state')[:chunk_size]
+        ]
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1][0]
+
+
+def _count_answers(chunk):
+    """
+    Counts the answers in a chunk of submitted problem entries, as yielded by `_submitted_problem_chunks`.
+
+    Returns:
+        a Counter of (problem url_name, problem part id, answer) tuples, and a list of the ids
+        of the entries whose key or state could not be parsed.
+    """
+    answer_counts = Counter()
+    unparsable_ids = []
+    for module_id, module_state_key, state in chunk:
         try:
-            url, display_name = url_and_display_name(module.module_state_key.map_into_course(course_key))
-            # Each problem part has an ID that is derived from the
-            # module.module_state_key (with some suffix appended)
-            for problem_part_id, raw_answer in raw_answers.items():
-                # Convert whatever raw answers we have (numbers, unicode, None, etc.)
-                # to be unicode values. Note that if we get a string, it's always
-                # unicode and not str -- state comes from the json decoder, and that
-                # always returns unicode for strings.
-                answer = unicode(raw_answer)
-                answer_counts[(url, display_name, problem_part_id)][answer] += 1
-
-        except (ItemNotFoundError, InvalidKeyError):
-            msg = (
-                "Answer Distribution: Item {} referenced in StudentModule {} " +
-                "for user {} in course {} not found; " +
-                "This can happen if a student answered a question that " +
-                "was later deleted from the course. This answer will be " +
-                "omitted from the answer distribution CSV."
-            ).format(
-                module.module_state_key, module.id, module.student_id, course_key
-            )
-            log.warning(msg)
+            url = UsageKey.from_string(module_state_key).block_id
+            state_dict = json.loads(state) if state else {}
+            raw_answers = state_dict.get("student_answers", {})
+        except (InvalidKeyError, ValueError):
+            unparsable_ids.append(module_id)
             continue
 
-    return answer_counts
+        # Each problem part has an ID that is derived from the
+        # module.module_state_key (with some suffix appended)
+        for problem_part_id, raw_answer in raw_answers.items():
+            # Convert whatever raw answers we have (numbers, unicode, None, etc.)
+            # to be unicode values. Note that if we get a string, it's always
+            # unicode and not str -- state comes from the json decoder, and that
+            # always returns unicode for strings.
+            answer_counts[(url, problem_part_id, unicode(raw_answer))] += 1
+
+    return answer_counts, unparsable_ids
 
 
 def grade(student, request, course, keep_raw_scores=False, field_data_cache=None, scores_client=None):
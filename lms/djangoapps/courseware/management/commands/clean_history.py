@@ -45,6 +45,12 @@ class Command(NoArgsCommand):
             default=0,
             help="Seconds to sleep between batches.",
         ),
+        optparse.make_option(
+            '--keep',
+            type='int',
+            default=0,
+            help="Also delete all but this many of the latest rows for each student module (0 to keep them all).",
+        ),
     )
 
     def handle_noargs(self, **options):
@@ -53,6 +59,7 @@ class Command(NoArgsCommand):
 
         smhc = StudentModuleHistoryCleaner(
             dry_run=options["dry_run"],
+            keep=options["keep"],
         )
         smhc.main(batch_size=options["batch"], sleep=options["sleep"])
 
@@ -64,8 +71,9 @@ class StudentModuleHistoryCleaner(object):
     STATE_FILE = "clean_history.json"
     BATCH_SIZE = 100
 
-    def __init__(self, dry_run=False):
+    def __init__(self, dry_run=False, keep=0):
         self.dry_run = dry_run
+        self.keep = keep
         self.next_student_module_id = 0
         self.last_student_module_id = 0
 
@@ -210,6 +218,12 @@ class StudentModuleHistoryCleaner(object):
 
             next_created = created
 
+        if self.keep:
+            # Of the rows left, only keep the latest `keep`.
+            ids_to_delete_set = set(ids_to_delete)
+            remaining = [history_id for history_id, __ in history if history_id not in ids_to_delete_set]
+            ids_to_delete.extend(remaining[:-self.keep])
+
         verb = "Would have deleted" if self.dry_run else "Deleting"
         self.say("{verb} {to_delete} rows of {total} for student_module_id {id}".format(
             verb=verb,
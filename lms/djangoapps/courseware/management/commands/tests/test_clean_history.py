@@ -209,6 +209,19 @@ class HistoryCleanerNoDbTest(HistoryCleanerTest):
         self.assert_said(smhc, "Deleting 4 rows of 8 for student_module_id 17")
         smhc.delete_history.assert_called_once_with([42, 23, 15, 8])
 
+    def test_keep_latest_rows(self):
+        smhc = SmhcDbMocked(keep=2)
+        smhc.set_rows([
+            (4, "2013-07-13 16:30:00.000"),
+            (8, "2013-07-13 16:30:01.100"),
+            (16, "2013-07-13 16:30:01.300"),
+            (98, "2013-07-13 16:30:02.600"),    # keep
+            (99, "2013-07-13 16:30:59.000"),    # keep
+        ])
+        smhc.clean_one_student_module(17)
+        self.assert_said(smhc, "Deleting 3 rows of 5 for student_module_id 17")
+        smhc.delete_history.assert_called_once_with([8, 4, 16])
+
 
 @attr('shard_1')
 class HistoryCleanerWitDbTest(HistoryCleanerTest):
@@ -2,10 +2,12 @@
 Middleware for the courseware app
 """
 
+from django.db import connections, router
 from django.shortcuts import redirect
 from django.core.urlresolvers import reverse
 
 from courseware.courses import UserNotEnrolled
+from courseware.models import StudentModule, StudentModuleHistory
 
 
 class RedirectUnenrolledMiddleware(object):
@@ -22,3 +24,37 @@ class RedirectUnenrolledMiddleware(object):
                     args=[course_key.to_deprecated_string()]
                 )
             )
+
+
+class StudentModuleHistoryMiddleware(object):
+    """
+    Buffer the StudentModuleHistory entries created during a request, and save them
+    all at once when its response is returned.
+
+    The entries of a request which fails are dropped if its view ran in a transaction, as the
+    changes to the student modules they record were rolled back with it. Otherwise, as in the
+    views which are `transaction.non_atomic_requests`, those changes are already committed,
+    so the entries are saved.
+    """
+    def process_request(self, _request):
+        StudentModuleHistory.start_buffering()
+
+    def process_view(self, request, view_func, _view_args, _view_kwargs):
+        """
+        Record whether the view runs in a transaction of the student modules' database.
+        """
+        db_alias = router.db_for_write(StudentModule)
+        request.student_module_history_atomic = bool(
+            connections[db_alias].settings_dict.get('ATOMIC_REQUESTS') and
+            db_alias not in getattr(view_func, '_non_atomic_requests', set())
+        )
+
+    def process_response(self, _request, response):
+        StudentModuleHistory.flush_buffer()
+        return response
+
+    def process_exception(self, request, _exception):
+        if getattr(request, 'student_module_history_atomic', False):
+            StudentModuleHistory.discard_buffer()
+        else:
+            StudentModuleHistory.flush_buffer()
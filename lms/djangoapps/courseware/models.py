@@ -22,6 +22,7 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver, Signal
 
 from model_utils.models import TimeStampedModel
+from request_cache.middleware import RequestCache
 from student.models import user_by_anonymous_id
 from submissions.models import score_set, score_reset
 
@@ -168,6 +169,9 @@ class StudentModuleHistory(CallStackMixin, models.Model):
     objects = CallStackManager()
     HISTORY_SAVING_TYPES = {'problem'}
 
+    # The request cache key of the history entries buffered during a request.
+    BUFFER_CACHE_KEY = 'courseware.student_module_history'
+
     class Meta(object):
         app_label = "courseware"
         get_latest_by = "created"
@@ -195,7 +199,35 @@ class StudentModuleHistory(CallStackMixin, models.Model):
                                                  state=instance.state,
                                                  grade=instance.grade,
                                                  max_grade=instance.max_grade)
-            history_entry.save()
+            buffered_entries = RequestCache.get_request_cache().data.get(StudentModuleHistory.BUFFER_CACHE_KEY)
+            if buffered_entries is None:
+                history_entry.save()
+            else:
+                buffered_entries.append(history_entry)
+
+    @classmethod
+    def start_buffering(cls):
+        """
+        Buffer the history entries created from now until the end of the current request,
+        instead of saving each of them as it is created.
+        """
+        RequestCache.get_request_cache().data[cls.BUFFER_CACHE_KEY] = []
+
+    @classmethod
+    def flush_buffer(cls):
+        """
+        Save the buffered history entries in a single query, in the order they were created, and stop buffering.
+        """
+        buffered_entries = RequestCache.get_request_cache().data.pop(cls.BUFFER_CACHE_KEY, None)
+        if buffered_entries:
+            cls.objects.bulk_create(buffered_entries)
+
+    @classmethod
+    def discard_buffer(cls):
+        """
+        Drop the buffered history entries, and stop buffering.
+        """
+        RequestCache.get_request_cache().data.pop(cls.BUFFER_CACHE_KEY, None)
 
 
 class XBlockFieldBase(models.Model):
@@ -5,6 +5,7 @@ Module rendering
 import hashlib
 import json
 import logging
+import sys
 
 import static_replace
 
@@ -69,7 +70,6 @@ from xmodule.contentstore.django import contentstore
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
 from xmodule.exceptions import NotFoundError, ProcessingError
 from xmodule.modulestore.django import modulestore, ModuleI18nService
-from xmodule.lti_module import LTIModule
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.x_module import XModuleDescriptor
 from xmodule.mixin import wrap_with_license
@@ -83,6 +83,7 @@ from edx_proctoring.services import ProctoringService
 from openedx.core.djangoapps.credit.services import CreditService
 
 from .field_overrides import OverrideFieldData
+from .fragment_cache import FragmentCache
 
 log = logging.getLogger(__name__)
 
@@ -360,6 +361,16 @@ def get_module_for_descriptor(user, request, descriptor, field_data_cache, cours
     )
 
 
+def _is_lti_module_class(module_class):
+    """
+    Returns whether `module_class` is the LTI XModule's, or a subclass of it.
+
+    The LTI module is only imported once an LTI block is loaded, and until then no module class can be it.
+    """
+    lti_module = sys.modules.get('xmodule.lti_module')
+    return lti_module is not None and issubclass(module_class, lti_module.LTIModule)
+
+
 def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=too-many-statements
                                # Arguments preceding this comment have user binding, those following don't
                                descriptor, course_id, track_function, xqueue_callback_url_prefix,
@@ -611,9 +622,12 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     # Build a list of wrapping functions that will be applied in order
     # to the Fragment content coming out of the xblocks that are about to be rendered.
     block_wrappers = []
+    # Whether any of the wrappers depends on the user, so that the wrapped fragments can't be shared between users
+    user_specific_wrappers = False
 
     if is_masquerading_as_specific_student(user, course_id):
         block_wrappers.append(filter_displayed_blocks)
+        user_specific_wrappers = True
 
     if settings.FEATURES.get("LICENSING", False):
         block_wrappers.append(wrap_with_license)
@@ -674,6 +688,14 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
             instructor_access = bool(has_access(user, 'instructor', descriptor, course_id))
         if staff_access:
             block_wrappers.append(partial(add_staff_markup, user, instructor_access, disable_staff_debug_info))
+            user_specific_wrappers = True
+
+    fragment_cache = None
+    if settings.FEATURES.get('ENABLE_FRAGMENT_CACHE', False) and request_token and not user_specific_wrappers:
+        fragment_cache = FragmentCache(
+            u'{}|{}|{}'.format(course_id, wrap_xmodule_display, static_asset_path or descriptor.static_asset_path),
+            request_token,
+        )
 
     # These modules store data using the anonymous_student_id as a key.
     # To prevent loss of data, we will continue to provide old modules with
@@ -683,7 +705,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     # of modules that get the per-course anonymized id.
     is_pure_xblock = isinstance(descriptor, XBlock) and not isinstance(descriptor, XModuleDescriptor)
     module_class = getattr(descriptor, 'module_class', None)
-    is_lti_module = not is_pure_xblock and issubclass(module_class, LTIModule)
+    is_lti_module = not is_pure_xblock and _is_lti_module_class(module_class)
     if is_pure_xblock or is_lti_module:
         anonymous_student_id = anonymous_id_for_user(user, course_id)
     else:
@@ -749,6 +771,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
         rebind_noauth_module_to_user=rebind_noauth_module_to_user,
         user_location=user_location,
         request_token=request_token,
+        fragment_cache=fragment_cache,
     )
 
     # pass position specified in URL to module through ModuleSystem
@@ -1092,7 +1115,7 @@ def xblock_view(request, course_id, usage_id, view_name):
     Returns a json object containing two keys:
         html: The rendered html of the view
         resources: A list of tuples where the first element is the resource hash, and
-            the second is the resource description
+            the second is the resource description, as a dict of the fields of the FragmentResource
     """
     if not settings.FEATURES.get('ENABLE_XBLOCK_VIEW_ENDPOINT', False):
         log.warn("Attempt to use deactivated XBlock view endpoint -"
@@ -1119,7 +1142,7 @@ def xblock_view(request, course_id, usage_id, view_name):
 
         hashed_resources = OrderedDict()
         for resource in fragment.resources:
-            hashed_resources[hash_resource(resource)] = resource
+            hashed_resources[hash_resource(resource)] = resource._asdict()
 
         return JsonResponse({
             'html': fragment.content,
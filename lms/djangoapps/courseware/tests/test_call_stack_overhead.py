@@ -0,0 +1,66 @@
+"""
+Benchmark of the overhead of the call stack tracking of StudentModule on its saves.
+
+This is skipped unless the CALL_STACK_MANAGER_BENCHMARKS environment variable is set, e.g.:
+
+    CALL_STACK_MANAGER_BENCHMARKS=1 paver test_system -s lms \
+        -t lms/djangoapps/courseware/tests/test_call_stack_overhead.py
+
+The results are appended to the file named by MODULESTORE_BENCHMARK_RESULTS, and two such
+files can be compared with `python -m xmodule.modulestore.perf_tests.benchmark`.
+"""
+import os
+import unittest
+
+import ddt
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from courseware.tests.factories import StudentModuleFactory, location
+from openedx.core.djangoapps.call_stack_manager import core
+from xmodule.modulestore.perf_tests.benchmark import BenchmarkRecorder
+
+# The number of saves timed in each measurement.
+SAVES = 200
+
+
+@ddt.ddt
+@unittest.skipUnless(
+    os.environ.get('CALL_STACK_MANAGER_BENCHMARKS'), "Set CALL_STACK_MANAGER_BENCHMARKS to run benchmarks."
+)
+class CallStackOverheadBenchmark(TestCase):
+    """
+    Times StudentModule.save() with call stack sampling disabled, and at various sample rates.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @classmethod
+    def setUpClass(cls):
+        super(CallStackOverheadBenchmark, cls).setUpClass()
+        cls.recorder = BenchmarkRecorder('call_stack_manager')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.recorder.save()
+        super(CallStackOverheadBenchmark, cls).tearDownClass()
+
+    @ddt.data(0, 0.01, 0.1, 1)
+    @patch('openedx.core.djangoapps.call_stack_manager.core.log')
+    def test_student_module_save(self, sample_rate, __):
+        """
+        Benchmark StudentModule.save() at `sample_rate`.
+        """
+        module = StudentModuleFactory.create(module_state_key=location('benchmark'))
+        self.addCleanup(core.STACK_BOOK.clear)
+
+        def save():
+            """ Save the module repeatedly. """
+            for index in xrange(SAVES):
+                module.state = u'{{"attempts": {}}}'.format(index)
+                module.save()
+
+        with override_settings(CALL_STACK_MANAGER_SAMPLE_RATE=sample_rate):
+            self.recorder.measure('django', 'sample_rate={}'.format(sample_rate), 'StudentModule.save', save)
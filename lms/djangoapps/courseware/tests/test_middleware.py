@@ -3,13 +3,17 @@ Tests for courseware middleware
 """
 
 from django.core.urlresolvers import reverse
+from django.db import connection, transaction
+from django.test import TestCase
 from django.test.client import RequestFactory
-from django.http import Http404
+from django.http import Http404, HttpResponse
 from mock import patch
 from nose.plugins.attrib import attr
 
 import courseware.courses as courses
-from courseware.middleware import RedirectUnenrolledMiddleware
+from courseware.middleware import RedirectUnenrolledMiddleware, StudentModuleHistoryMiddleware
+from courseware.models import StudentModuleHistory
+from courseware.tests.factories import StudentModuleFactory, location
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
@@ -52,3 +56,60 @@ class CoursewareMiddlewareTestCase(ModuleStoreTestCase):
             request, Http404()
         )
         self.assertIsNone(response)
+
+
+@attr('shard_1')
+class StudentModuleHistoryMiddlewareTestCase(TestCase):
+    """Tests that the history of the student modules saved in a request is saved at its end"""
+
+    def setUp(self):
+        super(StudentModuleHistoryMiddlewareTestCase, self).setUp()
+        self.request = RequestFactory().get("dummy_url")
+        self.middleware = StudentModuleHistoryMiddleware()
+
+    def save_student_modules(self):
+        """Save a student module twice, and another once, returning the student modules."""
+        first = StudentModuleFactory.create(module_state_key=location('first'), state='{"attempts": 1}')
+        first.state = '{"attempts": 2}'
+        first.save()
+        second = StudentModuleFactory.create(module_state_key=location('second'), state='{"attempts": 1}')
+        return first, second
+
+    def test_history_saved_at_end_of_request(self):
+        self.middleware.process_request(self.request)
+        first, second = self.save_student_modules()
+        self.assertFalse(StudentModuleHistory.objects.exists())
+
+        with self.assertNumQueries(1):
+            self.middleware.process_response(self.request, HttpResponse())
+        # Every state of each student module is kept, in order
+        self.assertEqual(
+            [(entry.student_module_id, entry.state) for entry in StudentModuleHistory.objects.order_by('id')],
+            [(first.id, '{"attempts": 1}'), (first.id, '{"attempts": 2}'), (second.id, '{"attempts": 1}')]
+        )
+
+    def test_history_discarded_on_exception_in_transaction(self):
+        self.middleware.process_request(self.request)
+        with patch.dict(connection.settings_dict, {'ATOMIC_REQUESTS': True}):
+            self.middleware.process_view(self.request, lambda request: HttpResponse(), (), {})
+        self.save_student_modules()
+        self.middleware.process_exception(self.request, Exception())
+        self.middleware.process_response(self.request, HttpResponse())
+        self.assertFalse(StudentModuleHistory.objects.exists())
+
+    def test_history_saved_on_exception_without_transaction(self):
+        # The changes of the student modules were committed before the view failed
+        self.middleware.process_request(self.request)
+        with patch.dict(connection.settings_dict, {'ATOMIC_REQUESTS': True}):
+            self.middleware.process_view(
+                self.request, transaction.non_atomic_requests(lambda request: HttpResponse()), (), {}
+            )
+        self.save_student_modules()
+        self.middleware.process_exception(self.request, Exception())
+        self.assertEqual(StudentModuleHistory.objects.count(), 3)
+        self.middleware.process_response(self.request, HttpResponse())
+        self.assertEqual(StudentModuleHistory.objects.count(), 3)
+
+    def test_history_saved_outside_request(self):
+        self.save_student_modules()
+        self.assertEqual(StudentModuleHistory.objects.count(), 3)
@@ -9,6 +9,7 @@ from nose.plugins.attrib import attr
 from functools import partial
 
 from bson import ObjectId
+from django.core.cache import cache
 from django.http import Http404, HttpResponse
 from django.core.urlresolvers import reverse
 from django.conf import settings
@@ -37,6 +38,7 @@ from courseware.tests.factories import StudentModuleFactory, UserFactory, Global
 from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.test_submitting_problems import TestSubmittingProblems
 from lms.djangoapps.lms_xblock.runtime import quote_slashes
+from openedx.core.lib.xblock_utils import request_token as xblock_request_token
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from student.models import anonymous_id_for_user
 from xmodule.modulestore.tests.django_utils import (
@@ -597,6 +599,27 @@ class TestHandleXBlockCallback(ModuleStoreTestCase, LoginEnrollmentTestCase):
         doc = PyQuery(content['html'])
         self.assertEquals(len(doc('div.xblock-student_view-videosequence')), 1)
 
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_XBLOCK_VIEW_ENDPOINT': True})
+    def test_xblock_view_handler_resources(self):
+        args = [
+            'edX/toy/2012_Fall',
+            quote_slashes('i4x://edX/toy/videosequence/Toy_Videos'),
+            'student_view'
+        ]
+        request = self.request_factory.get(reverse('xblock_view', args=args))
+        request.user = self.mock_user
+        fragment = Fragment(u'<p>Fragment</p>')
+        fragment.add_css(u'.fragment {}')
+        with patch('xblock.core.XBlock.render', return_value=fragment):
+            response = render.xblock_view(request, *args)
+
+        # The resources are described by their fields, as the javascript loading them expects
+        __, resource = json.loads(response.content)['resources'][0]
+        self.assertEqual(
+            resource,
+            {'kind': 'text', 'data': u'.fragment {}', 'mimetype': 'text/css', 'placement': 'head'}
+        )
+
 
 @attr('shard_1')
 @ddt.ddt
@@ -1021,6 +1044,113 @@ class TestProctoringRendering(ModuleStoreTestCase):
         return None
 
 
+@attr('shard_1')
+class TestLazySequenceTabs(ModuleStoreTestCase):
+    """
+    Tests that a sequence rendered with lazy tabs only renders its active unit.
+    """
+    def setUp(self):
+        super(TestLazySequenceTabs, self).setUp()
+        self.user = UserFactory.create()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {}
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(category='chapter', parent_location=self.course.location)
+        self.sequence = ItemFactory.create(category='sequential', parent_location=chapter.location)
+        self.units = []
+        for index in xrange(3):
+            unit = ItemFactory.create(category='vertical', parent_location=self.sequence.location)
+            ItemFactory.create(category='html', parent_location=unit.location, data=u'<p>Unit {}</p>'.format(index))
+            self.units.append(unit)
+        ItemFactory.create(category='problem', parent_location=self.units[2].location)
+
+    def render_sequence(self, position, lazy_tabs):
+        """
+        Render the sequence at `position`, returning its content.
+        """
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.course.id, self.user, self.sequence, depth=2
+        )
+        module = render.get_module(
+            self.user, self.request, self.sequence.location, field_data_cache, position=position
+        )
+        return module.render(STUDENT_VIEW, {'lazy_tabs': lazy_tabs}).content
+
+    def test_all_tabs_rendered(self):
+        content = self.render_sequence(2, lazy_tabs=False)
+        for index in xrange(3):
+            self.assertIn(u'Unit {}'.format(index), content)
+        self.assertNotIn('data-content-url', content)
+
+    def test_lazy_tabs(self):
+        content = self.render_sequence(2, lazy_tabs=True)
+        self.assertIn(u'Unit 1', content)
+        self.assertNotIn(u'Unit 0', content)
+        self.assertNotIn(u'Unit 2', content)
+
+        doc = PyQuery(content)
+        for index in (0, 2):
+            self.assertEqual(
+                doc('#seq_contents_{}'.format(index)).attr('data-content-url'),
+                reverse('xblock_view', args=[
+                    unicode(self.course.id),
+                    quote_slashes(unicode(self.units[index].location)),
+                    STUDENT_VIEW,
+                ])
+            )
+        self.assertIsNone(doc('#seq_contents_1').attr('data-content-url'))
+        # The unrendered tabs are still described by the types of their children
+        self.assertEqual(len(doc('#tab_2.seq_problem')), 1)
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_FRAGMENT_CACHE': True})
+class TestFragmentCache(ModuleStoreTestCase):
+    """
+    Tests that the views of blocks which declare them cacheable are rendered once for all requests.
+    """
+    def setUp(self):
+        super(TestFragmentCache, self).setUp()
+        cache.clear()
+        self.user = UserFactory.create()
+        self.course = CourseFactory.create()
+
+    def render_html(self, descriptor):
+        """
+        Render the student view of `descriptor` in a new request, returning the request's token and the content.
+        """
+        request = RequestFactory().get('/')
+        request.user = self.user
+        request.session = {}
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, self.user, descriptor)
+        module = render.get_module(self.user, request, descriptor.location, field_data_cache)
+        return xblock_request_token(request), module.render(STUDENT_VIEW).content
+
+    def test_cached_between_requests(self):
+        descriptor = ItemFactory.create(category='html', parent_location=self.course.location, data='<p>Cached</p>')
+        first_token, first_content = self.render_html(descriptor)
+        with patch('xmodule.html_module.HtmlModule.get_html') as get_html:
+            second_token, second_content = self.render_html(descriptor)
+            self.assertFalse(get_html.called)
+        self.assertNotEqual(first_token, second_token)
+        self.assertEqual(first_content.replace(first_token, second_token), second_content)
+
+        # Changing the block changes its version, so the cached fragment isn't used
+        descriptor.data = '<p>Changed</p>'
+        self.store.update_item(descriptor, self.user.id)
+        __, changed_content = self.render_html(self.store.get_item(descriptor.location))
+        self.assertIn('Changed', changed_content)
+
+    def test_user_id_not_cached(self):
+        descriptor = ItemFactory.create(
+            category='html', parent_location=self.course.location, data='<p>%%USER_ID%%</p>'
+        )
+        self.render_html(descriptor)
+        with patch('xmodule.html_module.HtmlModule.get_html', return_value='') as get_html:
+            self.render_html(descriptor)
+            self.assertTrue(get_html.called)
+
+
 @attr('shard_1')
 @ddt.ddt
 class TestHtmlModifiers(ModuleStoreTestCase):
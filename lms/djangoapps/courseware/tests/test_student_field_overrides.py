@@ -0,0 +1,75 @@
+"""
+Tests for the individual due dates of `student_field_overrides`.
+"""
+import datetime
+
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from django.utils.timezone import utc
+from nose.plugins.attrib import attr
+
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, TEST_DATA_SPLIT_MODULESTORE
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+from ..field_overrides import OverrideFieldData
+from ..model_data import FieldDataCache
+from ..module_render import get_module_for_descriptor
+from ..student_field_overrides import override_field_for_user
+
+
+@attr('shard_1')
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.student_field_overrides.IndividualStudentOverrideProvider',))
+class IndividualDueDateTests(ModuleStoreTestCase):
+    """
+    Tests that a due date extended for one student is inherited by the blocks of that student only.
+    """
+    MODULESTORE = TEST_DATA_SPLIT_MODULESTORE
+
+    def setUp(self):
+        super(IndividualDueDateTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+
+        self.due = datetime.datetime(2010, 5, 12, 2, 42, tzinfo=utc)
+        self.extended = datetime.datetime(2013, 12, 25, 0, 0, tzinfo=utc)
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=self.course, category='chapter', due=self.due)
+        sequential = ItemFactory.create(parent=chapter, category='sequential')
+        ItemFactory.create(parent=sequential, category='problem')
+
+        self.extended_user = UserFactory.create()
+        self.other_user = UserFactory.create()
+        override_field_for_user(self.extended_user, chapter, 'due', self.extended)
+
+    def tearDown(self):
+        super(IndividualDueDateTests, self).tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def get_problem(self, user, course):
+        """
+        Binds the course to user, and returns the problem, bound through its chapter and sequential.
+        """
+        request = RequestFactory().get('/')
+        request.user = user
+        request.session = {}
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, user, course, depth=None)
+        block = get_module_for_descriptor(user, request, course, field_data_cache, self.course.id, course=course)
+        for __ in range(3):
+            block = block.get_children()[0]
+        return block
+
+    def test_extension_not_inherited_by_other_users(self):
+        # The blocks of both students are loaded by the same runtime, and so share its inherited values.
+        extended_course = self.store.get_course(self.course.id, depth=None)
+        other_course = self.store.get_course(self.course.id, depth=None)
+        self.assertIs(extended_course.runtime, other_course.runtime)
+
+        extended_problem = self.get_problem(self.extended_user, extended_course)
+        self.assertEqual(extended_problem.due, self.extended)
+        # Reading a field the problem inherits, but which isn't overridden, fills the table with the
+        # values its ancestors pass down, as bound to the student.
+        self.assertFalse(extended_problem.graded)
+
+        other_problem = self.get_problem(self.other_user, other_course)
+        self.assertEqual(other_problem.due, self.due)
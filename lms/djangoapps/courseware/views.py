@@ -509,7 +509,14 @@ def _index_bulk_op(request, course_key, chapter, section, position):
 
             # Save where we are in the chapter.
             save_child_position(chapter_module, section)
-            section_render_context = {'activate_block_id': request.GET.get('activate_block_id')}
+            section_render_context = {
+                'activate_block_id': request.GET.get('activate_block_id'),
+                # only render the sequence's active tab, the others are fetched from the xblock_view API
+                'lazy_tabs': (
+                    settings.FEATURES.get('ENABLE_LAZY_SEQUENCE_TABS', False) and
+                    settings.FEATURES.get('ENABLE_XBLOCK_VIEW_ENDPOINT', False)
+                ),
+            }
             context['fragment'] = section_module.render(STUDENT_VIEW, section_render_context)
             context['section_title'] = section_descriptor.display_name_with_default
         else:
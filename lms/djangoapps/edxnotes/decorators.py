@@ -54,5 +54,18 @@ def edxnotes(cls):
                 },
             })
 
+    original_has_support = cls.has_support
+
+    def has_support(self, view, functionality):
+        """
+        The annotated html embeds a token for the user, so can't be reused for other users.
+        """
+        if functionality == "cacheable":
+            course = self.descriptor.runtime.modulestore.get_course(self.runtime.course_id)
+            if is_feature_enabled(course):
+                return False
+        return original_has_support(self, view, functionality)
+
     cls.get_html = get_html
+    cls.has_support = has_support
     return cls
@@ -6,13 +6,22 @@ Does not include any access control, be sure to check access before calling.
 
 import json
 import logging
+from collections import OrderedDict
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.urlresolvers import reverse
 from django.core.mail import send_mail
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
 from django.utils.translation import override as override_language
 
-from student.models import CourseEnrollment, CourseEnrollmentAllowed
+from django_comment_common.models import assign_default_role_to_users
+from student.models import (
+    CourseEnrollment, CourseEnrollmentAllowed, ManualEnrollmentAudit,
+    ALLOWEDTOENROLL_TO_ENROLLED, ENROLLED_TO_ENROLLED, UNENROLLED_TO_ALLOWEDTOENROLL, UNENROLLED_TO_ENROLLED,
+)
 from courseware.models import StudentModule
 from edxmako.shortcuts import render_to_string
 from lang_pref import LANGUAGE_KEY
@@ -28,6 +37,9 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 
 log = logging.getLogger(__name__)
 
+# The number of students enrolled at once by `bulk_enroll_identifiers`.
+BULK_ENROLLMENT_BATCH_SIZE = 500
+
 
 class EmailEnrollmentState(object):
     """ Store the complete enrollment state of an email in a class """
@@ -54,6 +66,20 @@ class EmailEnrollmentState(object):
         self.full_name = full_name
         self.mode = mode
 
+    @classmethod
+    def from_values(cls, user, enrollment, allowed, auto_enroll, full_name=None, mode=None):
+        """
+        Returns the state with the given values, rather than looking them up.
+        """
+        state = cls.__new__(cls)
+        state.user = user
+        state.enrollment = enrollment
+        state.allowed = allowed
+        state.auto_enroll = bool(auto_enroll)
+        state.full_name = full_name
+        state.mode = mode
+        return state
+
     def __repr__(self):
         return "{}(user={}, enrollment={}, allowed={}, auto_enroll={})".format(
             self.__class__.__name__,
@@ -168,6 +194,159 @@ def unenroll_email(course_id, student_email, email_students=False, email_params=
     return previous_state, after_state
 
 
+def _users_by_identifier(identifiers):
+    """
+    Looks up the users with the given emails or usernames at once, as `get_student_from_identifier` would each.
+
+    Returns a dict mapping each lowercased identifier which matched a user to that user.
+    """
+    emails = [identifier for identifier in identifiers if '@' in identifier]
+    usernames = [identifier for identifier in identifiers if '@' not in identifier]
+    users = {}
+    for user in User.objects.filter(Q(email__in=emails) | Q(username__in=usernames)).select_related('profile'):
+        users[user.email.lower()] = user
+        users[user.username.lower()] = user
+    return users
+
+
+def _full_name(user):
+    """
+    The full name in the profile of `user`, or None if they have no profile.
+    """
+    try:
+        return user.profile.name
+    except ObjectDoesNotExist:
+        return None
+
+
+def bulk_enroll_identifiers(course_id, identifiers, auto_enroll=False, email_students=False, email_params=None,
+                            enrolled_by=None, reason=None, batch_size=BULK_ENROLLMENT_BATCH_SIZE):
+    """
+    Enroll the students with the given emails or usernames, as `enroll_email` would each, a batch at a time.
+
+    The users of each batch are looked up, and their enrollments, enrollment allowances and manual
+    enrollment audits created or updated, with a few queries for the whole batch.
+
+    `identifiers` is a list of emails and/or usernames.
+    `auto_enroll`, `email_students` and `email_params` are as for `enroll_email`.
+    `enrolled_by` and `reason` are recorded in the ManualEnrollmentAudit of each student.
+
+    Yields a list for each batch, with a dict for each of its identifiers with either:
+        'identifier', and 'before' and 'after', the `EmailEnrollmentState.to_dict` of the student
+            before and after the action, or
+        'identifier' and 'invalidIdentifier': True, if it isn't a user nor a valid email.
+    """
+    for start in xrange(0, len(identifiers), batch_size):
+        yield _bulk_enroll_batch(
+            course_id, identifiers[start:start + batch_size], auto_enroll, email_students, email_params,
+            enrolled_by, reason
+        )
+
+
+def _bulk_enroll_batch(course_id, identifiers, auto_enroll, email_students, email_params, enrolled_by, reason):
+    """
+    Enroll a batch of students for `bulk_enroll_identifiers`, and returns their results.
+    """
+    users_by_identifier = _users_by_identifier(identifiers)
+
+    # The email of each valid identifier, and the user with that email if there is one.
+    results = []
+    students = OrderedDict()
+    for identifier in identifiers:
+        user = users_by_identifier.get(identifier.lower())
+        email = user.email if user else identifier
+        try:
+            validate_email(email)
+        except ValidationError:
+            results.append({'identifier': identifier, 'invalidIdentifier': True})
+        else:
+            results.append({'identifier': identifier, 'email': email})
+            students[email] = user
+
+    users = [student for student in students.itervalues() if student is not None]
+    # Keyed by lowercased email, as emails are looked up case insensitively
+    allowed = {
+        cea.email.lower(): cea
+        for cea in CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=students.keys())
+    }
+    enrolled_user_ids = set(
+        CourseEnrollment.objects.filter(course_id=course_id, user__in=users, is_active=True).values_list(
+            'user_id', flat=True
+        )
+    )
+    before = {
+        student_email: EmailEnrollmentState.from_values(
+            user=student is not None,
+            enrollment=student is not None and student.id in enrolled_user_ids,
+            allowed=student_email.lower() in allowed,
+            auto_enroll=student_email.lower() in allowed and allowed[student_email.lower()].auto_enroll,
+        )
+        for student_email, student in students.iteritems()
+    }
+
+    with transaction.atomic():
+        enrollments = CourseEnrollment.bulk_enroll(users, course_id)
+        assign_default_role_to_users(course_id, users)
+
+        # Students without accounts are allowed to enroll instead
+        allowed_emails = [student_email for student_email, student in students.iteritems() if student is None]
+        CourseEnrollmentAllowed.objects.filter(
+            course_id=course_id,
+            email__in=[allowed_email for allowed_email in allowed_emails if allowed_email.lower() in allowed],
+        ).exclude(auto_enroll=auto_enroll).update(auto_enroll=auto_enroll)
+        CourseEnrollmentAllowed.objects.bulk_create([
+            CourseEnrollmentAllowed(course_id=course_id, email=allowed_email, auto_enroll=auto_enroll)
+            for allowed_email in allowed_emails if allowed_email.lower() not in allowed
+        ])
+
+        after = {}
+        audits = []
+        for email, user in students.iteritems():
+            if user is not None:
+                after[email] = EmailEnrollmentState.from_values(
+                    user=True, enrollment=True, allowed=before[email].allowed, auto_enroll=before[email].auto_enroll,
+                )
+                if before[email].enrollment:
+                    state_transition = ENROLLED_TO_ENROLLED
+                elif before[email].allowed:
+                    state_transition = ALLOWEDTOENROLL_TO_ENROLLED
+                else:
+                    state_transition = UNENROLLED_TO_ENROLLED
+            else:
+                after[email] = EmailEnrollmentState.from_values(
+                    user=False, enrollment=False, allowed=True, auto_enroll=auto_enroll,
+                )
+                state_transition = UNENROLLED_TO_ALLOWEDTOENROLL
+            audits.append(ManualEnrollmentAudit(
+                enrolled_by=enrolled_by,
+                enrolled_email=email,
+                state_transition=state_transition,
+                reason=reason,
+                enrollment=enrollments.get(user.id) if user is not None else None,
+            ))
+        ManualEnrollmentAudit.objects.bulk_create(audits)
+
+    if email_students:
+        languages = dict(
+            UserPreference.objects.filter(user__in=users, key=LANGUAGE_KEY).values_list('user_id', 'value')
+        )
+        for email, user in students.iteritems():
+            params = dict(email_params, email_address=email)
+            if user is not None:
+                params.update(message='enrolled_enroll', full_name=_full_name(user))
+                send_mail_to_student(email, params, language=languages.get(user.id))
+            else:
+                params.update(message='allowed_enroll')
+                send_mail_to_student(email, params)
+
+    for result in results:
+        email = result.pop('email', None)
+        if email is not None:
+            result['before'] = before[email].to_dict()
+            result['after'] = after[email].to_dict()
+    return results
+
+
 def send_beta_role_email(action, user, email_params):
     """
     Send an email to a user added or removed as a beta tester.
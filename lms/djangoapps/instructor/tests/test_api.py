@@ -752,6 +752,28 @@ class TestInstructorAPIEnrollment(SharedModuleStoreTestCase, LoginEnrollmentTest
         response = self.client.post(url, {'identifiers': self.enrolled_student.email, 'action': action})
         self.assertEqual(response.status_code, 400)
 
+    @patch('instructor.views.api.BULK_ENROLLMENT_TASK_THRESHOLD', 1)
+    @patch.object(instructor_task.api, 'submit_enroll_students')
+    def test_enroll_in_bulk(self, submit_task):
+        """ Test that enrolling more students than the threshold submits a task. """
+        url = reverse('students_update_enrollment', kwargs={'course_id': self.course.id.to_deprecated_string()})
+        params = {
+            'identifiers': u'{}, {}'.format(self.notenrolled_student.email, self.notregistered_email),
+            'action': 'enroll',
+            'email_students': False,
+        }
+        response = self.client.post(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(json.loads(response.content)['task_submitted'])
+        self.assertEqual(submit_task.call_count, 1)
+        # The students are enrolled by the task, not by the view
+        self.assertFalse(CourseEnrollment.is_enrolled(self.notenrolled_student, self.course.id))
+
+        submit_task.side_effect = AlreadyRunningError()
+        response = self.client.post(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(json.loads(response.content)['task_already_running'])
+
     def test_invalid_email(self):
         url = reverse('students_update_enrollment', kwargs={'course_id': self.course.id.to_deprecated_string()})
         response = self.client.post(url, {'identifiers': 'percivaloctavius@', 'action': 'enroll', 'email_students': False})
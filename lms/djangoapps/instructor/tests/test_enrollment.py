@@ -18,14 +18,24 @@ from student.tests.factories import UserFactory
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
+from django_comment_common.models import FORUM_ROLE_STUDENT
 from lms.djangoapps.ccx.tests.factories import CcxFactory
-from student.models import CourseEnrollment, CourseEnrollmentAllowed
+from student.models import (
+    ALLOWEDTOENROLL_TO_ENROLLED,
+    ENROLLED_TO_ENROLLED,
+    UNENROLLED_TO_ALLOWEDTOENROLL,
+    UNENROLLED_TO_ENROLLED,
+    CourseEnrollment,
+    CourseEnrollmentAllowed,
+    ManualEnrollmentAudit,
+)
 from student.roles import CourseCcxCoachRole
 from student.tests.factories import (
     AdminFactory
 )
 from instructor.enrollment import (
     EmailEnrollmentState,
+    bulk_enroll_identifiers,
     enroll_email,
     get_email_params,
     reset_student_attempts,
@@ -302,6 +312,104 @@ class TestInstructorUnenrollDB(TestEnrollmentChangeBase):
         return self._run_state_change_test(before_ideal, after_ideal, action)
 
 
+@attr('shard_1')
+class TestBulkEnrollIdentifiers(TestCase):
+    """ Test instructor.enrollment.bulk_enroll_identifiers """
+    def setUp(self):
+        super(TestBulkEnrollIdentifiers, self).setUp()
+        self.course_key = SlashSeparatedCourseKey('Robot', 'fAKE', 'C-%-se-%-ID')
+        self.instructor = UserFactory.create()
+
+    def _bulk_enroll(self, identifiers, batch_size=2, **kwargs):
+        """
+        Enroll `identifiers` in batches of `batch_size`, and return the results of all the batches.
+        """
+        results = []
+        for batch_results in bulk_enroll_identifiers(
+                self.course_key, identifiers, enrolled_by=self.instructor, reason='bulk', batch_size=batch_size,
+                **kwargs
+        ):
+            results.extend(batch_results)
+        return results
+
+    def test_enroll(self):
+        """
+        Each kind of student ends up as `enroll_email` would leave them, with a manual enrollment audit.
+        """
+        unenrolled = SettableEnrollmentState(user=True, enrollment=False, allowed=False, auto_enroll=False)
+        enrolled = SettableEnrollmentState(user=True, enrollment=True, allowed=False, auto_enroll=False)
+        allowed = SettableEnrollmentState(user=True, enrollment=False, allowed=True, auto_enroll=False)
+        nouser = SettableEnrollmentState(user=False, enrollment=False, allowed=False, auto_enroll=False)
+        students = [
+            (state.create_user(self.course_key), state) for state in (unenrolled, enrolled, allowed, nouser)
+        ]
+        # create_user only creates the enrollment allowance of students without an account
+        CourseEnrollmentAllowed.objects.create(email=students[2][0].email, course_id=self.course_key)
+        # The student without an account is given by email, and the others by username
+        identifiers = [eobjs.user.username if eobjs.user else eobjs.email for eobjs, __ in students]
+
+        results = self._bulk_enroll(identifiers + ['not an email'], auto_enroll=True)
+
+        self.assertEqual(results[-1], {'identifier': 'not an email', 'invalidIdentifier': True})
+        for (eobjs, before_ideal), result in zip(students, results):
+            after = EmailEnrollmentState(self.course_key, eobjs.email)
+            self.assertEqual(result['before'], before_ideal.to_dict())
+            self.assertEqual(result['after'], after.to_dict())
+            self.assertEqual(after.enrollment, eobjs.user is not None)
+            self.assertEqual(after.allowed, before_ideal.allowed or eobjs.user is None)
+        self.assertEqual(
+            dict(ManualEnrollmentAudit.objects.filter(reason='bulk').values_list('enrolled_email', 'state_transition')),
+            {
+                students[0][0].email: UNENROLLED_TO_ENROLLED,
+                students[1][0].email: ENROLLED_TO_ENROLLED,
+                students[2][0].email: ALLOWEDTOENROLL_TO_ENROLLED,
+                students[3][0].email: UNENROLLED_TO_ALLOWEDTOENROLL,
+            }
+        )
+        self.assertTrue(
+            CourseEnrollmentAllowed.objects.get(course_id=self.course_key, email=students[3][0].email).auto_enroll
+        )
+
+    def test_enroll_like_enroll_email(self):
+        """
+        The enrollments, their history and the forum roles are the same as `enroll_email` would create.
+        """
+        bulk_users = [UserFactory.create() for __ in xrange(3)]
+        single_user = UserFactory.create()
+        CourseEnrollment.enroll(bulk_users[0], self.course_key)
+        CourseEnrollment.unenroll(bulk_users[0], self.course_key)
+
+        self._bulk_enroll([user.email for user in bulk_users])
+        enroll_email(self.course_key, single_user.email)
+
+        for user in bulk_users + [single_user]:
+            self.assertTrue(CourseEnrollment.is_enrolled(user, self.course_key))
+            self.assertEqual(
+                list(user.roles.filter(course_id=self.course_key).values_list('name', flat=True)), [FORUM_ROLE_STUDENT]
+            )
+        enrollment = CourseEnrollment.objects.get(user=bulk_users[1], course_id=self.course_key)
+        self.assertEqual(
+            [(record.history_type, record.is_active) for record in enrollment.history.all()],
+            [('+', True)]
+        )
+        enrollment = CourseEnrollment.objects.get(user=bulk_users[0], course_id=self.course_key)
+        self.assertEqual(enrollment.history.first().history_type, '~')
+        self.assertTrue(enrollment.history.first().is_active)
+
+    @patch('instructor.enrollment.send_mail_to_student')
+    def test_email_students(self, send_mail):
+        """
+        Students with accounts are emailed that they are enrolled, and the others that they may enroll.
+        """
+        user = UserFactory.create()
+        self._bulk_enroll([user.username, 'robot@example.com'], email_students=True, email_params={})
+
+        self.assertEqual(
+            [(args[0], args[1]['message']) for args, __ in send_mail.call_args_list],
+            [(user.email, 'enrolled_enroll'), ('robot@example.com', 'allowed_enroll')]
+        )
+
+
 @attr('shard_1')
 class TestInstructorEnrollmentStudentModule(SharedModuleStoreTestCase):
     """ Test student module manipulations. """
@@ -18,6 +18,8 @@ from django.views.decorators.cache import cache_control
 from django.core.exceptions import ValidationError, PermissionDenied
 from django.core.mail.message import EmailMessage
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
+from django.core.files.base import ContentFile
+from django.core.files.storage import DefaultStorage
 from django.db import IntegrityError, transaction
 from django.core.urlresolvers import reverse
 from django.core.validators import validate_email
@@ -316,6 +318,9 @@ USERNAME_INDEX = 1
 NAME_INDEX = 2
 COUNTRY_INDEX = 3
 
+# Lists of more students than this are enrolled in bulk, by an instructor task.
+BULK_ENROLLMENT_TASK_THRESHOLD = 500
+
 
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
@@ -517,6 +522,7 @@ def create_and_enroll_user(email, username, name, country, password, course_id):
     return CourseEnrollment.enroll(user, course_id)
 
 
+@transaction.non_atomic_requests
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('staff')
@@ -526,6 +532,10 @@ def students_update_enrollment(request, course_id):
     Enroll or unenroll students by email.
     Requires staff access.
 
+    More than BULK_ENROLLMENT_TASK_THRESHOLD students are enrolled in bulk by an instructor task,
+    whose results are uploaded as a CSV to the data downloads. The response then has no results,
+    and "task_submitted" (or "task_already_running", if students are already being enrolled) is true.
+
     Query Parameters:
     - action in ['enroll', 'unenroll']
     - identifiers is string containing a list of emails and/or usernames separated by anything split_input_list can handle.
@@ -577,6 +587,19 @@ def students_update_enrollment(request, course_id):
     enrollment_obj = None
     state_transition = DEFAULT_TRANSITION_STATE
 
+    if action == 'enroll' and len(identifiers) > BULK_ENROLLMENT_TASK_THRESHOLD:
+        response_payload = {
+            'action': action,
+            'results': [],
+            'auto_enroll': auto_enroll,
+        }
+        try:
+            _submit_bulk_enrollment(request, course_id, identifiers, auto_enroll, email_students, reason)
+            response_payload['task_submitted'] = True
+        except AlreadyRunningError:
+            response_payload['task_already_running'] = True
+        return JsonResponse(response_payload)
+
     email_params = {}
     if email_students:
         course = get_course_by_id(course_id)
@@ -681,6 +704,27 @@ def students_update_enrollment(request, course_id):
     return JsonResponse(response_payload)
 
 
+def _submit_bulk_enrollment(request, course_key, identifiers, auto_enroll, email_students, reason):
+    """
+    Store the students to enroll, and the options to enroll them with, and submit the task enrolling them.
+
+    Raises AlreadyRunningError if students are already being enrolled in the course.
+    """
+    enrollment_request = {
+        'identifiers': identifiers,
+        'auto_enroll': auto_enroll,
+        'email_students': email_students,
+        'reason': reason,
+        'secure': request.is_secure(),
+    }
+    file_name = DefaultStorage().save(
+        course_and_time_based_filename_generator(course_key, "enrollment") + '.json',
+        ContentFile(json.dumps(enrollment_request)),
+    )
+    # The task will assume the default file storage.
+    instructor_task.api.submit_enroll_students(request, course_key, file_name)
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('instructor')
@@ -23,6 +23,7 @@ from instructor_task.tasks import (
     calculate_problem_grade_report,
     calculate_students_features_csv,
     cohort_students,
+    enroll_students,
     enrollment_report_features_csv,
     calculate_may_enroll_csv,
     exec_summary_report_csv,
@@ -422,6 +423,20 @@ def submit_cohort_students(request, course_key, file_name):
     return submit_task(request, task_type, task_class, course_key, task_input, task_key)
 
 
+def submit_enroll_students(request, course_key, file_name):
+    """
+    Request to have the students listed in a file stored by the instructor dashboard enrolled in bulk.
+
+    Raises AlreadyRunningError if students are currently being enrolled.
+    """
+    task_type = 'enroll_students'
+    task_class = enroll_students
+    task_input = {'file_name': file_name}
+    task_key = ""
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
 def generate_certificates_for_all_students(request, course_key):   # pylint: disable=invalid-name
     """
     Submits a task to generate certificates for all students enrolled in the course.
@@ -24,6 +24,7 @@ import dogstats_wrapper as dog_stats_api
 from pytz import UTC
 from StringIO import StringIO
 from edxmako.shortcuts import render_to_string
+from instructor.enrollment import bulk_enroll_identifiers, get_email_params
 from instructor.paidcourse_enrollment_report import PaidCourseEnrollmentReportProvider
 from shoppingcart.models import (
     PaidCourseRegistration, CourseRegCodeItem, InvoiceTransaction,
@@ -1537,6 +1538,69 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+def enroll_students_and_upload(_xmodule_instance_args, entry_id, course_id, task_input, action_name):
+    """
+    Within a given course, enroll the students listed in the file stored by the instructor
+    dashboard in bulk, then upload the results using a `ReportStore`.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+
+    with DefaultStorage().open(task_input['file_name']) as f:
+        enrollment_request = json.load(f)
+    identifiers = enrollment_request['identifiers']
+    auto_enroll = enrollment_request['auto_enroll']
+
+    email_params = {}
+    if enrollment_request['email_students']:
+        course = get_course_by_id(course_id)
+        email_params = get_email_params(course, auto_enroll, secure=enrollment_request['secure'])
+
+    task_progress = TaskProgress(action_name, len(identifiers), start_time)
+    current_step = {'step': 'Enrolling Students'}
+    task_progress.update_task_state(extra_meta=current_step)
+
+    output_header = ['Identifier', 'Invalid Identifier', 'User Exists', 'Was Enrolled', 'Enrolled', 'Allowed To Enroll']
+    output_rows = [output_header]
+    results = bulk_enroll_identifiers(
+        course_id,
+        identifiers,
+        auto_enroll=auto_enroll,
+        email_students=enrollment_request['email_students'],
+        email_params=email_params,
+        enrolled_by=InstructorTask.objects.get(pk=entry_id).requester,
+        reason=enrollment_request['reason'],
+    )
+    for batch_results in results:
+        for result in batch_results:
+            task_progress.attempted += 1
+            if result.get('invalidIdentifier'):
+                task_progress.failed += 1
+                output_rows.append([result['identifier'], True, '', '', '', ''])
+                continue
+
+            if result['before']['enrollment']:
+                task_progress.skipped += 1
+            else:
+                task_progress.succeeded += 1
+            output_rows.append([
+                result['identifier'],
+                False,
+                result['after']['user'],
+                result['before']['enrollment'],
+                result['after']['enrollment'],
+                result['after']['allowed'],
+            ])
+
+        task_progress.update_task_state(extra_meta=current_step)
+
+    current_step['step'] = 'Uploading CSV'
+    task_progress.update_task_state(extra_meta=current_step)
+    upload_csv_to_report_store(output_rows, 'enrollment_results', course_id, start_date)
+
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
 def students_require_certificate(course_id, enrolled_students, statuses_to_regenerate=None):
     """
     Returns list of students where certificates needs to be generated.
@@ -20,6 +20,7 @@ from certificates.models import CertificateStatuses, GeneratedCertificate
 from certificates.tests.factories import GeneratedCertificateFactory, CertificateWhitelistFactory
 from course_modes.models import CourseMode
 from courseware.tests.factories import InstructorFactory
+from instructor_task.tests.factories import InstructorTaskFactory
 from instructor_task.tests.test_base import InstructorTaskCourseTestCase, TestReportMixin, InstructorTaskModuleTestCase
 from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup, CohortMembership
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
@@ -36,6 +37,7 @@ from instructor_task.models import ReportStore
 from survey.models import SurveyForm, SurveyAnswer
 from instructor_task.tasks_helper import (
     cohort_students_and_upload,
+    enroll_students_and_upload,
     upload_problem_responses_csv,
     upload_grades_csv,
     upload_problem_grade_report,
@@ -1447,6 +1449,70 @@ class TestCohortStudents(TestReportMixin, InstructorTaskCourseTestCase):
         )
 
 
+@patch('instructor_task.tasks_helper.DefaultStorage', new=MockDefaultStorage)
+class TestEnrollStudents(TestReportMixin, InstructorTaskCourseTestCase):
+    """
+    Tests that bulk student enrollment works.
+    """
+    def setUp(self):
+        super(TestEnrollStudents, self).setUp()
+
+        self.course = CourseFactory.create()
+        self.enrolled_student = self.create_student(username='enrolled', email='enrolled@example.com')
+        self.student = UserFactory.create(username=u'student\xec', email='student@example.com')
+        self.instructor_task = InstructorTaskFactory.create(course_id=self.course.id, task_type='enroll_students')
+        self.csv_header_row = [
+            'Identifier', 'Invalid Identifier', 'User Exists', 'Was Enrolled', 'Enrolled', 'Allowed To Enroll'
+        ]
+
+    def _enroll_students_and_upload(self, identifiers, email_students=False):
+        """
+        Call `enroll_students_and_upload` with a file listing `identifiers`.
+        """
+        with tempfile.NamedTemporaryFile() as temp_file:
+            json.dump({
+                'identifiers': identifiers,
+                'auto_enroll': False,
+                'email_students': email_students,
+                'reason': 'bulk enrollment',
+                'secure': True,
+            }, temp_file)
+            temp_file.flush()
+            with patch('instructor_task.tasks_helper._get_current_task'):
+                return enroll_students_and_upload(
+                    None, self.instructor_task.id, self.course.id, {'file_name': temp_file.name}, 'enrolled'
+                )
+
+    def test_enroll(self):
+        result = self._enroll_students_and_upload(
+            [u'student\xec', 'enrolled@example.com', 'robot@example.com', 'not an email']
+        )
+        self.assertDictContainsSubset(
+            {'total': 4, 'attempted': 4, 'succeeded': 2, 'skipped': 1, 'failed': 1}, result
+        )
+        self.assertTrue(CourseEnrollment.is_enrolled(self.student, self.course.id))
+        self.assertTrue(
+            CourseEnrollmentAllowed.objects.filter(course_id=self.course.id, email='robot@example.com').exists()
+        )
+        self.assertEqual(
+            ManualEnrollmentAudit.objects.filter(enrolled_by=self.instructor_task.requester).count(), 3
+        )
+        self.verify_rows_in_csv(
+            [
+                dict(zip(self.csv_header_row, [u'student\xec', 'False', 'True', 'False', 'True', 'False'])),
+                dict(zip(self.csv_header_row, ['enrolled@example.com', 'False', 'True', 'True', 'True', 'False'])),
+                dict(zip(self.csv_header_row, ['robot@example.com', 'False', 'False', 'False', 'False', 'True'])),
+                dict(zip(self.csv_header_row, ['not an email', 'True', '', '', '', ''])),
+            ]
+        )
+
+    @patch('instructor.enrollment.send_mail_to_student')
+    def test_email_students(self, send_mail):
+        self._enroll_students_and_upload([u'student\xec'], email_students=True)
+        self.assertEqual(send_mail.call_count, 1)
+        self.assertEqual(send_mail.call_args[0][0], 'student@example.com')
+
+
 @ddt.ddt
 @patch('instructor_task.tasks_helper.DefaultStorage', new=MockDefaultStorage)
 class TestGradeReportEnrollmentAndCertificateInfo(TestReportMixin, InstructorTaskModuleTestCase):
@@ -119,6 +119,18 @@ def handler_url(block, handler_name, suffix='', query='', thirdparty=False):
     return url
 
 
+def view_url(block, view_name):
+    """
+    Returns the url of the xblock_view API, which returns the rendered view `view_name` of `block`
+    for the current user as JSON.
+    """
+    return reverse('xblock_view', kwargs={
+        'course_id': unicode(block.location.course_key),
+        'usage_id': quote_slashes(unicode(block.scope_ids.usage_id).encode('utf-8')),
+        'view_name': view_name,
+    })
+
+
 def local_resource_url(block, uri):
     """
     local_resource_url for Studio
@@ -212,8 +224,26 @@ class LmsModuleSystem(ModuleSystem):  # pylint: disable=abstract-method
         services['fs'] = xblock.reference.plugins.FSService()
         services['settings'] = SettingsService()
         self.request_token = kwargs.pop('request_token', None)
+        self.fragment_cache = kwargs.pop('fragment_cache', None)
         super(LmsModuleSystem, self).__init__(**kwargs)
 
+    def render(self, block, view_name, context=None):
+        """
+        Render a block by invoking its view, reusing the fragment cached by an earlier request
+        if the view declares its output cacheable.
+
+        See :meth:`xblock.runtime.Runtime.render`
+        """
+        if self.fragment_cache is None or not self.fragment_cache.is_cacheable(block, view_name):
+            return super(LmsModuleSystem, self).render(block, view_name, context)
+
+        key = self.fragment_cache.key(block, view_name, context)
+        fragment = self.fragment_cache.get(key)
+        if fragment is None:
+            fragment = super(LmsModuleSystem, self).render(block, view_name, context)
+            self.fragment_cache.set(key, fragment)
+        return fragment
+
     def handler_url(self, *args, **kwargs):
         """
         Implement the XBlock runtime handler_url interface.
@@ -238,6 +268,14 @@ class LmsModuleSystem(ModuleSystem):  # pylint: disable=abstract-method
     def local_resource_url(self, *args, **kwargs):
         return local_resource_url(*args, **kwargs)
 
+    def view_url(self, block, view_name):
+        """
+        Returns the url from which the rendered view `view_name` of `block` can be fetched.
+
+        See :func:`view_url`
+        """
+        return view_url(block, view_name)
+
     def wrap_aside(self, block, aside, view, frag, context):
         """
         Creates a div which identifies the aside, points to the original block,
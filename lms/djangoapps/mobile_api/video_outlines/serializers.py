@@ -3,7 +3,7 @@ Serializer for video outline
 """
 from rest_framework.reverse import reverse
 
-from xmodule.modulestore.mongo.base import BLOCK_TYPES_WITH_CHILDREN
+from xmodule.modulestore.mongo.base import block_types_with_children
 from xmodule.modulestore.django import modulestore
 from courseware.access import has_access
 from courseware.courses import get_course_by_id
@@ -41,7 +41,7 @@ class BlockOutline(object):
             """
             return (
                 usage_key.block_type in self.block_types or
-                usage_key.block_type in BLOCK_TYPES_WITH_CHILDREN
+                usage_key.block_type in block_types_with_children()
             )
 
         def create_module(descriptor):
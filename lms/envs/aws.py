@@ -117,6 +117,19 @@ STATIC_ROOT_BASE = ENV_TOKENS.get('STATIC_ROOT_BASE', None)
 if STATIC_ROOT_BASE:
     STATIC_ROOT = path(STATIC_ROOT_BASE)
 
+# MAKO_MODULE_DIR_BASE specifies a directory where the compiled Mako templates of each revision
+# are kept, so they can be compiled ahead of time with the compile_mako_templates command and
+# shared by all the processes running that revision. The lms and cms have templates of the same
+# names, so each has its own directory.
+MAKO_MODULE_DIR_BASE = ENV_TOKENS.get('MAKO_MODULE_DIR_BASE', None)
+if MAKO_MODULE_DIR_BASE:
+    MAKO_MODULE_DIR = path(MAKO_MODULE_DIR_BASE) / EDX_PLATFORM_REVISION / 'lms'
+MAKO_WARM_LOOKUPS_ON_STARTUP = ENV_TOKENS.get('MAKO_WARM_LOOKUPS_ON_STARTUP', MAKO_WARM_LOOKUPS_ON_STARTUP)
+REQUEST_PROFILE_TRACE_SAMPLE_RATE = ENV_TOKENS.get(
+    'REQUEST_PROFILE_TRACE_SAMPLE_RATE', REQUEST_PROFILE_TRACE_SAMPLE_RATE
+)
+REQUEST_PROFILE_BUDGETS = ENV_TOKENS.get('REQUEST_PROFILE_BUDGETS', REQUEST_PROFILE_BUDGETS)
+
 
 # STATIC_URL_BASE specifies the base url to use for static files
 STATIC_URL_BASE = ENV_TOKENS.get('STATIC_URL_BASE', None)
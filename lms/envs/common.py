@@ -150,6 +150,17 @@ FEATURES = {
     # See jquey-xblock: https://github.com/edx-solutions/jquery-xblock
     'ENABLE_XBLOCK_VIEW_ENDPOINT': False,
 
+    # Only render the active unit of a sequence with the courseware page, and fetch the other units
+    # when they are first shown. Requires ENABLE_XBLOCK_VIEW_ENDPOINT.
+    'ENABLE_LAZY_SEQUENCE_TABS': False,
+
+    # Cache the rendered views of XBlocks which declare them cacheable, see courseware.fragment_cache.
+    'ENABLE_FRAGMENT_CACHE': False,
+
+    # Read the Metrics tab of the instructor dashboard from tables kept up to date by the
+    # update_class_dashboard_metrics management command, rather than aggregating StudentModules on each view.
+    'ENABLE_PRECOMPUTED_CLASS_DASHBOARD_METRICS': False,
+
     # Allows to configure the LMS to provide CORS headers to serve requests from other domains
     'ENABLE_CORS_HEADERS': False,
 
@@ -401,6 +412,10 @@ FEATURES = {
 
     # Enable LTI Provider feature.
     'ENABLE_LTI_PROVIDER': False,
+
+    # Profile the SQL queries, Mongo operations, cache gets and sets, modulestore calls and XBlock
+    # renders of each request, and report them by view. See REQUEST_PROFILE_BUDGETS.
+    'ENABLE_REQUEST_PROFILING': False,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -481,6 +496,9 @@ OAUTH_OIDC_USERINFO_HANDLERS = (
 # TODO: Move the Mako templating into a different engine in TEMPLATES below.
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_lms')
+# Whether to load all the Mako templates at startup, compiling those which aren't compiled in the
+# MAKO_MODULE_DIR yet, rather than on their first render.
+MAKO_WARM_LOOKUPS_ON_STARTUP = False
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [PROJECT_ROOT / 'templates',
                           COMMON_ROOT / 'templates',
@@ -1118,10 +1136,22 @@ CREDIT_NOTIFICATION_CACHE_TIMEOUT = 5 * 60 * 60
 # Ignore deprecation warnings (so we don't clutter Jenkins builds/production)
 simplefilter('ignore')
 
+############################# Request profiles ################################
+
+# The settings of the request profiles, when FEATURES['ENABLE_REQUEST_PROFILING'] is on.
+# The fraction of the requests whose every operation is logged, with its name and time.
+REQUEST_PROFILE_TRACE_SAMPLE_RATE = 0
+# The budgets of the requests, by view name, with '*' for every view, e.g.
+#     {'*': {'sql.count': 100}, 'courseware.views.index': {'mongo.count': 50, 'render.time': 0.5}}
+# The requests which exceed the count or time (in seconds) of any kind of operation are logged.
+REQUEST_PROFILE_BUDGETS = {}
+
 ################################# Middleware ###################################
 
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    # Comes early, so that the work of the other middleware is profiled too
+    'openedx.core.djangoapps.request_profile.middleware.RequestProfileMiddleware',
     'microsite_configuration.middleware.MicrositeMiddleware',
     'django_comment_client.middleware.AjaxExceptionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -1184,6 +1214,9 @@ MIDDLEWARE_CLASSES = (
     # to redirected unenrolled students to the course info page
     'courseware.middleware.RedirectUnenrolledMiddleware',
 
+    # saves the StudentModuleHistory of a request at once, before the request cache is cleared
+    'courseware.middleware.StudentModuleHistoryMiddleware',
+
     'course_wiki.middleware.WikiAccessMiddleware',
 
     # This must be last
@@ -2164,8 +2197,8 @@ VERIFY_STUDENT = {
 
 ### This enables the Metrics tab for the Instructor dashboard ###########
 FEATURES['CLASS_DASHBOARD'] = False
-if FEATURES.get('CLASS_DASHBOARD'):
-    INSTALLED_APPS += ('class_dashboard',)
+# Installed regardless, so that the tables of its precomputed metrics exist whenever the feature is enabled.
+INSTALLED_APPS += ('class_dashboard',)
 
 ################ Enable credit eligibility feature ####################
 ENABLE_CREDIT_ELIGIBILITY = True
@@ -67,6 +67,10 @@ def run():
     xmodule.x_module.descriptor_global_handler_url = lms_xblock.runtime.handler_url
     xmodule.x_module.descriptor_global_local_resource_url = lms_xblock.runtime.local_resource_url
 
+    # Load the templates once all the lookup directories, including the theme's, are added.
+    if settings.MAKO_WARM_LOOKUPS_ON_STARTUP:
+        edxmako.paths.warm_lookups()
+
 
 def add_mimetypes():
     """
@@ -12,6 +12,10 @@ It exposes a module-level variable named ``application``. Django's
 from safe_lxml import defuse_xml_libs
 defuse_xml_libs()
 
+# Profile the startup, if the EDX_PROFILE_STARTUP environment variable is set.
+from openedx.core.lib import startup_profiler
+startup_profiler.install()
+
 # Disable PyContract contract checking when running as a webserver
 import contracts
 contracts.disable_all()
@@ -22,14 +26,18 @@ openedx.core.operations.install_memory_dumper()
 import os
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lms.envs.aws")
 
-import lms.startup as startup
-startup.run()
+with startup_profiler.step('lms.startup'):
+    import lms.startup as startup
+    startup.run()
 
 from xmodule.modulestore.django import modulestore
 
 # Trigger a forced initialization of our modulestores since this can take a
 # while to complete and we want this done before HTTP requests are accepted.
-modulestore()
+with startup_profiler.step('modulestore'):
+    modulestore()
+
+startup_profiler.report()
 
 
 # This application object is used by the development server
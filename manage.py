@@ -15,6 +15,10 @@ Any arguments not understood by this manage.py will be passed to django-admin.py
 from safe_lxml import defuse_xml_libs
 defuse_xml_libs()
 
+# Profile the startup, if the EDX_PROFILE_STARTUP environment variable is set.
+from openedx.core.lib import startup_profiler
+startup_profiler.install()
+
 import os
 import sys
 import importlib
@@ -108,8 +112,10 @@ if __name__ == "__main__":
         # This will trigger django-admin.py to print out its help
         django_args.append('--help')
 
-    startup = importlib.import_module(edx_args.startup)
-    startup.run()
+    with startup_profiler.step(edx_args.startup):
+        startup = importlib.import_module(edx_args.startup)
+        startup.run()
+    startup_profiler.report()
 
     from django.core.management import execute_from_command_line
 
@@ -38,15 +38,25 @@ FOR DISABLING TRACKING-
 1. Import following at appropriate location-
     from openedx.core.djangoapps.call_stack_manager import donottrack
 NOTE - You need to import function/class you do not want to track.
+
+SAMPLING-
+Capturing a call stack is expensive, and the tracked models are written on most requests, so only
+a fraction of the calls are captured, given by the CALL_STACK_MANAGER_SAMPLE_RATE setting (between 0
+and 1). It is 0 by default, which disables tracking at the cost of a single comparison per call.
+The number of times each unique call stack was sampled is counted, and the counts are logged every
+CALL_STACK_MANAGER_REPORT_INTERVAL seconds, along with the number of calls they stand for.
 """
 
 import logging
 import traceback
+import random
 import re
 import collections
+import time
 import wrapt
 import types
 import inspect
+from django.conf import settings
 from django.db.models import Manager
 
 log = logging.getLogger(__name__)
@@ -58,36 +68,75 @@ REGULAR_EXPS = [re.compile(x) for x in ['^.*python2.7.*$', '^.*<exec_function>.*
 # List keeping track of entities not to be tracked
 HALT_TRACKING = []
 
-STACK_BOOK = collections.defaultdict(list)
+
+class OrderedCounter(collections.Counter, collections.OrderedDict):
+    """ Counter which remembers the order its elements were first counted in """
+
+
+STACK_BOOK = collections.defaultdict(OrderedCounter)
 # Dictionary which stores call logs
-# {'EntityName' : ListOf<CallStacks>}
-# CallStacks is ListOf<Frame>
+# {'EntityName' : OrderedCounterOf<CallStacks>}
+# CallStacks is TupleOf<Frame>, counted by the number of times it was sampled since the last report
 # Frame is a tuple ('FilePath','LineNumber','Function Name', 'Context')
-# {"<class 'courseware.models.StudentModule'>" : [[(file, line number, function name, context),(---,---,---)],
-#                                                 [(file, line number, function name, context),(---,---,---)]]}
+# {"<class 'courseware.models.StudentModule'>" : {((file, line number, function name, context),(---,---,---)): 3,
+#                                                 ((file, line number, function name, context),(---,---,---)): 1}}
+
+# Default number of seconds between reports of the sampled call stacks
+DEFAULT_REPORT_INTERVAL = 60 * 60
+
+# Time of the last report of the sampled call stacks
+LAST_REPORT = time.time()
+
+
+def _entity_display_name(entity_name):
+    """ The name an entity is logged under """
+    if inspect.isclass(entity_name):
+        return entity_name
+    return "{}.{}".format(entity_name.__module__, entity_name.__name__)
+
+
+def report_call_stacks():
+    """ Logs the number of times each call stack was sampled since the last report, and resets the counts.
+
+    The call stacks themselves were logged when first sampled, so they are referred to by their number.
+    """
+    global LAST_REPORT  # pylint: disable=global-statement
+    LAST_REPORT = time.time()
+    sample_rate = getattr(settings, 'CALL_STACK_MANAGER_SAMPLE_RATE', 0)
+    # Other threads keep sampling while this one reports, so snapshots of the stack book are iterated over,
+    # and only the reported counts are subtracted.
+    for entity_name, call_stacks in list(STACK_BOOK.items()):
+        for number, (call_stack, count) in enumerate(list(call_stacks.items()), start=1):
+            if count:
+                log.info("Sampled call stack number %s for %s %s times, for about %d calls",
+                         number, _entity_display_name(entity_name), count, count / sample_rate if sample_rate else 0)
+                call_stacks[call_stack] -= count
 
 
 def capture_call_stack(entity_name):
-    """ Logs customised call stacks in global dictionary STACK_BOOK and logs it.
+    """ Samples customised call stacks, counts them in global dictionary STACK_BOOK and logs new ones.
 
     Arguments:
         entity_name - entity
     """
+    sample_rate = getattr(settings, 'CALL_STACK_MANAGER_SAMPLE_RATE', 0)
+    # Checked first, so that nothing else is done when sampling is disabled
+    if not sample_rate or random.random() >= sample_rate:
+        return
+
     # Holds temporary callstack
-    # List with each element 4-tuple(filename, line number, function name, text)
+    # Tuple with each element 4-tuple(filename, line number, function name, text)
     # and filtered with respect to regular expressions
-    temp_call_stack = [frame for frame in traceback.extract_stack()
-                       if not any(reg.match(frame[0]) for reg in REGULAR_EXPS)]
+    temp_call_stack = tuple(frame for frame in traceback.extract_stack()
+                            if not any(reg.match(frame[0]) for reg in REGULAR_EXPS))
 
-    final_call_stack = "".join(traceback.format_list(temp_call_stack))
-
-    def _should_get_logged(entity_name):  # pylint: disable=
-        """ Checks if current call stack of current entity should be logged or not.
+    def _should_get_counted(entity_name):  # pylint: disable=
+        """ Checks if current call stack of current entity should be counted or not.
 
         Arguments:
             entity_name - Name of the current entity
         Returns:
-            True if the current call stack is to logged, False otherwise
+            True if the current call stack is to counted, False otherwise
         """
         is_class_in_halt_tracking = bool(HALT_TRACKING and inspect.isclass(entity_name) and
                                          issubclass(entity_name, tuple(HALT_TRACKING[-1])))
@@ -105,22 +154,23 @@ def capture_call_stack(entity_name):
         if not temp_call_stack:
             return False
 
-        if HALT_TRACKING:
-            if is_class_in_halt_tracking or is_function_in_halt_tracking:
-                return False
+        return not (is_class_in_halt_tracking or is_function_in_halt_tracking)
+
+    if _should_get_counted(entity_name):
+        call_stacks = STACK_BOOK[entity_name]
+        if temp_call_stack not in call_stacks:
+            final_call_stack = "".join(traceback.format_list(list(temp_call_stack)))
+            if inspect.isclass(entity_name):
+                log.info("Logging new call stack number %s for %s:\n %s", len(call_stacks) + 1,
+                         entity_name, final_call_stack)
             else:
-                return temp_call_stack not in STACK_BOOK[entity_name]
-        else:
-            return temp_call_stack not in STACK_BOOK[entity_name]
+                log.info("Logging new call stack number %s for %s.%s:\n %s", len(call_stacks) + 1,
+                         entity_name.__module__, entity_name.__name__, final_call_stack)
+        call_stacks[temp_call_stack] += 1
 
-    if _should_get_logged(entity_name):
-        STACK_BOOK[entity_name].append(temp_call_stack)
-        if inspect.isclass(entity_name):
-            log.info("Logging new call stack number %s for %s:\n %s", len(STACK_BOOK[entity_name]),
-                     entity_name, final_call_stack)
-        else:
-            log.info("Logging new call stack number %s for %s.%s:\n %s", len(STACK_BOOK[entity_name]),
-                     entity_name.__module__, entity_name.__name__, final_call_stack)
+    report_interval = getattr(settings, 'CALL_STACK_MANAGER_REPORT_INTERVAL', DEFAULT_REPORT_INTERVAL)
+    if time.time() - LAST_REPORT >= report_interval:
+        report_call_stacks()
 
 
 class CallStackMixin(object):
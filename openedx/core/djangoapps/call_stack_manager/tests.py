@@ -5,6 +5,7 @@ import collections
 from mock import patch
 from django.db import models
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from openedx.core.djangoapps.call_stack_manager import donottrack, CallStackManager, CallStackMixin, trackit
 from openedx.core.djangoapps.call_stack_manager import core
@@ -137,16 +138,18 @@ class ClassReturingValue(object):
         return 42 + argument
 
 
+@override_settings(CALL_STACK_MANAGER_SAMPLE_RATE=1)
 @patch('openedx.core.djangoapps.call_stack_manager.core.log.info')
 @patch('openedx.core.djangoapps.call_stack_manager.core.REGULAR_EXPS', [])
 class TestingCallStackManager(TestCase):
     """Tests for call_stack_manager
     1. Tests CallStackManager QuerySetAPI functionality
     2. Tests @donottrack decorator
+    3. Tests sampling and reporting of call stacks
     """
     def setUp(self):
         core.TRACK_FLAG = True
-        core.STACK_BOOK = collections.defaultdict(list)
+        core.STACK_BOOK = collections.defaultdict(core.OrderedCounter)
         core.HALT_TRACKING = []
         super(TestingCallStackManager, self).setUp()
 
@@ -304,3 +307,63 @@ class TestingCallStackManager(TestCase):
         temp = donottrack_function()
         self.assertEqual(temp, 42)
         self.assertEqual(len(log_capt.call_args_list), 0)
+
+    @override_settings(CALL_STACK_MANAGER_SAMPLE_RATE=0)
+    def test_sampling_disabled(self, log_capt):
+        """ Test that nothing is tracked when sampling is disabled """
+        with patch('openedx.core.djangoapps.call_stack_manager.core.traceback.extract_stack') as extract_stack:
+            ModelMixinCallStckMngr(id_field=1).save()
+            trackit_func()
+        self.assertFalse(extract_stack.called)
+        self.assertEqual(len(log_capt.call_args_list), 0)
+        self.assertEqual(len(core.STACK_BOOK), 0)
+
+    @override_settings(CALL_STACK_MANAGER_SAMPLE_RATE=0.1)
+    def test_unsampled(self, log_capt):
+        """ Test that calls which aren't sampled aren't tracked """
+        with patch('openedx.core.djangoapps.call_stack_manager.core.random.random', return_value=0.5):
+            ModelMixinCallStckMngr(id_field=1).save()
+        self.assertEqual(len(log_capt.call_args_list), 0)
+        self.assertEqual(len(core.STACK_BOOK), 0)
+
+    def test_counts(self, log_capt):
+        """ Test that the samples of each unique call stack are counted """
+        for __ in range(3):
+            ModelMixinCallStckMngr(id_field=1).save()
+        ModelMixinCallStckMngr(id_field=1).save()
+        self.assertEqual(len(log_capt.call_args_list), 2)
+        self.assertEqual(core.STACK_BOOK[ModelMixinCallStckMngr].values(), [3, 1])
+
+    @override_settings(CALL_STACK_MANAGER_SAMPLE_RATE=0.5)
+    def test_report(self, log_capt):
+        """ Test that reports log the counts since the last report, scaled by the sample rate """
+        with patch('openedx.core.djangoapps.call_stack_manager.core.random.random', return_value=0):
+            for __ in range(3):
+                ModelMixinCallStckMngr(id_field=1).save()
+        core.report_call_stacks()
+        self.assertEqual(log_capt.call_args[0][1:], (1, ModelMixinCallStckMngr, 3, 6))
+        self.assertEqual(core.STACK_BOOK[ModelMixinCallStckMngr].values(), [0])
+
+        # nothing was sampled since
+        core.report_call_stacks()
+        self.assertEqual(len(log_capt.call_args_list), 2)
+
+    def test_report_while_sampling(self, log_capt):
+        """ Test that call stacks sampled by other threads during a report are kept for the next one """
+        ModelMixinCallStckMngr(id_field=1).save()
+
+        def sample(*args):  # pylint: disable=unused-argument
+            """ Sample another call stack, and one of another entity, as another thread could """
+            core.STACK_BOOK[ModelMixinCallStckMngr][('other call stack',)] += 1
+            core.STACK_BOOK[ModelAnotherCallStckMngr][('other call stack',)] += 1
+        log_capt.side_effect = sample
+        core.report_call_stacks()
+        self.assertEqual(core.STACK_BOOK[ModelMixinCallStckMngr].values(), [0, 1])
+        self.assertEqual(core.STACK_BOOK[ModelAnotherCallStckMngr].values(), [1])
+
+    @override_settings(CALL_STACK_MANAGER_REPORT_INTERVAL=0)
+    def test_periodic_report(self, log_capt):
+        """ Test that the counts are reported once the report interval has passed """
+        ModelMixinCallStckMngr(id_field=1).save()
+        self.assertEqual(len(log_capt.call_args_list), 2)
+        self.assertEqual(log_capt.call_args[0][1:], (1, ModelMixinCallStckMngr, 1, 1))
@@ -20,6 +20,9 @@ class Command(BaseCommand):
     Example usage:
         $ ./manage.py lms generate_course_overview --all --settings=devstack
         $ ./manage.py lms generate_course_overview 'edX/DemoX/Demo_Course' --settings=devstack
+
+    Running with --all after a deploy pre-warms the overviews of every course,
+    so that missing or outdated overviews aren't generated inside user requests.
     """
     args = '<course_id course_id ...>'
     help = 'Generates and stores course overview for one or more courses.'
@@ -29,6 +32,12 @@ class Command(BaseCommand):
                     action='store_true',
                     default=False,
                     help='Generate course overview for all courses.'),
+        make_option('--chunk-size',
+                    action='store',
+                    type='int',
+                    dest='chunk_size',
+                    default=50,
+                    help='Number of course overviews to load and save at a time.'),
     )
 
     def handle(self, *args, **options):
@@ -50,11 +59,20 @@ class Command(BaseCommand):
         log.info('Generating course overview for %d courses.', len(course_keys))
         log.debug('Generating course overview(s) for the following courses: %s', course_keys)
 
-        for course_key in course_keys:
-            try:
-                CourseOverview.get_from_id(course_key)
-            except Exception as ex:  # pylint: disable=broad-except
-                log.exception('An error occurred while generating course overview for %s: %s', unicode(
-                    course_key), ex.message)
+        chunk_size = options.get('chunk_size') or 50
+        for start in xrange(0, len(course_keys), chunk_size):
+            chunk = course_keys[start:start + chunk_size]
+            course_overviews = CourseOverview.get_from_ids(chunk)
+
+            # get_from_ids skips courses it can't load, so retry those one
+            # by one in order to report why they failed.
+            for course_key in chunk:
+                if course_key in course_overviews:
+                    continue
+                try:
+                    CourseOverview.get_from_id(course_key)
+                except Exception as ex:  # pylint: disable=broad-except
+                    log.exception('An error occurred while generating course overview for %s: %s', unicode(
+                        course_key), ex.message)
 
         log.info('Finished generating course overviews.')
@@ -78,3 +78,16 @@ class TestGenerateCourseOverview(ModuleStoreTestCase):
         """
         with self.assertRaises(CommandError):
             self.command.handle(all=False)
+
+    def test_generate_all_in_chunks(self):
+        """
+        Test that courses are loaded in chunks and outdated overviews are regenerated.
+        """
+        self.command.handle(all=True)
+        CourseOverview.objects.filter(id=self.course_key_1).update(version=CourseOverview.VERSION - 1)
+
+        with patch.object(CourseOverview, 'get_from_ids', wraps=CourseOverview.get_from_ids) as mock_get_from_ids:
+            self.command.handle(all=True, chunk_size=1)
+        self.assertGreaterEqual(mock_get_from_ids.call_count, 2)
+        self._assert_courses_in_overview(self.course_key_1, self.course_key_2)
+        self.assertEqual(CourseOverview.get_from_id(self.course_key_1).version, CourseOverview.VERSION)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    """
+    Fills in the org of the existing course overviews from their course keys.
+    """
+    course_overview_model = apps.get_model("course_overviews", "CourseOverview")
+    db_alias = schema_editor.connection.alias
+
+    objects = course_overview_model.objects.using(db_alias)
+    for course_id in objects.values_list('id', flat=True):
+        objects.filter(id=course_id).update(org=course_id.org)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_overviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseoverview',
+            name='org',
+            field=models.CharField(default='outdated_entry', max_length=255, db_index=True),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
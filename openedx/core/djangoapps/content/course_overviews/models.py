@@ -2,6 +2,10 @@
 Declaration of CourseOverview model
 """
 import json
+import logging
+import time
+
+from django.core.cache import cache
 from django.db import models, transaction
 
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
@@ -21,6 +25,10 @@ from xmodule_django.models import CourseKeyField, UsageKeyField
 
 from ccx_keys.locator import CCXLocator
 
+import request_cache
+
+log = logging.getLogger(__name__)
+
 
 class CourseOverview(TimeStampedModel):
     """
@@ -35,7 +43,18 @@ class CourseOverview(TimeStampedModel):
         app_label = 'course_overviews'
 
     # IMPORTANT: Bump this whenever you modify this model and/or add a migration.
-    VERSION = 2
+    VERSION = 3
+
+    # Name of the request cache used to memoize overviews within a request.
+    REQUEST_CACHE_NAME = 'course_overviews.course_overview'
+
+    # Single-flight locking for loading an overview from the module store.
+    # LOAD_LOCK_TIMEOUT bounds how long a crashed loader can block others;
+    # LOAD_WAIT_TIMEOUT bounds how long other requests wait for the loader
+    # before giving up and loading the course themselves.
+    LOAD_LOCK_TIMEOUT = 60
+    LOAD_WAIT_TIMEOUT = 10
+    LOAD_POLL_INTERVAL = 0.1
 
     # Cache entry versioning.
     version = IntegerField()
@@ -43,6 +62,8 @@ class CourseOverview(TimeStampedModel):
     # Course identification
     id = CourseKeyField(db_index=True, primary_key=True, max_length=255)
     _location = UsageKeyField(max_length=255)
+    # The org of the course key (unlike display_org_with_default), so that courses can be filtered by org.
+    org = models.CharField(max_length=255, db_index=True, default='outdated_entry')
     display_name = TextField(null=True)
     display_number_with_default = TextField()
     display_org_with_default = TextField()
@@ -125,6 +146,7 @@ class CourseOverview(TimeStampedModel):
             version=cls.VERSION,
             id=course.id,
             _location=course.location,
+            org=course.location.org,
             display_name=display_name,
             display_number_with_default=course.display_number_with_default,
             display_org_with_default=course.display_org_with_default,
@@ -184,10 +206,7 @@ class CourseOverview(TimeStampedModel):
                 try:
                     with transaction.atomic():
                         course_overview.save()
-                        CourseOverviewTab.objects.bulk_create([
-                            CourseOverviewTab(tab_id=tab.tab_id, course_overview=course_overview)
-                            for tab in course.tabs
-                        ])
+                        CourseOverviewTab.objects.bulk_create(cls._create_tabs(course_overview, course))
                 except IntegrityError:
                     # There is a rare race condition that will occur if
                     # CourseOverview.get_from_id is called while a
@@ -198,6 +217,7 @@ class CourseOverview(TimeStampedModel):
                     # to save a duplicate.
                     # (see: https://openedx.atlassian.net/browse/TNL-2854).
                     pass
+                cls._memoize(course_overview)
                 return course_overview
             elif course is not None:
                 raise IOError(
@@ -208,6 +228,148 @@ class CourseOverview(TimeStampedModel):
             else:
                 raise cls.DoesNotExist()
 
+    @staticmethod
+    def _create_tabs(course_overview, course):
+        """
+        Returns unsaved CourseOverviewTabs for each of the course's tabs.
+        """
+        return [
+            CourseOverviewTab(tab_id=tab.tab_id, course_overview=course_overview)
+            for tab in course.tabs
+        ]
+
+    @classmethod
+    def _load_many_from_module_store(cls, course_ids):
+        """
+        Load CourseDescriptors for the given course IDs, create CourseOverviews
+        from them and save them all to the database in a single transaction.
+
+        Courses which don't exist or fail to load are logged and omitted from
+        the result rather than raising, since one bad course shouldn't prevent
+        the others from being returned.
+
+        Arguments:
+            course_ids (list[CourseKey]): the IDs of the courses to be loaded.
+
+        Returns:
+            dict[CourseKey, CourseOverview]
+        """
+        store = modulestore()
+        course_overviews = {}
+        tabs = []
+        for course_id in course_ids:
+            with store.bulk_operations(course_id):
+                course = store.get_course(course_id)
+            if isinstance(course, CourseDescriptor):
+                course_overview = cls._create_from_course(course)
+                course_overviews[course_id] = course_overview
+                tabs.extend(cls._create_tabs(course_overview, course))
+            elif course is not None:
+                log.error(
+                    u"Error while loading course %s from the module store: %s",
+                    unicode(course_id),
+                    course.error_msg if isinstance(course, ErrorDescriptor) else unicode(course)
+                )
+
+        if course_overviews:
+            try:
+                with transaction.atomic():
+                    cls.objects.bulk_create(course_overviews.values())
+                    CourseOverviewTab.objects.bulk_create(tabs)
+            except IntegrityError:
+                # Another request created some of these overviews in the
+                # meantime, so fall back to saving (or skipping) them one at
+                # a time.  See load_from_module_store.
+                for course_overview in course_overviews.itervalues():
+                    try:
+                        with transaction.atomic():
+                            course_overview.save()
+                            CourseOverviewTab.objects.bulk_create([
+                                tab for tab in tabs if tab.course_overview is course_overview
+                            ])
+                    except IntegrityError:
+                        pass
+
+        for course_overview in course_overviews.itervalues():
+            cls._memoize(course_overview)
+        return course_overviews
+
+    @classmethod
+    def _load_from_module_store_once(cls, course_id):
+        """
+        Load a CourseOverview from the module store, making sure that only one
+        request at a time loads any given course.
+
+        If another request is already loading the course, wait for it to save
+        the overview and return that rather than loading the whole course
+        again.  If the other request takes too long or fails, fall back to
+        loading the course ourselves.
+
+        Arguments:
+            course_id (CourseKey): the ID of the course overview to be loaded.
+
+        Returns:
+            CourseOverview: overview of the requested course.
+
+        Raises:
+            See load_from_module_store.
+        """
+        lock_key = cls._loading_lock_key(course_id)
+        if cache.add(lock_key, True, cls.LOAD_LOCK_TIMEOUT):
+            try:
+                return cls.load_from_module_store(course_id)
+            finally:
+                cache.delete(lock_key)
+
+        deadline = time.time() + cls.LOAD_WAIT_TIMEOUT
+        while time.time() < deadline:
+            time.sleep(cls.LOAD_POLL_INTERVAL)
+            course_overview = cls.get_from_ids_if_exists([course_id]).get(course_id)
+            if course_overview is not None:
+                cls._memoize(course_overview)
+                return course_overview
+            if cache.get(lock_key) is None:
+                # The other request finished without saving an overview.
+                break
+
+        return cls.load_from_module_store(course_id)
+
+    @staticmethod
+    def _loading_lock_key(course_id):
+        """
+        Returns the cache key locking the loading of the given course's overview.
+        """
+        return u'course_overviews.loading.{}'.format(course_id)
+
+    @classmethod
+    def _get_request_cache(cls):
+        """
+        Returns the dict used to memoize overviews for the current request, or
+        None when not handling a request (management commands, celery tasks),
+        where nothing would ever clear the cache.
+        """
+        if request_cache.get_request() is None:
+            return None
+        return request_cache.get_cache(cls.REQUEST_CACHE_NAME)
+
+    @classmethod
+    def _memoize(cls, course_overview):
+        """
+        Remember the given overview for the rest of the current request.
+        """
+        memo = cls._get_request_cache()
+        if memo is not None:
+            memo[course_overview.id] = course_overview
+
+    @classmethod
+    def clear_memoized(cls, course_id):
+        """
+        Forget any overview of the given course remembered by this request.
+        """
+        memo = cls._get_request_cache()
+        if memo is not None:
+            memo.pop(course_id, None)
+
     @classmethod
     def get_from_id(cls, course_id):
         """
@@ -230,6 +392,10 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
+        memo = cls._get_request_cache()
+        if memo is not None and course_id in memo:
+            return memo[course_id]
+
         try:
             course_overview = cls.objects.get(id=course_id)
             if course_overview.version < cls.VERSION:
@@ -238,7 +404,96 @@ class CourseOverview(TimeStampedModel):
                 course_overview = None
         except cls.DoesNotExist:
             course_overview = None
-        return course_overview or cls.load_from_module_store(course_id)
+
+        if course_overview is None:
+            return cls._load_from_module_store_once(course_id)
+
+        cls._memoize(course_overview)
+        return course_overview
+
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Load CourseOverview objects for the given course IDs.
+
+        This is the bulk version of get_from_id.  Overviews already cached in
+        the database are loaded with a single query, and the remaining
+        courses are loaded from the module store and saved in one batch.
+        Overviews are also memoized for the rest of the current request.
+
+        Unlike get_from_id, courses which don't exist or fail to load do not
+        raise; they are simply left out of the result.
+
+        Arguments:
+            course_ids (iterable[CourseKey]): the IDs of the course overviews
+                to be loaded.
+
+        Returns:
+            dict[CourseKey, CourseOverview]: overviews of the requested
+                courses which could be found.
+        """
+        course_ids = set(course_ids)
+        memo = cls._get_request_cache()
+        course_overviews = {}
+        if memo is not None:
+            course_overviews.update(
+                (course_id, memo[course_id]) for course_id in course_ids if course_id in memo
+            )
+
+        missing_ids = course_ids - set(course_overviews)
+        if missing_ids:
+            stale_ids = []
+            for course_overview in cls.objects.filter(id__in=missing_ids):
+                if course_overview.version < cls.VERSION:
+                    # Throw away old versions of CourseOverview, as they might contain stale data.
+                    stale_ids.append(course_overview.id)
+                else:
+                    course_overviews[course_overview.id] = course_overview
+                    cls._memoize(course_overview)
+            if stale_ids:
+                cls.objects.filter(id__in=stale_ids).delete()
+
+        missing_ids = course_ids - set(course_overviews)
+        if missing_ids:
+            # Load the courses nobody else is loading in one batch, then wait
+            # for (or fall back to loading) the ones which are locked.
+            locked_ids = set(
+                course_id for course_id in missing_ids
+                if cache.add(cls._loading_lock_key(course_id), True, cls.LOAD_LOCK_TIMEOUT)
+            )
+            try:
+                course_overviews.update(cls._load_many_from_module_store(locked_ids))
+            finally:
+                cache.delete_many([cls._loading_lock_key(course_id) for course_id in locked_ids])
+
+            for course_id in missing_ids - locked_ids:
+                try:
+                    course_overviews[course_id] = cls._load_from_module_store_once(course_id)
+                except (cls.DoesNotExist, IOError):
+                    pass
+
+        return course_overviews
+
+    @classmethod
+    def get_from_ids_if_exists(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews, if they exist.
+
+        This method will *not* generate new CourseOverviews or delete outdated
+        ones. It exists only as a small optimization used when CourseOverviews
+        are known to exist, for common situations like the student dashboard.
+
+        Callers should assume that this list is incomplete and fall back to
+        get_from_id if they need to guarantee CourseOverview generation.
+        """
+        return {
+            overview.id: overview
+            for overview
+            in cls.objects.filter(
+                id__in=course_ids,
+                version__gte=cls.VERSION
+            )
+        }
 
     def clean_id(self, padding_char='='):
         """
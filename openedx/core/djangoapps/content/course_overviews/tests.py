@@ -425,3 +425,81 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             # knows how to write, it's not going to overwrite what's there.
             unmodified_overview = CourseOverview.get_from_id(course.id)
             self.assertEqual(unmodified_overview.version, 11)
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_get_from_ids(self, modulestore_type):
+        """
+        Tests that get_from_ids loads cached overviews with a single query and
+        backfills missing and outdated ones from the module store.
+        """
+        with self.store.default_store(modulestore_type):
+            cached_courses = [CourseFactory.create(emit_signals=True) for __ in range(3)]
+            uncached_course = CourseFactory.create()
+            outdated_course = CourseFactory.create(emit_signals=True)
+            CourseOverview.objects.filter(id=outdated_course.id).update(version=CourseOverview.VERSION - 1)
+
+            cached_ids = [course.id for course in cached_courses]
+            with self.assertNumQueries(1):
+                with check_mongo_calls(0):
+                    course_overviews = CourseOverview.get_from_ids(cached_ids)
+            self.assertEqual(set(course_overviews), set(cached_ids))
+
+            non_existent_id = self.store.make_course_key('Non', 'Existent', 'Course')
+            course_overviews = CourseOverview.get_from_ids(
+                cached_ids + [uncached_course.id, outdated_course.id, non_existent_id]
+            )
+            self.assertEqual(
+                set(course_overviews),
+                set(cached_ids + [uncached_course.id, outdated_course.id])
+            )
+            self.assertEqual(course_overviews[outdated_course.id].version, CourseOverview.VERSION)
+            self.assertEqual(
+                set(CourseOverview.get_all_course_keys()),
+                set(cached_ids + [uncached_course.id, outdated_course.id])
+            )
+            self.assertEqual(
+                set(tab.tab_id for tab in course_overviews[uncached_course.id].tabs.all()),
+                self.COURSE_OVERVIEW_TABS
+            )
+
+    def test_request_memoization(self):
+        """
+        Tests that overviews are only memoized while handling a request, and
+        that publishing a course clears the memoized overview.
+        """
+        course = CourseFactory.create(emit_signals=True)
+
+        # Outside of a request, every call hits the database.
+        CourseOverview.get_from_id(course.id)
+        with self.assertNumQueries(1):
+            CourseOverview.get_from_id(course.id)
+
+        with mock.patch('request_cache.get_request', return_value=mock.Mock()):
+            CourseOverview.get_from_id(course.id)
+            with self.assertNumQueries(0):
+                CourseOverview.get_from_id(course.id)
+                CourseOverview.get_from_ids([course.id])
+
+            course.mobile_available = not course.mobile_available
+            with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+                self.store.update_item(course, ModuleStoreEnum.UserID.test)
+            self.assertEqual(CourseOverview.get_from_id(course.id).mobile_available, course.mobile_available)
+
+    def test_single_flight_loading(self):
+        """
+        Tests that when another request is already loading a course, we wait
+        for its overview instead of loading the course again.
+        """
+        course = CourseFactory.create()
+        course_overview = CourseOverview._create_from_course(course)  # pylint: disable=protected-access
+
+        def finish_concurrent_load(_seconds):
+            """ Simulate the other request saving the overview while we sleep. """
+            course_overview.save()
+
+        with mock.patch('openedx.core.djangoapps.content.course_overviews.models.cache.add', return_value=False):
+            with mock.patch('openedx.core.djangoapps.content.course_overviews.models.time.sleep') as mock_sleep:
+                mock_sleep.side_effect = finish_concurrent_load
+                with check_mongo_calls(0):
+                    self.assertEqual(CourseOverview.get_from_id(course.id).id, course.id)
+                    self.assertEqual(set(CourseOverview.get_from_ids([course.id])), {course.id})
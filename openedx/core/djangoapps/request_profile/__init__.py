@@ -0,0 +1,3 @@
+"""
+Profiles of the work done by each request, reported by view.
+"""
@@ -0,0 +1,187 @@
+"""
+Middleware profiling the work done by each request.
+
+When FEATURES['ENABLE_REQUEST_PROFILING'] is on, every request is profiled with
+openedx.core.lib.request_profile, counting and timing its:
+
+* SQL queries, as 'sql'
+* Mongo operations, of the split and old Mongo modulestores and of the contentstore, as 'mongo'
+* memcached gets and sets, as 'cache.get' and 'cache.set'
+* modulestore calls, as 'modulestore'
+* XBlock renders, as 'render'
+
+The counts and times of each kind are sent as the request_profile.<kind>.count and
+request_profile.<kind>.time metrics, tagged with the name of the view. The requests which
+exceed any of their REQUEST_PROFILE_BUDGETS are logged, and the operations of a sample of
+REQUEST_PROFILE_TRACE_SAMPLE_RATE of the requests are logged one by one. The SQL queries are
+only logged by their verb and table, as Django logs them with their parameters.
+"""
+import logging
+import random
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache.backends.memcached import BaseMemcachedCache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+import dogstats_wrapper as dog_stats_api
+from openedx.core.lib import request_profile
+
+log = logging.getLogger(__name__)
+
+# The kinds of operations whose metrics are sent for every request, even when none was done.
+PROFILED_KINDS = ('sql', 'mongo', 'cache.get', 'cache.set', 'modulestore', 'render')
+
+# The memcached cache methods which are profiled, by kind
+MEMCACHED_METHODS = {
+    'cache.get': ('get', 'get_many'),
+    'cache.set': ('set', 'set_many', 'add'),
+}
+
+# The view name of the requests which didn't reach a view, e.g. because no URL matched.
+UNKNOWN_VIEW = 'unknown'
+
+# The table which an SQL query reads or writes
+SQL_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+[`"]?(\w+)', re.IGNORECASE)
+
+
+def _profiled_method(kind, method):
+    """
+    Return `method`, timing each call as an operation of `kind`.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        """ Time the call. """
+        with request_profile.timed(kind, method.__name__):
+            return method(self, *args, **kwargs)
+    wrapper.request_profiled = True
+    return wrapper
+
+
+def profile_memcached():
+    """
+    Profile the gets and sets of the memcached caches.
+
+    Django has no hook for cache operations, so the methods of the memcached backends are wrapped.
+    """
+    for kind, method_names in MEMCACHED_METHODS.iteritems():
+        for method_name in method_names:
+            method = BaseMemcachedCache.__dict__[method_name]
+            if not getattr(method, 'request_profiled', False):
+                setattr(BaseMemcachedCache, method_name, _profiled_method(kind, method))
+
+
+def view_name(view_func):
+    """
+    Return the dotted name of the view function, or class for class-based views.
+    """
+    return u'{}.{}'.format(
+        getattr(view_func, '__module__', None),
+        getattr(view_func, '__name__', view_func.__class__.__name__),
+    )
+
+
+def sql_summary(sql):
+    """
+    Return the verb and table of the SQL query, without its parameters, which may hold private data.
+    """
+    words = sql.split(None, 1)
+    if not words:
+        return u''
+    table = SQL_TABLE.search(sql)
+    return u' '.join([words[0].upper()] + ([table.group(1)] if table else []))
+
+
+def exceeded_budgets(view, profile):
+    """
+    Return the (budget, value, limit) of each budget of the view which the profile exceeds.
+
+    The budgets of '*' apply to every view, unless the view has its own budget for the same value.
+    """
+    budgets = dict(settings.REQUEST_PROFILE_BUDGETS.get('*', {}))
+    budgets.update(settings.REQUEST_PROFILE_BUDGETS.get(view, {}))
+    exceeded = []
+    for budget, limit in sorted(budgets.iteritems()):
+        kind, __, measure = budget.rpartition('.')
+        if measure == 'count':
+            value = profile.counts[kind]
+        elif measure == 'time':
+            value = profile.times[kind]
+        else:
+            log.error(u"Invalid request profile budget %s of view %s", budget, view)
+            continue
+        if value > limit:
+            exceeded.append((budget, value, limit))
+    return exceeded
+
+
+class RequestProfileMiddleware(object):
+    """
+    Profile each request, and report its profile by view.
+    """
+    def __init__(self):
+        """Disable the middleware if the feature flag is disabled. """
+        if not settings.FEATURES.get('ENABLE_REQUEST_PROFILING'):
+            raise MiddlewareNotUsed()
+        profile_memcached()
+
+    def process_request(self, request):
+        """
+        Start the profile of the request.
+        """
+        trace = random.random() < settings.REQUEST_PROFILE_TRACE_SAMPLE_RATE
+        request_profile.start(trace)
+        request.request_profile_view = UNKNOWN_VIEW
+
+        # Django 1.8 has no hook for the queries, so they're logged by the connections during the request.
+        request.request_profile_debug_cursors = {}
+        for connection in connections.all():
+            request.request_profile_debug_cursors[connection.alias] = connection.force_debug_cursor
+            connection.force_debug_cursor = True
+            connection.queries_log.clear()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        """
+        Record the view of the request.
+        """
+        request.request_profile_view = view_name(view_func)
+
+    def process_response(self, request, response):
+        """
+        Stop the profile of the request, and report it.
+        """
+        profile = request_profile.stop()
+        if profile is None or not hasattr(request, 'request_profile_debug_cursors'):
+            # A previous middleware returned a response before this one started the profile
+            return response
+
+        for connection in connections.all():
+            for query in connection.queries_log:
+                profile.record('sql', float(query['time']), sql_summary(query['sql']))
+            connection.force_debug_cursor = request.request_profile_debug_cursors.get(connection.alias, False)
+
+        view = request.request_profile_view
+        tags = [u'view:{}'.format(view)]
+        for kind in sorted(set(PROFILED_KINDS).union(profile.counts)):
+            dog_stats_api.histogram(u'request_profile.{}.count'.format(kind), profile.counts[kind], tags=tags)
+            dog_stats_api.histogram(u'request_profile.{}.time'.format(kind), profile.times[kind], tags=tags)
+
+        exceeded = exceeded_budgets(view, profile)
+        if exceeded:
+            log.warning(
+                u"%s %s (%s) exceeded its budgets: %s",
+                request.method,
+                request.path,
+                view,
+                u", ".join(u"{} {:g} > {:g}".format(*budget) for budget in exceeded),
+            )
+
+        if profile.trace is not None:
+            lines = [u"Profile of {} {} ({}):".format(request.method, request.path, view)]
+            for kind, name, duration in profile.trace:
+                lines.append(u"  {:8.3f}s  {} {}".format(duration, kind, name))
+            log.info(u"%s", u"\n".join(lines))
+
+        return response
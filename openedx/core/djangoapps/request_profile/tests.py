@@ -0,0 +1,108 @@
+"""
+Tests for the request profile middleware.
+"""
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import patch
+
+from openedx.core.lib import request_profile
+from openedx.core.djangoapps.request_profile.middleware import (
+    RequestProfileMiddleware, exceeded_budgets, sql_summary
+)
+
+
+def profiled_view(request):  # pylint: disable=unused-argument
+    """
+    A view doing an SQL query and a render.
+    """
+    User.objects.count()
+    with request_profile.timed('render', 'problem.student_view'):
+        pass
+    return HttpResponse()
+
+
+VIEW_NAME = 'openedx.core.djangoapps.request_profile.tests.profiled_view'
+
+
+@override_settings(FEATURES={'ENABLE_REQUEST_PROFILING': True})
+@patch('openedx.core.djangoapps.request_profile.middleware.dog_stats_api')
+@patch('openedx.core.djangoapps.request_profile.middleware.log')
+class TestRequestProfileMiddleware(TestCase):
+    """
+    Test the profiling of requests.
+    """
+    def process(self):
+        """
+        Process a request of `profiled_view` through the middleware.
+        """
+        middleware = RequestProfileMiddleware()
+        request = RequestFactory().get('/profiled')
+        middleware.process_request(request)
+        middleware.process_view(request, profiled_view, (), {})
+        return middleware.process_response(request, profiled_view(request))
+
+    def histograms(self, dog_stats_api):
+        """
+        Return the values of the histograms which were sent, by name.
+        """
+        histograms = {}
+        for call in dog_stats_api.histogram.call_args_list:
+            self.assertEqual(call[1]['tags'], [u'view:{}'.format(VIEW_NAME)])
+            histograms[call[0][0]] = call[0][1]
+        return histograms
+
+    @override_settings(FEATURES={'ENABLE_REQUEST_PROFILING': False})
+    def test_disabled(self, log, dog_stats_api):  # pylint: disable=unused-argument
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfileMiddleware()
+
+    @override_settings(REQUEST_PROFILE_BUDGETS={}, REQUEST_PROFILE_TRACE_SAMPLE_RATE=0)
+    def test_metrics(self, log, dog_stats_api):
+        force_debug_cursor = connection.force_debug_cursor
+        self.process()
+
+        histograms = self.histograms(dog_stats_api)
+        self.assertEqual(histograms['request_profile.sql.count'], 1)
+        self.assertEqual(histograms['request_profile.render.count'], 1)
+        self.assertEqual(histograms['request_profile.mongo.count'], 0)
+        self.assertIn('request_profile.cache.get.time', histograms)
+        self.assertFalse(log.warning.called)
+        self.assertFalse(log.info.called)
+        self.assertEqual(connection.force_debug_cursor, force_debug_cursor)
+        self.assertIsNone(request_profile.current())
+
+    @override_settings(
+        REQUEST_PROFILE_BUDGETS={'*': {'sql.count': 0, 'render.count': 0}, VIEW_NAME: {'render.count': 1}},
+        REQUEST_PROFILE_TRACE_SAMPLE_RATE=1,
+    )
+    def test_budgets_and_trace(self, log, dog_stats_api):  # pylint: disable=unused-argument
+        self.process()
+
+        # The budget of the view overrides the budget of every view
+        self.assertEqual(log.warning.call_count, 1)
+        self.assertEqual(log.warning.call_args[0][-1], u"sql.count 1 > 0")
+        trace = log.info.call_args[0][1]
+        self.assertIn(u"render problem.student_view", trace)
+        self.assertIn(u"sql SELECT auth_user", trace)
+        # The queries are logged without their columns and parameters
+        self.assertNotIn(u"COUNT", trace)
+
+    def test_exceeded_budgets(self, log, dog_stats_api):  # pylint: disable=unused-argument
+        profile = request_profile.RequestProfile()
+        profile.record('mongo', 0.5, count=10)
+        with override_settings(REQUEST_PROFILE_BUDGETS={'*': {'mongo.count': 10, 'mongo.time': 0.25}}):
+            self.assertEqual(exceeded_budgets('view', profile), [('mongo.time', 0.5, 0.25)])
+
+    def test_sql_summary(self, log, dog_stats_api):  # pylint: disable=unused-argument
+        for sql, summary in [
+                (u'SELECT "auth_user"."id" FROM "auth_user" WHERE "email" = \'a@b.c\'', u'SELECT auth_user'),
+                (u'INSERT INTO `django_session` (`session_data`) VALUES (\'secret\')', u'INSERT django_session'),
+                (u'update auth_user SET password = \'hash\'', u'UPDATE auth_user'),
+                (u'SAVEPOINT "s1"', u'SAVEPOINT'),
+        ]:
+            self.assertEqual(sql_summary(sql), summary)
@@ -5,6 +5,8 @@ Automatic execution of startup modules in Django apps.
 from importlib import import_module
 from django.conf import settings
 
+from openedx.core.lib import startup_profiler
+
 
 def autostartup():
     """
@@ -19,4 +21,5 @@ def autostartup():
 
         # If the module has a run method, run it.
         if hasattr(mod, 'run'):
-            mod.run()
+            with startup_profiler.step(app + '.startup'):
+                mod.run()
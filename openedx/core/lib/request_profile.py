@@ -0,0 +1,201 @@
+"""
+Profiles of the work done by requests.
+
+While a profile is started in a thread, `timed` and `record` count the operations of each kind
+done in it, such as SQL queries, Mongo operations, cache gets and sets, modulestore calls and
+XBlock renders, and add up their time. An operation done within another of the same kind, such
+as the render of a child block, is counted, but its time only counts as part of the outer one's.
+When the profile is traced, every operation is also listed with its name and time.
+
+Outside of a started profile, these do nothing but check whether one is started. See
+openedx.core.djangoapps.request_profile for the middleware which profiles the requests.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+from mongodb_proxy import MongoProxy
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+# The callable attributes which aren't methods, and so aren't wrapped by ProfiledProxy,
+# e.g. the database of a collection, or the collections and proxies they return as attributes.
+UNPROFILED_CALLABLES = (Database, Collection, MongoProxy)
+
+
+class RequestProfile(object):
+    """
+    The operations done during a request.
+    """
+    def __init__(self, trace=False):
+        # The number of operations, and the time they took, by kind
+        self.counts = defaultdict(int)
+        self.times = defaultdict(float)
+        # The (kind, name, duration) of each operation, if the profile is traced, other than the
+        # parts of operations which aren't counted, such as fetching the next items of cursors
+        self.trace = [] if trace else None
+        # The number of operations in progress, by kind
+        self._depths = defaultdict(int)
+
+    def record(self, kind, duration, name=None, count=1):
+        """
+        Record `count` operations of `kind` which took `duration` seconds.
+        """
+        self.counts[kind] += count
+        self.times[kind] += duration
+        if self.trace is not None and count:
+            self.trace.append((kind, name, duration))
+
+    @contextmanager
+    def operation(self, kind, name=None, count=1):
+        """
+        Time the operation done in the block.
+        """
+        self._depths[kind] += 1
+        start = time.time()
+        try:
+            yield
+        finally:
+            duration = time.time() - start
+            self._depths[kind] -= 1
+            self.counts[kind] += count
+            if not self._depths[kind]:
+                self.times[kind] += duration
+            if self.trace is not None and count:
+                self.trace.append((kind, name, duration))
+
+
+class _CurrentProfile(threading.local):
+    """
+    The profile started in the current thread, if any.
+    """
+    def __init__(self):
+        super(_CurrentProfile, self).__init__()
+        self.profile = None
+
+
+_CURRENT = _CurrentProfile()
+
+
+def start(trace=False):
+    """
+    Start a new profile in the current thread, and return it.
+    """
+    _CURRENT.profile = RequestProfile(trace)
+    return _CURRENT.profile
+
+
+def stop():
+    """
+    Stop the profile of the current thread, and return it, or None if none was started.
+    """
+    profile, _CURRENT.profile = _CURRENT.profile, None
+    return profile
+
+
+def current():
+    """
+    Return the profile of the current thread, or None if none is started.
+    """
+    return _CURRENT.profile
+
+
+def record(kind, duration, name=None, count=1):
+    """
+    Record operations in the profile of the current thread, if one is started.
+    """
+    profile = _CURRENT.profile
+    if profile is not None:
+        profile.record(kind, duration, name, count)
+
+
+@contextmanager
+def timed(kind, name=None, count=1):
+    """
+    Time the operation done in the block, in the profile of the current thread if one is started.
+    """
+    profile = _CURRENT.profile
+    if profile is None:
+        yield
+    else:
+        with profile.operation(kind, name, count):
+            yield
+
+
+def profiled(kind):
+    """
+    Decorator timing each call of the function as an operation of `kind`, named after the function.
+    """
+    def decorator(func):
+        """ Wrap `func`. """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            """ Time the call. """
+            profile = _CURRENT.profile
+            if profile is None:
+                return func(*args, **kwargs)
+            with profile.operation(kind, func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ProfiledProxy(object):
+    """
+    Wraps an object, such as a Mongo collection, to time the calls of its methods as operations of `kind`.
+
+    The iterators which they return, such as Mongo cursors, are wrapped too, and the time taken
+    by the calls of their methods, including the fetching of their items, is added to `kind`
+    without counting more operations.
+    """
+    def __init__(self, wrapped, kind, name, count=1):
+        # Set in __dict__, as every other attribute is set on the wrapped object
+        self.__dict__.update(_wrapped=wrapped, _kind=kind, _name=name, _count=count)
+
+    def __getattr__(self, attr):
+        value = getattr(self._wrapped, attr)
+        if not callable(value) or isinstance(value, UNPROFILED_CALLABLES) or _CURRENT.profile is None:
+            return value
+
+        def method(*args, **kwargs):
+            """ Time the call of the wrapped object's method. """
+            with timed(self._kind, u'{}.{}'.format(self._name, attr), self._count):
+                result = value(*args, **kwargs)
+            if result is self._wrapped:
+                # e.g. cursor.sort(...) returns the cursor
+                return self
+            # Mongo collections are callable, and have `next` and `__iter__` methods which raise errors
+            if not callable(result) and hasattr(result, 'next') and hasattr(result, '__iter__'):
+                return _ProfiledIterator(result, self._kind, u'{}.{}'.format(self._name, attr))
+            return result
+        return method
+
+    def __setattr__(self, attr, value):
+        setattr(self._wrapped, attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._wrapped, attr)
+
+    def __getitem__(self, key):
+        return self._wrapped[key]
+
+    def __repr__(self):
+        return u'ProfiledProxy({!r})'.format(self._wrapped)
+
+
+class _ProfiledIterator(ProfiledProxy):
+    """
+    Wraps an iterator, such as a Mongo cursor, to add the time taken by its iteration to `kind`.
+    """
+    def __init__(self, wrapped, kind, name):
+        super(_ProfiledIterator, self).__init__(wrapped, kind, name, count=0)
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        """ Fetch the next item. """
+        with timed(self._kind, self._name, count=0):
+            return self._wrapped.next()
@@ -0,0 +1,129 @@
+"""
+Profiling of the startup of the LMS and Studio.
+
+When the EDX_PROFILE_STARTUP environment variable is set, `install` starts timing every import
+which loads a module for the first time, and `step` times the steps of the startup. `report`
+then logs the time taken by each step, and the imports which took the most time, both including
+and excluding the imports they make in turn, e.g.:
+
+    EDX_PROFILE_STARTUP=1 ./manage.py lms --settings=devstack check
+
+This only uses the standard library, so that it can be installed before anything else is imported.
+"""
+import __builtin__
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# How many of the slowest imports are reported.
+REPORTED_IMPORTS = 40
+
+_PROFILER = None
+
+
+class StartupProfiler(object):
+    """
+    Records the time taken by the imports, and the steps, of the startup.
+    """
+    def __init__(self):
+        self.start_time = time.time()
+        # The cumulative and own time taken to import each module, by name
+        self.imports = {}
+        # The name and time taken of each step, in order
+        self.steps = []
+        # The time taken by the nested imports of each import in progress
+        self._nested_times = []
+        self._original_import = None
+
+    def install(self):
+        """
+        Start timing the imports.
+        """
+        self._original_import = __builtin__.__import__
+        __builtin__.__import__ = self._timed_import
+
+    def uninstall(self):
+        """
+        Stop timing the imports.
+        """
+        if self._original_import is not None:
+            __builtin__.__import__ = self._original_import
+            self._original_import = None
+
+    # pylint: disable=redefined-builtin
+    def _timed_import(self, name, globals=None, locals=None, fromlist=None, level=-1):
+        """
+        Import `name`, and record the time it took if it imported any module for the first time.
+        """
+        modules_count = len(sys.modules)
+        self._nested_times.append(0.0)
+        start = time.time()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.time() - start
+            own = elapsed - self._nested_times.pop()
+            if self._nested_times:
+                self._nested_times[-1] += elapsed
+            if len(sys.modules) > modules_count:
+                if fromlist:
+                    # e.g. `from xmodule import capa_module` imports xmodule.capa_module
+                    name = u"{} ({})".format(name, u", ".join(fromlist))
+                cumulative_time, own_time = self.imports.get(name, (0.0, 0.0))
+                self.imports[name] = (cumulative_time + elapsed, own_time + own)
+
+    def format_report(self):
+        """
+        Returns the report of the startup, as a string.
+        """
+        lines = [u"Startup took {:.3f}s".format(time.time() - self.start_time)]
+        for name, elapsed in self.steps:
+            lines.append(u"  {:8.3f}s  step {}".format(elapsed, name))
+        for title, index in ((u"cumulative", 0), (u"own", 1)):
+            lines.append(u"Slowest imports, by {} time:".format(title))
+            slowest = sorted(self.imports.iteritems(), key=lambda item: item[1][index], reverse=True)
+            for name, times in slowest[:REPORTED_IMPORTS]:
+                lines.append(u"  {:8.3f}s  {}".format(times[index], name))
+        return u"\n".join(lines)
+
+
+def install():
+    """
+    Start profiling the startup, if the EDX_PROFILE_STARTUP environment variable is set.
+    """
+    global _PROFILER  # pylint: disable=global-statement
+    if _PROFILER is None and os.environ.get('EDX_PROFILE_STARTUP'):
+        _PROFILER = StartupProfiler()
+        _PROFILER.install()
+
+
+@contextmanager
+def step(name):
+    """
+    Time a step of the startup, when it is being profiled.
+    """
+    if _PROFILER is None:
+        yield
+        return
+
+    start = time.time()
+    try:
+        yield
+    finally:
+        _PROFILER.steps.append((name, time.time() - start))
+
+
+def report():
+    """
+    Stop profiling the startup, and log its report, if it was being profiled.
+    """
+    global _PROFILER  # pylint: disable=global-statement
+    if _PROFILER is None:
+        return
+    _PROFILER.uninstall()
+    log.info(_PROFILER.format_report())
+    _PROFILER = None
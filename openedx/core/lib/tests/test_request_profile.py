@@ -0,0 +1,107 @@
+"""
+Tests for request_profile.py
+"""
+from unittest import TestCase
+
+from mongodb_proxy import MongoProxy
+
+from openedx.core.lib import request_profile
+
+
+class Cursor(object):
+    """
+    A fake Mongo cursor.
+    """
+    def __init__(self, items):
+        self.items = iter(items)
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        """ Return the next item. """
+        return next(self.items)
+
+    def sort(self, key):  # pylint: disable=unused-argument
+        """ Return the cursor itself, as Mongo cursors do. """
+        return self
+
+
+class Collection(object):
+    """
+    A fake Mongo collection.
+    """
+    write_concern = None
+
+    def find(self, query):  # pylint: disable=unused-argument
+        """ Return a cursor of two items. """
+        return Cursor([1, 2])
+
+    def find_one(self, query):
+        """ Return the query. """
+        return query
+
+
+class TestRequestProfile(TestCase):
+    """
+    Test the profiling of the operations of requests.
+    """
+    def setUp(self):
+        super(TestRequestProfile, self).setUp()
+        self.addCleanup(request_profile.stop)
+
+    def test_not_started(self):
+        with request_profile.timed('render'):
+            request_profile.record('sql', 1.0)
+        self.assertIsNone(request_profile.current())
+        self.assertIsNone(request_profile.stop())
+
+    def test_nested_operations(self):
+        profile = request_profile.start(trace=True)
+        with request_profile.timed('render', 'vertical'):
+            with request_profile.timed('render', 'problem'):
+                request_profile.record('sql', 0.5, 'SELECT 1')
+
+        self.assertIs(request_profile.stop(), profile)
+        self.assertEqual(profile.counts['render'], 2)
+        self.assertEqual(profile.counts['sql'], 1)
+        self.assertEqual(profile.times['sql'], 0.5)
+        # The time of the nested render is only counted as part of the outer one
+        self.assertEqual(profile.times['render'], profile.trace[-1][2])
+        self.assertEqual(
+            [(kind, name) for kind, name, __ in profile.trace],
+            [('sql', 'SELECT 1'), ('render', 'problem'), ('render', 'vertical')],
+        )
+
+    def test_profiled(self):
+        @request_profile.profiled('modulestore')
+        def get_item(location):
+            """ Return the location. """
+            return location
+
+        profile = request_profile.start()
+        self.assertEqual(get_item('location'), 'location')
+        self.assertEqual(profile.counts['modulestore'], 1)
+        self.assertIsNone(profile.trace)
+
+    def test_proxy(self):
+        collection = Collection()
+        proxy = request_profile.ProfiledProxy(collection, 'mongo', 'modules')
+        proxy.write_concern = {'w': 1}
+        self.assertEqual(collection.write_concern, {'w': 1})
+        # Not profiled
+        self.assertEqual(list(proxy.find({})), [1, 2])
+
+        profile = request_profile.start(trace=True)
+        self.assertEqual(proxy.find_one({'_id': 1}), {'_id': 1})
+        self.assertEqual(list(proxy.find({}).sort('_id')), [1, 2])
+        # Callable attributes which aren't methods, like the databases of collections, aren't wrapped
+        collection.database = MongoProxy(Collection())
+        self.assertIs(proxy.database, collection.database)
+
+        # Fetching the items of the cursor adds to the time, but isn't another operation
+        self.assertEqual(profile.counts['mongo'], 2)
+        self.assertEqual(
+            [(kind, name) for kind, name, __ in profile.trace],
+            [('mongo', 'modules.find_one'), ('mongo', 'modules.find')],
+        )
@@ -0,0 +1,53 @@
+"""
+Tests for startup_profiler.py
+"""
+from __future__ import absolute_import
+
+import sys
+from importlib import import_module
+from mock import patch
+from unittest import TestCase
+
+from openedx.core.lib import startup_profiler
+
+
+class TestStartupProfiler(TestCase):
+    """
+    Test the profiling of the startup.
+    """
+    def setUp(self):
+        super(TestStartupProfiler, self).setUp()
+        # Have a module to import for the first time
+        json_module = sys.modules.pop('json', None)
+        if json_module is not None:
+            self.addCleanup(sys.modules.__setitem__, 'json', json_module)
+
+    def test_not_profiled(self):
+        with patch.dict('os.environ', {}, clear=True):
+            startup_profiler.install()
+        with startup_profiler.step('startup'):
+            import_module('json')
+        with patch.object(startup_profiler, 'log') as log:
+            startup_profiler.report()
+        self.assertFalse(log.info.called)
+
+    def test_profiled(self):
+        with patch.dict('os.environ', {'EDX_PROFILE_STARTUP': '1'}):
+            startup_profiler.install()
+        try:
+            with startup_profiler.step('startup'):
+                import_module('json')
+                import_module('os')
+            profiler = startup_profiler._PROFILER  # pylint: disable=protected-access
+            self.assertIn('json', profiler.imports)
+            # Modules which were already imported aren't timed
+            self.assertNotIn('os', profiler.imports)
+            self.assertEqual([name for name, __ in profiler.steps], ['startup'])
+        finally:
+            with patch.object(startup_profiler, 'log') as log:
+                startup_profiler.report()
+
+        report = log.info.call_args[0][0]
+        self.assertIn(u'step startup', report)
+        self.assertIn(u'  json', report)
+        self.assertIsNone(startup_profiler._PROFILER)  # pylint: disable=protected-access